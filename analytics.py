@@ -0,0 +1,163 @@
+# analytics.py
+# -*- coding: utf-8 -*-
+"""
+完成度分析（pandas，向量化）：
+- 把全部任务（含重复习惯按周期展开的行）摊平成一张任务表，之后全部是列运算 / groupby，不逐条循环
+- 每期完成率、滚动速度（近 N 期平均每期完成数）、燃起图（累计完成 vs 计划累计）、
+  CARE → 任务转化率、证据覆盖率（已完成任务里写了证据的比例）
+- 不依赖 Streamlit：页面用 store.cached_artifact 按 store 版本缓存结果
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+TASK_FRAME_COLUMNS = ["sprint_no", "task_id", "done", "has_evidence", "source_care_id", "is_habit"]
+CYCLE_COLUMNS = ["sprint_no", "start_date", "end_date", "total", "done", "rate",
+                 "evidenced", "evidence_rate", "velocity", "planned_cum", "actual_cum"]
+
+DEFAULT_WINDOW = 3
+
+
+def _cycles(sprints) -> pd.DataFrame:
+    valid = [sp for sp in sprints or [] if isinstance(sp, dict) and sp.get("sprint_no") is not None]
+    df = pd.DataFrame.from_records(
+        [(int(sp["sprint_no"]), sp.get("start_date"), sp.get("end_date")) for sp in valid],
+        columns=["sprint_no", "start_date", "end_date"],
+    )
+    df["start_date"] = pd.to_datetime(df["start_date"], errors="coerce")
+    df["end_date"] = pd.to_datetime(df["end_date"], errors="coerce")
+    return df.sort_values("sprint_no").reset_index(drop=True)
+
+
+def _habit_bits(bits: int, n: int) -> np.ndarray:
+    """位集 → 长度 n 的 0/1 数组（第 i 个元素 = 第 i+1 期）"""
+    bits = int(bits or 0) & ((1 << n) - 1)
+    raw = np.frombuffer(bits.to_bytes((n + 7) // 8 or 1, "little"), dtype=np.uint8)
+    return np.unpackbits(raw, bitorder="little")[:n].astype(bool)
+
+
+def task_frame(sprints, habits: Optional[Iterable[dict]] = None) -> pd.DataFrame:
+    """
+    摊平的任务表：一行一条任务（TASK_FRAME_COLUMNS）。
+    重复习惯每期展开一行，完成状态取位集里对应的位；习惯没有证据，也不来自 CARE。
+    """
+    rows = [
+        (int(sp["sprint_no"]), t.get("id", ""), bool(t.get("done", False)),
+         bool(str(t.get("evidence") or "").strip()), str(t.get("source_care_id") or ""), False)
+        for sp in sprints or []
+        if isinstance(sp, dict) and sp.get("sprint_no") is not None
+        for t in sp.get("tasks") or []
+        if isinstance(t, dict)
+    ]
+    df = pd.DataFrame.from_records(rows, columns=TASK_FRAME_COLUMNS)
+
+    habits = [h for h in habits or [] if isinstance(h, dict)]
+    nos = np.array(sorted(int(sp["sprint_no"]) for sp in sprints or []
+                          if isinstance(sp, dict) and sp.get("sprint_no") is not None), dtype=int)
+    if habits and len(nos):
+        n = int(nos.max())
+        parts = [
+            pd.DataFrame({
+                "sprint_no": nos,
+                "task_id": [f"habit:{h.get('id')}:{no}" for no in nos],
+                "done": _habit_bits(h.get("done_bits", 0), n)[nos - 1],
+                "has_evidence": False,
+                "source_care_id": "",
+                "is_habit": True,
+            })
+            for h in habits
+        ]
+        df = pd.concat([df] + parts, ignore_index=True) if len(df) else pd.concat(parts, ignore_index=True)
+
+    return df.astype({"sprint_no": int, "done": bool, "has_evidence": bool, "is_habit": bool})
+
+
+def per_cycle(tasks: pd.DataFrame, cycles: pd.DataFrame, today: date, window: int = DEFAULT_WINDOW) -> pd.DataFrame:
+    """每期一行：任务数 / 完成数 / 完成率 / 证据覆盖 / 滚动速度 / 燃起图两条累计线"""
+    counted = tasks.assign(evidenced=tasks["done"] & tasks["has_evidence"] & ~tasks["is_habit"],
+                           done_real=tasks["done"] & ~tasks["is_habit"])
+    g = counted.groupby("sprint_no").agg(
+        total=("done", "size"), done=("done", "sum"),
+        evidenced=("evidenced", "sum"), done_real=("done_real", "sum"),
+    )
+    df = cycles.join(g, on="sprint_no")
+    df[["total", "done", "evidenced", "done_real"]] = df[["total", "done", "evidenced", "done_real"]].fillna(0).astype(int)
+
+    df["rate"] = (df["done"] / df["total"].where(df["total"] > 0)).fillna(0.0)
+    df["evidence_rate"] = (df["evidenced"] / df["done_real"].where(df["done_real"] > 0))
+
+    # 已开始的周期才算“实际”：速度 = 近 window 期平均每期完成数；燃起图的实际线停在今天所在期
+    started = df["start_date"] <= pd.Timestamp(today)
+    df["velocity"] = df["done"].where(started).rolling(window, min_periods=1).mean().where(started)
+    df["planned_cum"] = df["total"].cumsum()
+    df["actual_cum"] = df["done"].cumsum().where(started)
+    return df[CYCLE_COLUMNS]
+
+
+def care_conversion(tasks: pd.DataFrame, care_records) -> Dict[str, float]:
+    """CARE → 任务：转成任务的记录数、其中已完成的记录数、转化率"""
+    care_ids = pd.Series([str(r.get("id", "")) for r in care_records or [] if isinstance(r, dict)], dtype=str)
+    linked = tasks.loc[tasks["source_care_id"] != "", ["source_care_id", "done"]]
+    converted = care_ids.isin(linked["source_care_id"])
+    completed = care_ids.isin(linked.loc[linked["done"], "source_care_id"])
+    n = len(care_ids)
+    return {
+        "care_total": n,
+        "care_converted": int(converted.sum()),
+        "care_completed": int(completed.sum()),
+        "care_conversion": float(converted.mean()) if n else 0.0,
+    }
+
+
+def compute_analytics(
+    sprints,
+    care_records=None,
+    habits=None,
+    today: Optional[date] = None,
+    window: int = DEFAULT_WINDOW,
+) -> dict:
+    """
+    返回 {"cycles": 每期 DataFrame（CYCLE_COLUMNS）, "summary": 汇总数字}。
+    summary：tasks / done / rate / evidence_coverage / velocity（最近一期的滚动速度）/
+    remaining / cycles_to_finish（按当前速度还要几期）/ current_no + care_* 四项。
+    """
+    today = today or date.today()
+    tasks = task_frame(sprints, habits)
+    cycles = per_cycle(tasks, _cycles(sprints), today, window)
+
+    real = tasks[~tasks["is_habit"]]
+    done_real = int(real["done"].sum())
+    n_tasks, n_done = len(tasks), int(tasks["done"].sum())
+
+    started = cycles.loc[cycles["start_date"] <= pd.Timestamp(today)]
+    velocity = float(started["velocity"].iloc[-1]) if len(started) else 0.0
+    remaining = n_tasks - n_done
+
+    summary = {
+        "tasks": n_tasks,
+        "done": n_done,
+        "rate": n_done / n_tasks if n_tasks else 0.0,
+        "evidence_coverage": float((real["done"] & real["has_evidence"]).sum() / done_real) if done_real else 0.0,
+        "velocity": velocity,
+        "remaining": remaining,
+        "cycles_to_finish": (remaining / velocity) if velocity > 0 else None,
+        "current_no": int(started["sprint_no"].iloc[-1]) if len(started) else None,
+    }
+    summary.update(care_conversion(tasks, care_records))
+    return {"cycles": cycles, "summary": summary}
+
+
+def chart_frames(cycles: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+    """页面画图用：按周期号做索引的几张小表"""
+    by_no = cycles.set_index("sprint_no")
+    return {
+        "rate": (by_no[["rate"]] * 100).round(1),
+        "velocity": by_no[["done", "velocity"]],
+        "burnup": by_no[["planned_cum", "actual_cum"]],
+        "evidence": (by_no[["evidence_rate"]] * 100).round(1),
+    }
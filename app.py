@@ -1,10 +1,14 @@
 import streamlit as st
 
 from i18n import init_i18n, lang_selector, t
+from poster import warm_up
 
 # 必须最先执行：设置首页 Tab 名（不会显示 Streamlit）
 
 st.set_page_config(page_title="Home | Wendy · Bright Future", page_icon="🌱", layout="centered")
+
+# 首页就在后台预热 Matplotlib（字体注册 + 字体缓存），用户进入海报页时不用再等
+warm_up()
 st.markdown(
     """
     <style>
@@ -109,6 +113,7 @@ st.markdown(
   <li><b>CARE 四宫格</b>：把强相关灵感（inspiration）沉淀为行动 → 一键加入 10 天任务</li>
   <li><b>导出中心</b>：一键导出海报+ 6×6 成长表</li>
   <li><b>反馈中心</b>：一起共创「周年可持续使用」的成长系统（匿名、不收集邮箱）</li>
+  <li><b>完成分析</b>：每期完成率、滚动速度、燃起图、CARE 转化与证据覆盖</li>
 </ul>
 
 </div>
@@ -0,0 +1,120 @@
+# batch_export.py
+# -*- coding: utf-8 -*-
+"""
+批量导出（工作坊用）：一个目录的 bright_future_backup.json → 每人一个文件夹（海报 + Excel）。
+不经过 Streamlit：直接读备份里的 STORE，调用与导出中心相同的海报 / Excel 生成函数。
+多进程并行（每个进程启动时预热一次字体），逐个报告进度。
+
+用法（在仓库根目录）：
+    python batch_export.py backups/ -o exports/
+    python batch_export.py backups/ -o exports/ --workers 8 --lang en --format pdf --modes share
+    python batch_export.py backups/ -o exports/ --zip        # 每人一个 ZIP，而不是文件夹
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Tuple
+
+from bundle import safe_filename, store_display_name, store_entries, write_zip
+from poster import FORMAT_MIME, warm_up
+
+
+def load_backup(path: Path) -> Tuple[str, dict]:
+    """备份文件 → (user_key, STORE)；兼容直接存 STORE 的旧文件"""
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError("not a backup object")
+    store = data.get("STORE", data)
+    if not isinstance(store, dict):
+        raise ValueError("STORE is not an object")
+    return data.get("user_key") or "", store
+
+
+def _out_name(path: Path, user_key: str, store: dict) -> str:
+    # 同名学员很常见：名字 + user_key 前 8 位；没名字就用文件名
+    name = safe_filename(store_display_name(store), default=path.stem)
+    return f"{name}_{user_key[:8]}" if user_key else name
+
+
+def export_one(path: str, out_dir: str, is_en: bool, fmt: str, modes, as_zip: bool):
+    """子进程：导出一个备份文件，返回 (输出路径, 文件数, 耗时)"""
+    t0 = time.perf_counter()
+    src = Path(path)
+    user_key, store = load_backup(src)
+    entries = store_entries(store, is_en=is_en, fmt=fmt, modes=tuple(modes))
+    target = Path(out_dir) / _out_name(src, user_key, store)
+
+    if as_zip:
+        target = target.parent / f"{target.name}.zip"  # 名字里可能带点，不能用 with_suffix
+        with open(target, "wb") as f:
+            n = write_zip(f, entries, max_workers=1)
+    else:
+        n = 0
+        for arcname, item in entries:
+            data = item() if callable(item) else item
+            if not data:
+                continue
+            dest = target / arcname
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            dest.write_bytes(data)
+            n += 1
+    return str(target), n, time.perf_counter() - t0
+
+
+def _init_worker():
+    warm_up(background=False)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("backups", help="备份 JSON 所在目录（递归查找 *.json）")
+    ap.add_argument("-o", "--out", default="exports", help="输出目录")
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="进程数（默认 CPU 核数）")
+    ap.add_argument("--lang", choices=["zh", "en"], default="zh")
+    ap.add_argument("--format", dest="fmt", choices=list(FORMAT_MIME), default="png", help="海报格式")
+    ap.add_argument("--modes", nargs="+", choices=["share", "full"], default=["share", "full"])
+    ap.add_argument("--zip", dest="as_zip", action="store_true", help="每人输出一个 ZIP")
+    args = ap.parse_args(argv)
+
+    files = sorted(Path(args.backups).rglob("*.json"))
+    if not files:
+        print(f"no *.json under {args.backups}", file=sys.stderr)
+        return 1
+    Path(args.out).mkdir(parents=True, exist_ok=True)
+
+    is_en = args.lang == "en"
+    total = len(files)
+    failed = 0
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max(1, args.workers), initializer=_init_worker) as pool:
+        futures = {
+            pool.submit(export_one, str(f), args.out, is_en, args.fmt, args.modes, args.as_zip): f
+            for f in files
+        }
+        for i, fut in enumerate(as_completed(futures), start=1):
+            src = futures[fut]
+            try:
+                target, n, dt = fut.result()
+                print(f"[{i:>{len(str(total))}}/{total}] {src.name} -> {target} ({n} files, {dt:.1f}s)", file=sys.stderr)
+            except Exception as e:
+                failed += 1
+                print(f"[{i:>{len(str(total))}}/{total}] {src.name} FAILED: {e}", file=sys.stderr)
+
+    elapsed = time.perf_counter() - t0
+    print(
+        f"done: {total - failed}/{total} backups in {elapsed:.1f}s "
+        f"({total / elapsed:.2f} files/s, {args.workers} workers)",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
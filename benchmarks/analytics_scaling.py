@@ -0,0 +1,45 @@
+# benchmarks/analytics_scaling.py
+# -*- coding: utf-8 -*-
+"""
+完成分析（analytics.compute_analytics）随任务数增长的耗时：36 个周期，每期任务数逐档放大。
+向量化之后应基本持平（主要是摊平任务表那一次遍历随任务数线性增长）。
+
+用法（在仓库根目录）：
+    python -m benchmarks.analytics_scaling
+    python -m benchmarks.analytics_scaling --tasks 10 100 1000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+from analytics import compute_analytics
+from benchmarks.datasets import make_sprints
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--tasks", type=int, nargs="+", default=[8, 30, 100, 300], help="每个周期的任务数（逐档）")
+    ap.add_argument("--repeat", type=int, default=5, help="每档运行次数（取中位数）")
+    args = ap.parse_args(argv)
+
+    habits = [{"id": f"h{i}", "title": f"Habit {i}", "done_bits": (1 << 18) - 1} for i in range(4)]
+    header = f"{'tasks':>8} {'ms':>9}"
+    print(header)
+    print("-" * len(header))
+    for n in args.tasks:
+        sprints = make_sprints(tasks_per_sprint=n)
+        care = [{"id": str(i)} for i in range(n)]
+        compute_analytics(sprints, care, habits)  # 预热
+        times = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            compute_analytics(sprints, care, habits)
+            times.append(time.perf_counter() - t0)
+        print(f"{n * len(sprints):>8} {statistics.median(times) * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# benchmarks/datasets.py
+# -*- coding: utf-8 -*-
+"""
+基准测试用的输入：
+- Life Circle：small / typical / stress 三档条目数
+- 36×10 计划：make_sprints() 生成与 store.py 同结构的 sprint/task dict
+统一用英文文本：DejaVu Sans 随 Matplotlib 自带，黄金图在任何机器上都能复现（不依赖中文字体）。
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import date, timedelta
+
+
+def _items(prefix: str, n: int, long: bool = False):
+    tail = " with a much longer description that needs clipping" if long else ""
+    return [f"{prefix} {i + 1}{tail}" for i in range(n)]
+
+
+SMALL = dict(
+    name="Wendy",
+    dream_items=["Write a book"],
+    resp_items=["Family time"],
+    talent_items=["Writing"],
+    intersections={"center": ["Publish essays"], "resp_dream": [], "resp_talent": [], "dream_talent": []},
+)
+
+TYPICAL = dict(
+    name="Wendy",
+    dream_items=["Write a book", "Run a marathon", "Travel to Japan", "Learn piano"],
+    resp_items=["Family time", "Team lead", "Mentor juniors", "Health check", "Budget plan"],
+    talent_items=["Writing", "Data analysis", "Public speaking"],
+    intersections={
+        "center": ["Publish 12 essays", "Coach 3 people", "Ship a side project"],
+        "resp_dream": ["Family trip"],
+        "resp_talent": ["Team workshop", "Internal talk"],
+        "dream_talent": ["Blog series", "Podcast"],
+    },
+)
+
+STRESS = dict(
+    name="Wendy Guo-Bright-Future",
+    dream_items=_items("Dream", 60, long=True),
+    resp_items=_items("Responsibility", 60, long=True),
+    talent_items=_items("Talent", 60, long=True),
+    intersections={
+        "center": _items("Breakthrough", 30, long=True),
+        "resp_dream": _items("RD", 20),
+        "resp_talent": _items("RT", 20),
+        "dream_talent": _items("DT", 20),
+    },
+)
+
+DATASETS = {"small": SMALL, "typical": TYPICAL, "stress": STRESS}
+
+
+def make_sprints(tasks_per_sprint: int = 8, n_sprints: int = 36, start: date = date(2026, 1, 1)):
+    """填满主题/交付物/任务的 36×10 计划（每 3 条任务完成 1 条）"""
+    sprints = []
+    for i in range(1, n_sprints + 1):
+        s = start + timedelta(days=10 * (i - 1))
+        sprints.append(
+            {
+                "sprint_no": i,
+                "start_date": s.isoformat(),
+                "end_date": (s + timedelta(days=9)).isoformat(),
+                "theme": f"Theme {i}",
+                "objective": f"Deliverable {i}: ship one visible result and write a short review",
+                "review": "",
+                "tasks": [
+                    {
+                        "id": str(uuid.uuid4()),
+                        "title": f"Task {i}.{k + 1} practise and record evidence",
+                        "done": k % 3 == 0,
+                        "evidence": "",
+                        "source_care_id": "",
+                    }
+                    for k in range(tasks_per_sprint)
+                ],
+            }
+        )
+    return sprints
@@ -0,0 +1,66 @@
+# benchmarks/excel_build.py
+# -*- coding: utf-8 -*-
+"""
+36×10 Excel 构建基准：单份 6×6 大表 与 多计划工作簿（默认 10 份），普通 Workbook vs write_only；
+另加分析版多表工作簿（pandas）。
+报告耗时中位数、Python 堆峰值（tracemalloc）与文件大小。
+
+用法（在仓库根目录）：
+    python -m benchmarks.excel_build
+    python -m benchmarks.excel_build --plans 50 --tasks 12 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+import tracemalloc
+
+from benchmarks.datasets import make_sprints
+from excel import build_36x10_excel, build_analysis_excel, build_plans_workbook
+
+
+def _measure(fn, repeat: int):
+    fn()  # 预热：导入/首次样式注册不计入
+    times = []
+    out = b""
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), peak, len(out)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--plans", type=int, default=10, help="多计划工作簿里的计划份数")
+    ap.add_argument("--tasks", type=int, default=8, help="每个周期的任务数")
+    ap.add_argument("--repeat", type=int, default=5, help="每项运行次数（取中位数）")
+    args = ap.parse_args(argv)
+
+    sprints = make_sprints(tasks_per_sprint=args.tasks)
+    plans = [(f"Plan {i + 1}", sprints) for i in range(args.plans)]
+
+    cases = [
+        ("6x6 sheet", "workbook", lambda: build_36x10_excel(sprints)),
+        ("6x6 sheet", "write_only", lambda: build_36x10_excel(sprints, write_only=True)),
+        (f"{args.plans} plans", "workbook", lambda: build_plans_workbook(plans, write_only=False)),
+        (f"{args.plans} plans", "write_only", lambda: build_plans_workbook(plans, write_only=True)),
+        ("analysis", "pandas", lambda: build_analysis_excel(sprints)),
+    ]
+
+    header = f"{'case':<12} {'mode':<11} {'ms':>9} {'peakMB':>8} {'KB':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, mode, fn in cases:
+        t, peak, size = _measure(fn, args.repeat)
+        print(f"{name:<12} {mode:<11} {t * 1000:>9.1f} {peak / 2 ** 20:>8.1f} {size / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# benchmarks/poster_formats.py
+# -*- coding: utf-8 -*-
+"""
+海报导出格式对比：PNG（220dpi 位图） vs SVG / PDF（矢量）。
+每个画布 × 模式 × 格式渲染若干次，报告耗时中位数与文件大小（相对 PNG）。
+
+用法（在仓库根目录）：
+    python -m benchmarks.poster_formats
+    python -m benchmarks.poster_formats --repeat 5 --lang zh
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+from benchmarks.datasets import TYPICAL
+from poster import CANVAS_PX, FORMAT_MIME, render_life_circle, warm_up
+
+
+def _time_render(canvas: str, mode: str, fmt: str, is_en: bool, repeat: int):
+    times = []
+    size = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        b = render_life_circle(canvas=canvas, mode=mode, is_en=is_en, fmt=fmt, **TYPICAL)
+        times.append(time.perf_counter() - t0)
+        size = len(b)
+    return statistics.median(times), size
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--repeat", type=int, default=3, help="每个组合渲染次数（取中位数）")
+    ap.add_argument("--lang", choices=["zh", "en"], default="en")
+    args = ap.parse_args(argv)
+
+    is_en = args.lang == "en"
+    warm_up(background=False)
+
+    header = f"{'canvas':<10} {'mode':<6} {'fmt':<4} {'ms':>8} {'KB':>9} {'time×png':>9} {'size×png':>9}"
+    print(header)
+    print("-" * len(header))
+    for canvas in CANVAS_PX:
+        for mode in ("share", "full"):
+            base_t, base_b = _time_render(canvas, mode, "png", is_en, args.repeat)
+            for fmt in FORMAT_MIME:
+                if fmt == "png":
+                    t, b = base_t, base_b
+                else:
+                    t, b = _time_render(canvas, mode, fmt, is_en, args.repeat)
+                print(
+                    f"{canvas:<10} {mode:<6} {fmt:<4} {t * 1000:>8.1f} {b / 1024:>9.1f} "
+                    f"{t / base_t:>9.2f} {b / base_b:>9.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
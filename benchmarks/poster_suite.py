@@ -0,0 +1,205 @@
+# benchmarks/poster_suite.py
+# -*- coding: utf-8 -*-
+"""
+海报渲染基准 + 回归：
+- 覆盖 render_life_circle_png（preview + 4 个社媒画布）与 render_life_circle_preview_png（完整/快速），
+  share / full 两种模式，small / typical / stress 三档条目数
+- 每个用例在独立子进程里跑：报告耗时中位数、峰值 RSS、输出字节数
+- typical 档的输出与 benchmarks/golden/ 里的黄金图做感知对比（灰度缩略图 + SSIM），
+  渲染器重构后画面变了就会报 FAIL（退出码 1）
+
+用法（在仓库根目录）：
+    python -m benchmarks.poster_suite                  # 跑全部 + 对比黄金图
+    python -m benchmarks.poster_suite --datasets typical --repeat 5
+    python -m benchmarks.poster_suite --update-golden  # 画面是有意修改时，重新生成黄金图
+    python -m benchmarks.poster_suite --json bench_output.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import multiprocessing as mp
+import resource
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+GOLDEN_DIR = Path(__file__).resolve().parent / "golden"
+GOLDEN_DATASET = "typical"
+
+# 感知对比：缩到这个宽度的灰度图上算 SSIM，按 BLOCK×BLOCK 分块取最差块；低于阈值算回归
+# （整体均值会把“少了一个标签”这种局部变化稀释掉，最差块不会）
+THUMB_WIDTH = 360
+SSIM_BLOCK = 32
+SSIM_THRESHOLD = 0.95
+
+POSTER_CANVASES = ("preview", "ig_square", "ig_story", "xhs_3x4", "xhs_4x5")
+MODES = ("share", "full")
+
+
+def all_cases():
+    cases = []
+    for canvas in POSTER_CANVASES:
+        for mode in MODES:
+            cases.append(("poster", canvas, mode))
+    for tier in ("full", "fast"):
+        for mode in MODES:
+            cases.append(("preview", tier, mode))
+    return cases
+
+
+def case_id(case) -> str:
+    return "_".join(case)
+
+
+def _render(case, data) -> bytes:
+    from poster import render_life_circle_png, render_life_circle_preview_png
+
+    kind, variant, mode = case
+    if kind == "poster":
+        return render_life_circle_png(canvas=variant, mode=mode, is_en=True, **data)
+    return render_life_circle_preview_png(mode=mode, is_en=True, fast=(variant == "fast"), **data)
+
+
+def _rss_mb() -> float:
+    # Linux: ru_maxrss 单位是 KB；macOS 是字节
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def _run_case(job):
+    """子进程入口：预热后计时；峰值 RSS 只反映这一个用例"""
+    from benchmarks.datasets import DATASETS
+    from poster import warm_up
+
+    case, dataset, repeat = job
+    data = DATASETS[dataset]
+    warm_up(background=False)
+    base_rss = _rss_mb()
+
+    times = []
+    out = b""
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = _render(case, data)
+        times.append(time.perf_counter() - t0)
+
+    peak = _rss_mb()
+    return {
+        "case": case_id(case),
+        "dataset": dataset,
+        "ms": statistics.median(times) * 1000,
+        "peak_rss_mb": peak,
+        "rss_delta_mb": peak - base_rss,
+        "bytes": len(out),
+        "png": out if dataset == GOLDEN_DATASET else None,
+    }
+
+
+# =======================
+# 感知对比
+# =======================
+def _thumb(png: bytes) -> np.ndarray:
+    """PNG → 灰度 [0,1]，按整数倍块平均缩到约 THUMB_WIDTH 宽（抗锯齿/字形微差会被抹平）"""
+    import matplotlib.image as mpimg
+
+    img = mpimg.imread(io.BytesIO(png), format="png")
+    if img.ndim == 3:
+        img = img[..., :3] @ np.array([0.299, 0.587, 0.114])
+    f = max(1, int(np.ceil(img.shape[1] / THUMB_WIDTH)))
+    h, w = (img.shape[0] // f) * f, (img.shape[1] // f) * f
+    return img[:h, :w].reshape(h // f, f, w // f, f).mean(axis=(1, 3))
+
+
+def _box_mean(x: np.ndarray, k: int) -> np.ndarray:
+    c = np.cumsum(np.cumsum(np.pad(x, ((1, 0), (1, 0))), axis=0), axis=1)
+    return (c[k:, k:] - c[:-k, k:] - c[k:, :-k] + c[:-k, :-k]) / (k * k)
+
+
+def ssim(a: np.ndarray, b: np.ndarray, k: int = 7, block: int = SSIM_BLOCK) -> float:
+    """结构相似度（均匀窗口版）的最差分块均值，1.0 = 完全一致"""
+    c1, c2 = 0.01 ** 2, 0.03 ** 2
+    mu_a, mu_b = _box_mean(a, k), _box_mean(b, k)
+    var_a = _box_mean(a * a, k) - mu_a ** 2
+    var_b = _box_mean(b * b, k) - mu_b ** 2
+    cov = _box_mean(a * b, k) - mu_a * mu_b
+    s = ((2 * mu_a * mu_b + c1) * (2 * cov + c2)) / ((mu_a ** 2 + mu_b ** 2 + c1) * (var_a + var_b + c2))
+    h, w = (s.shape[0] // block) * block, (s.shape[1] // block) * block
+    if h == 0 or w == 0:
+        return float(s.mean())
+    blocks = s[:h, :w].reshape(h // block, block, w // block, block).mean(axis=(1, 3))
+    return float(blocks.min())
+
+
+def _save_thumb(path: Path, thumb: np.ndarray):
+    import matplotlib.image as mpimg
+
+    mpimg.imsave(path, thumb, cmap="gray", vmin=0.0, vmax=1.0, format="png")
+
+
+def check_golden(name: str, png: bytes, update: bool):
+    """返回 (状态, ssim)；状态：ok / FAIL / new / updated"""
+    GOLDEN_DIR.mkdir(exist_ok=True)
+    path = GOLDEN_DIR / f"{name}.png"
+    thumb = _thumb(png)
+    if update or not path.exists():
+        _save_thumb(path, thumb)
+        return ("updated" if update else "new"), None
+
+    golden = _thumb(path.read_bytes())
+    if golden.shape != thumb.shape:
+        return "FAIL", 0.0
+    score = ssim(golden, thumb)
+    return ("ok" if score >= SSIM_THRESHOLD else "FAIL"), score
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--datasets", nargs="+", default=["small", "typical", "stress"],
+                    choices=["small", "typical", "stress"])
+    ap.add_argument("--repeat", type=int, default=3, help="每个用例渲染次数（取中位数）")
+    ap.add_argument("--update-golden", action="store_true", help="用当前输出覆盖黄金图")
+    ap.add_argument("--json", dest="json_out", help="把结果另存为 JSON")
+    args = ap.parse_args(argv)
+
+    jobs = [(case, ds, args.repeat) for ds in args.datasets for case in all_cases()]
+
+    # 每个用例一个新进程（maxtasksperchild=1），峰值 RSS 互不污染；顺序执行，计时不受并发干扰
+    ctx = mp.get_context("spawn")
+    with ctx.Pool(processes=1, maxtasksperchild=1) as pool:
+        results = pool.map(_run_case, jobs, chunksize=1)
+
+    header = f"{'case':<26} {'dataset':<8} {'ms':>8} {'peakMB':>8} {'ΔMB':>7} {'KB':>8}  golden"
+    print(header)
+    print("-" * (len(header) + 8))
+    failed = 0
+    for r in results:
+        golden = ""
+        png = r.pop("png")
+        if png is not None:
+            status, score = check_golden(r["case"], png, args.update_golden)
+            r["golden"] = status
+            r["ssim"] = score
+            golden = status if score is None else f"{status} (ssim {score:.4f})"
+            failed += status == "FAIL"
+        print(
+            f"{r['case']:<26} {r['dataset']:<8} {r['ms']:>8.1f} {r['peak_rss_mb']:>8.1f} "
+            f"{r['rss_delta_mb']:>7.1f} {r['bytes'] / 1024:>8.1f}  {golden}"
+        )
+
+    if args.json_out:
+        Path(args.json_out).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+    if failed:
+        print(f"\n{failed} golden comparison(s) FAILED (worst-block ssim < {SSIM_THRESHOLD}).", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
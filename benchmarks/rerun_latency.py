@@ -0,0 +1,139 @@
+# benchmarks/rerun_latency.py
+# -*- coding: utf-8 -*-
+"""
+勾选任务时的重跑耗时（AppTest，无浏览器）：
+- growth：②页周期详情里勾选一条任务（默认该周期 50 条任务）
+- care：③页记录列表里勾选「已分配任务完成了吗」（默认 50 条已分配记录）
+full rerun = 不做任何操作、整页重跑一次的耗时（页面的基础开销）；
+toggle = 勾选一次实际触发的重跑耗时（整页 + st.rerun 的第二遍，或只重跑相关 fragment）。
+
+用法（在仓库根目录）：
+    python -m benchmarks.rerun_latency
+    python -m benchmarks.rerun_latency --tasks 100 --repeat 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+import uuid
+from contextlib import nullcontext
+from functools import partial
+from pathlib import Path
+from unittest import mock
+
+from streamlit.testing.v1 import AppTest
+import streamlit.testing.v1.local_script_runner as _lsr
+
+from benchmarks.datasets import make_sprints
+
+ROOT = Path(__file__).resolve().parent.parent
+GROWTH_PAGE = ROOT / "pages" / "2_36x10天_Growth_Plan.py"
+CARE_PAGE = ROOT / "pages" / "3_CARE四宫格_CARE_Grid.py"
+
+
+def _growth_store(n_tasks: int) -> dict:
+    return {"sprints": make_sprints(tasks_per_sprint=n_tasks)}
+
+
+def _care_store(n_records: int) -> dict:
+    sprints = make_sprints(tasks_per_sprint=0)
+    records = []
+    for k in range(n_records):
+        cid = str(uuid.uuid4())
+        records.append({
+            "id": cid,
+            "capture_source": f"Source {k}",
+            "cognition": "insight",
+            "action": f"Action {k}",
+            "relationship": "",
+            "ego_drive": "",
+            "vow_tag": "Focus",
+            "relevance_score": 5,
+            "tags": "",
+            "created_at": "2026-01-01",
+        })
+        sprints[k % 36]["tasks"].append({
+            "id": str(uuid.uuid4()),
+            "title": f"Action {k}",
+            "done": False,
+            "evidence": "",
+            "source_care_id": cid,
+        })
+    return {"sprints": sprints, "care_records": records}
+
+
+def _own_fragment_rerun(at: AppTest, i: int, n_keys: int):
+    """
+    浏览器里点 fragment 内的控件只重跑该 fragment，AppTest 却总是整页重跑：
+    给 RerunData 带上第 i 个被测控件所在 fragment 的 id 来模拟。
+    对应关系按注册顺序推断（每个被测控件各在一个不带 key 的 fragment 里）；推断不了就整页重跑。
+    """
+    storage = at._fragment_storage
+    fids = [f for f in storage._fragments if f not in storage._target_key_by_id]
+    if len(fids) != n_keys:
+        return nullcontext()
+    return mock.patch.object(_lsr, "RerunData", partial(_lsr.RerunData, fragment_id_queue=[fids[i]]))
+
+
+def _toggle_keys(at: AppTest, prefix: str):
+    return [cb.key for cb in at.checkbox if (cb.key or "").startswith(prefix)]
+
+
+def _median_ms(times) -> float:
+    return statistics.median(times) * 1000
+
+
+def measure(page: Path, store: dict, prefix: str, query: dict, repeat: int):
+    """返回 (整页重跑 ms, 勾选一次 ms)"""
+    at = AppTest.from_file(str(page), default_timeout=60)
+    at.session_state["STORE"] = store
+    for k, v in query.items():
+        at.query_params[k] = v
+    at.run()
+    keys = _toggle_keys(at, prefix)
+    if not keys:
+        raise RuntimeError(f"no checkbox with key prefix {prefix!r} on {page.name}")
+
+    full = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        at.run()
+        full.append(time.perf_counter() - t0)
+
+    toggle = []
+    for i in range(repeat):
+        k = i % len(keys)
+        at.checkbox(key=keys[k]).set_value(not at.session_state[keys[k]])
+        with _own_fragment_rerun(at, k, len(keys)):
+            t0 = time.perf_counter()
+            at.run()
+            toggle.append(time.perf_counter() - t0)
+        if at.exception:
+            raise RuntimeError(at.exception[0].message)
+        at.run()  # 局部重跑后的元素树只含重跑的部分：整页跑一次（不计时）再点下一个
+    return _median_ms(full), _median_ms(toggle)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--tasks", type=int, default=50, help="周期任务数 / CARE 记录数")
+    ap.add_argument("--repeat", type=int, default=10, help="每项勾选次数（取中位数）")
+    args = ap.parse_args(argv)
+
+    cases = [
+        ("growth toggle", GROWTH_PAGE, _growth_store(args.tasks), "done_", {"cycle": "1"}),
+        ("care toggle", CARE_PAGE, _care_store(args.tasks), "done_sync_", {}),
+    ]
+
+    header = f"{'case':<14} {'full rerun ms':>14} {'toggle ms':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, page, store, prefix, query in cases:
+        full, toggle = measure(page, store, prefix, query, args.repeat)
+        print(f"{name:<14} {full:>14.1f} {toggle:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
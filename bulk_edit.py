@@ -0,0 +1,117 @@
+# bulk_edit.py
+# -*- coding: utf-8 -*-
+"""
+表格批量编辑（st.data_editor）：
+- editor_frames：全部周期一张表（主题 / 交付物 / 复盘），全部任务一张表（完成 / 证据，可改标题、改周期、可新增）
+- diff_edits：编辑后的两张表和当前计划对比（按列比较，不逐格循环），
+  产出 store.bulk_update_plan 的参数（含改了周期的任务 task_moves）+ 可读的变更清单
+- 重复习惯不在表里（每期展开的是同一条定义，在「重复习惯」里改）
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+CYCLE_EDIT_COLUMNS = ["sprint_no", "start_date", "end_date", "theme", "objective", "review"]
+TASK_EDIT_COLUMNS = ["task_id", "sprint_no", "title", "done", "evidence"]
+CYCLE_TEXT_FIELDS = ("theme", "objective", "review")
+
+
+def _valid(sprints) -> List[dict]:
+    return [sp for sp in sprints or [] if isinstance(sp, dict) and sp.get("sprint_no") is not None]
+
+
+def editor_frames(sprints) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """(周期表, 任务表)，列见 CYCLE_EDIT_COLUMNS / TASK_EDIT_COLUMNS；任务按周期、周期内顺序排列"""
+    valid = _valid(sprints)
+    cycles = pd.DataFrame.from_records(
+        [(int(sp["sprint_no"]), str(sp.get("start_date") or ""), str(sp.get("end_date") or ""),
+          sp.get("theme") or "", sp.get("objective") or "", sp.get("review") or "") for sp in valid],
+        columns=CYCLE_EDIT_COLUMNS,
+    )
+    tasks = pd.DataFrame.from_records(
+        [(str(t.get("id", "")), int(sp["sprint_no"]), t.get("title") or "", bool(t.get("done", False)),
+          t.get("evidence") or "")
+         for sp in valid
+         for t in sp.get("tasks") or []
+         if isinstance(t, dict)],
+        columns=TASK_EDIT_COLUMNS,
+    )
+    return cycles, tasks.astype({"sprint_no": int, "done": bool})
+
+
+def _text(s: pd.Series) -> pd.Series:
+    """编辑器里清空的格子会变成 None/NaN：统一成去掉首尾空白的字符串"""
+    return s.fillna("").astype(str).str.strip()
+
+
+def diff_edits(cycles: pd.DataFrame, tasks: pd.DataFrame, sprints) -> dict:
+    """
+    编辑后的两张表 vs 当前计划：
+    - 主题 / 交付物 / 复盘不同 → sprint_updates
+    - 已有任务（按 task_id）的标题 / 完成 / 证据不同 → task_updates（标题清空的不改）
+    - 已有任务的周期号改成了另一个存在的周期 → task_moves {task_id: 新周期号}（排到新周期末尾）
+    - 没有 task_id 的新行 → new_tasks [(周期号, 标题, 完成, 证据)]；周期号不存在或标题为空的跳过
+    返回 {"sprint_updates", "task_updates", "task_moves", "new_tasks", "changes": [(周期号, 字段, 新值)]}。
+    """
+    base_cycles, base_tasks = editor_frames(sprints)
+    sprint_updates: Dict[int, dict] = {}
+    task_updates: Dict[str, dict] = {}
+    task_moves: Dict[str, int] = {}
+    new_tasks: List[tuple] = []
+    changes: List[Tuple[int, str, str]] = []
+
+    # 周期：按周期号对齐，每个字段一次整列比较
+    old = base_cycles.set_index("sprint_no")
+    new = cycles.astype({"sprint_no": int}).drop_duplicates("sprint_no").set_index("sprint_no")
+    common = old.index.intersection(new.index)
+    for field in CYCLE_TEXT_FIELDS:
+        before, after = _text(old.loc[common, field]), _text(new.loc[common, field])
+        for no, v in after[after != before].items():
+            sprint_updates.setdefault(int(no), {})[field] = v
+            changes.append((int(no), field, v))
+
+    # 任务：已有行按 task_id 对齐
+    ids = tasks["task_id"].fillna("").astype(str)
+    edited = tasks.assign(task_id=ids)
+    kept = edited[ids != ""].drop_duplicates("task_id").set_index("task_id")
+    old_t = base_tasks.set_index("task_id")
+    kept = kept.reindex(old_t.index.intersection(kept.index))
+    old_t = old_t.loc[kept.index]
+
+    title = _text(kept["title"])
+    title_changed = (title != "") & (title != _text(old_t["title"]))
+    done = kept["done"].fillna(False).astype(bool)
+    done_changed = done != old_t["done"]
+    evidence = _text(kept["evidence"])
+    evidence_changed = evidence != _text(old_t["evidence"])
+
+    for field, mask, values in (("title", title_changed, title), ("done", done_changed, done),
+                                ("evidence", evidence_changed, evidence)):
+        for tid in mask[mask].index:
+            v = values[tid]
+            task_updates.setdefault(tid, {})[field] = bool(v) if field == "done" else v
+            kind = ("task_done" if v else "task_undone") if field == "done" else f"task_{field}"
+            changes.append((int(old_t.at[tid, "sprint_no"]), kind, title[tid] or old_t.at[tid, "title"]))
+
+    # 改了周期号：只认存在的周期
+    valid_nos = set(old.index)
+    no = pd.to_numeric(kept["sprint_no"], errors="coerce")
+    moved = no.notna() & no.isin(valid_nos) & (no != old_t["sprint_no"])
+    for tid in moved[moved].index:
+        task_moves[tid] = int(no[tid])
+        changes.append((int(no[tid]), "task_move", title[tid] or old_t.at[tid, "title"]))
+
+    # 新增行
+    added = edited[ids == ""]
+    for no, t, d, ev in zip(pd.to_numeric(added["sprint_no"], errors="coerce"), _text(added["title"]),
+                            added["done"].fillna(False).astype(bool), _text(added["evidence"])):
+        if pd.isna(no) or int(no) not in valid_nos or not t:
+            continue
+        new_tasks.append((int(no), t, bool(d), ev))
+        changes.append((int(no), "task_add", t))
+
+    return {"sprint_updates": sprint_updates, "task_updates": task_updates, "task_moves": task_moves,
+            "new_tasks": new_tasks, "changes": changes}
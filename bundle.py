@@ -0,0 +1,179 @@
+# bundle.py
+# -*- coding: utf-8 -*-
+"""
+一键打包导出：备份 JSON + 各尺寸海报 + Excel → 一个 ZIP。
+- 边生成边写：每个产物一出来就写进 zip 并释放，峰值内存≈同时在途的几个产物，而不是整包
+- 需要生成的产物（callable）放线程池并行：海报各自一张 Figure，PNG 互不干扰；矢量格式在 poster 内部串行
+- 已经缓存好的产物直接传 bytes，不重复生成
+- store_entries：直接从 STORE dict（备份 JSON 里那份）列出全部产物，不依赖 Streamlit 会话（批量导出用）
+"""
+
+from __future__ import annotations
+
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import partial
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from cycles import infer_length, plan_slug
+from excel import build_36x10_excel, build_analysis_excel
+from poster import render_life_circle
+
+ZIP_MIME = "application/zip"
+
+# 海报画布 → 文件名后缀（和导出中心的单张下载一致）
+POSTER_FILE_SUFFIX = {
+    "ig_square": "IG_1x1",
+    "ig_story": "IG_9x16",
+    "xhs_3x4": "3x4",
+    "xhs_4x5": "4x5",
+}
+
+# 本身已压缩的格式：直接存，不再 deflate（省 CPU，体积几乎不变）
+_STORED_SUFFIXES = (".png", ".pdf", ".xlsx", ".zip")
+
+Entry = Tuple[str, Union[bytes, Callable[[], bytes]]]
+
+
+def _write_entry(zf: zipfile.ZipFile, arcname: str, data: bytes):
+    if not data:
+        return
+    compress = zipfile.ZIP_STORED if arcname.lower().endswith(_STORED_SUFFIXES) else zipfile.ZIP_DEFLATED
+    zf.writestr(arcname, data, compress_type=compress)
+
+
+def write_zip(out: BinaryIO, entries: Iterable[Entry], max_workers: int = 4) -> int:
+    """
+    entries: [(zip 内路径, bytes 或 无参函数)]。
+    bytes 立即写入；函数最多 max_workers 个同时在线程池里跑，谁先好谁先写。
+    返回写入的条目数（空产物跳过）。
+    """
+    written = 0
+    pending: Dict = {}
+    it = iter(entries)
+
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf, \
+            ThreadPoolExecutor(max_workers=max_workers) as pool:
+
+        def _feed() -> bool:
+            # 先把现成的 bytes 写掉，直到提交出一个任务或条目耗尽
+            nonlocal written
+            for arcname, item in it:
+                if callable(item):
+                    pending[pool.submit(item)] = arcname
+                    return True
+                _write_entry(zf, arcname, item)
+                written += bool(item)
+            return False
+
+        while len(pending) < max_workers and _feed():
+            pass
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                arcname = pending.pop(fut)
+                data = fut.result()
+                _write_entry(zf, arcname, data)
+                written += bool(data)
+                del data
+                _feed()
+
+    return written
+
+
+def poster_entries(
+    base_name: str,
+    poster_inputs: dict,
+    fmt: str = "png",
+    modes=("share", "full"),
+    cached: Optional[Dict[Tuple[str, str], bytes]] = None,
+) -> List[Entry]:
+    """
+    各模式 × 4 个社媒画布的海报条目。
+    poster_inputs：render_life_circle 的 name / dream_items / resp_items / talent_items / intersections / is_en；
+    cached：{(canvas, mode): bytes}，命中的直接用。
+    """
+    cached = cached or {}
+    out: List[Entry] = []
+    for mode in modes:
+        for canvas, suffix in POSTER_FILE_SUFFIX.items():
+            arcname = f"posters/{base_name}_{mode}_{suffix}.{fmt}"
+            hit = cached.get((canvas, mode))
+            if hit is not None:
+                out.append((arcname, hit))
+            else:
+                out.append((arcname, partial(render_life_circle, canvas=canvas, mode=mode, fmt=fmt, **poster_inputs)))
+    return out
+
+
+# =======================
+# 不依赖会话：从 STORE dict 生成全部产物
+# =======================
+def _unique_keep_order(items) -> List[str]:
+    seen = set()
+    out = []
+    for x in items or []:
+        x = str(x).strip()
+        if x and x not in seen:
+            out.append(x)
+            seen.add(x)
+    return out
+
+
+def _sum_quadrants(d) -> List[str]:
+    # 四象限同一份清单存在中英两个 key 下，合并去重即可
+    if not isinstance(d, dict):
+        return []
+    items = []
+    for v in d.values():
+        if isinstance(v, list):
+            items.extend(v)
+    return _unique_keep_order(items)
+
+
+def store_display_name(store: dict) -> str:
+    ad = store.get("annual_dig") or {}
+    meta = (ad.get("intersections") or {}).get("_meta") or {}
+    name = meta.get("name", "") if isinstance(meta, dict) else ""
+    return (name or (store.get("profile") or {}).get("name", "") or "").strip()
+
+
+def safe_filename(s: str, default: str = "YourName") -> str:
+    """去掉路径分隔符等文件名非法字符（用户名直接拼进文件名）"""
+    s = "".join("_" if ch in '\\/:*?"<>|' or ord(ch) < 32 else ch for ch in (s or "")).strip(" .")
+    return s[:80] or default
+
+
+def store_poster_inputs(store: dict, is_en: bool = False) -> dict:
+    """STORE dict → render_life_circle 的数据参数（与导出中心同样的取数规则）"""
+    ad = store.get("annual_dig") or {}
+    inter = ad.get("intersections") or {}
+    return dict(
+        name=store_display_name(store),
+        dream_items=_sum_quadrants(ad.get("dream")),
+        resp_items=_sum_quadrants(ad.get("responsibility")),
+        talent_items=_sum_quadrants(ad.get("talent")),
+        intersections=inter if isinstance(inter, dict) else {},
+        is_en=is_en,
+    )
+
+
+def store_entries(store: dict, is_en: bool = False, fmt: str = "png", modes=("share", "full")) -> List[Entry]:
+    """一个用户的全部导出：海报（各模式 × 4 尺寸）+ 6×6 Excel（含进度页）+ 分析版 Excel"""
+    name = safe_filename(store_display_name(store))
+    sprints = store.get("sprints") or []
+    care = store.get("care_records") or []
+    entries = poster_entries(f"{name}_2026_LifeCircle", store_poster_inputs(store, is_en), fmt=fmt, modes=modes)
+    length = (store.get("plan") or {}).get("length") or infer_length(sprints)
+    slug = plan_slug(len(sprints), length)
+    plan_name = f"{name}_{slug}_plan.xlsx" if is_en else f"{name}_{slug}_自我提升计划.xlsx"
+    entries.append((
+        f"excel/{plan_name}",
+        partial(build_36x10_excel, sprints, is_en=is_en, with_progress=True, care_records=care, length=length),
+    ))
+    entries.append((
+        f"excel/{name}_analysis.xlsx",
+        partial(build_analysis_excel, sprints, care, store.get("annual_dig") or {}),
+    ))
+    return entries
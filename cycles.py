@@ -0,0 +1,115 @@
+# cycles.py
+# -*- coding: utf-8 -*-
+"""
+行动周期引擎：周期数 × 每期天数 + 开始日期（可跳过节假日等日期）→ 周期日期表。
+- 默认 36×10；常用预设 52×7（按周）、12×30（按月）
+- 日期表一次向量化算完（numpy busday_offset：7 天全算工作日，只把跳过的日期当“假日”）
+- 网格列数、年度分配区段等按周期数推出来，页面和 Excel 不再写死 36 / 6×6
+"""
+
+from __future__ import annotations
+
+import math
+from datetime import date
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_COUNT = 36
+DEFAULT_LENGTH = 10
+
+# 预设：key → (周期数, 每期天数)
+PRESETS = {
+    "36x10": (36, 10),
+    "52x7": (52, 7),
+    "12x30": (12, 30),
+}
+
+MAX_COUNT = 120
+MAX_LENGTH = 90
+
+_ALL_DAYS = "1111111"
+
+
+def _as_date(d) -> date:
+    if isinstance(d, date):
+        return d
+    return date.fromisoformat(str(d))
+
+
+def cycle_table(
+    start: date,
+    count: int = DEFAULT_COUNT,
+    length: int = DEFAULT_LENGTH,
+    skip: Optional[Iterable] = None,
+) -> List[Tuple[date, date]]:
+    """
+    [(开始日, 结束日)] × count。第 i 期占第 i*length .. i*length+length-1 个“有效日”，
+    skip 里的日期（date 或 ISO 字符串）不计入，周期顺延。
+    """
+    count = max(1, int(count))
+    length = max(1, int(length))
+    holidays = np.array(sorted({_as_date(d) for d in (skip or [])}), dtype="datetime64[D]")
+    first = np.busday_offset(np.datetime64(_as_date(start), "D"), 0, roll="forward",
+                             weekmask=_ALL_DAYS, holidays=holidays)
+    offsets = np.arange(count, dtype=np.int64) * length
+    starts = np.busday_offset(first, offsets, weekmask=_ALL_DAYS, holidays=holidays)
+    ends = np.busday_offset(first, offsets + (length - 1), weekmask=_ALL_DAYS, holidays=holidays)
+    return list(zip(starts.astype(object), ends.astype(object)))
+
+
+def grid_cols(count: int) -> int:
+    """总览 / Excel 网格每行放几个周期：接近正方形（36→6，52→8，12→4）"""
+    return max(1, math.ceil(math.sqrt(max(1, int(count)))))
+
+
+def plan_label(count: int, length: int) -> str:
+    return f"{int(count)}×{int(length)}"
+
+
+def plan_slug(count: int, length: int) -> str:
+    """文件名里用的计划名（纯 ASCII）：36x10"""
+    return f"{int(count)}x{int(length)}"
+
+
+def infer_length(sprints) -> int:
+    """
+    没有计划参数（旧备份 / 只有 sprints）时推每期天数：取最短一期的起止跨度。
+    跳过的日期只会把某一期拉长，所以不能只看第 1 期；日期都缺失时按默认 10 天。
+    """
+    spans = []
+    for sp in sprints or []:
+        try:
+            spans.append((_as_date(str(sp["end_date"])[:10]) - _as_date(str(sp["start_date"])[:10])).days + 1)
+        except (KeyError, TypeError, ValueError):
+            continue
+    return min(spans) if spans else DEFAULT_LENGTH
+
+
+def assign_ranges(count: int) -> Tuple[Tuple[int, int], Tuple[int, int], Tuple[int, int]]:
+    """
+    年度挖掘一键分配的三段（责任 / 天赋 / 梦想），按 1/6、1/3、1/2 切：
+    36 → (1,6) (7,18) (19,36)
+    """
+    count = max(3, int(count))
+    a = max(1, round(count / 6))
+    b = max(a + 1, round(count / 2))
+    b = min(b, count - 1)
+    return (1, a), (a + 1, b), (b + 1, count)
+
+
+# -----------------------
+# 周期位集：第 n 期 ↔ 第 n-1 位（重复习惯的每期完成状态用一个整数存）
+# -----------------------
+def bit_get(bits: int, sprint_no: int) -> bool:
+    return sprint_no >= 1 and bool((int(bits) >> (sprint_no - 1)) & 1)
+
+
+def bit_set(bits: int, sprint_no: int, on: bool) -> int:
+    mask = 1 << (sprint_no - 1)
+    return (int(bits) | mask) if on else (int(bits) & ~mask)
+
+
+def bit_count(bits: int, count: int) -> int:
+    """前 count 期里置位的个数（周期数变少后，多出来的高位不算）"""
+    return (int(bits) & ((1 << max(0, int(count))) - 1)).bit_count()
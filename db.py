@@ -10,14 +10,17 @@ from __future__ import annotations
 
 import json
 
-from datetime import date
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from sqlalchemy import (
-    create_engine, Column, Integer, String, Text, Date, Boolean, ForeignKey
+    create_engine, Column, Integer, String, Text, Date, DateTime, Boolean, ForeignKey, func, inspect, text
 )
 from sqlalchemy.orm import declarative_base, sessionmaker, relationship
 
+from cycles import DEFAULT_COUNT, DEFAULT_LENGTH, bit_get, bit_set, cycle_table
+from ranks import initial_ranks, rank_between
+
 
 DB_URL = "sqlite:///app.db"
 
@@ -107,12 +110,24 @@ class SprintTask(Base):
     sprint_id = Column(Integer, ForeignKey("sprints.id"))
     title = Column(String(255), nullable=False)
     done = Column(Boolean, default=False)
+    done_at = Column(DateTime, nullable=True)  # 勾选完成的时间（热力图用）；取消完成时清空
     evidence = Column(Text, default="")
     source_care_id = Column(Integer, nullable=True)  # 来自 CARE 的记录 id
+    rank = Column(Text, nullable=True, index=True)  # 分数索引（ranks.py），周期内按它排序；旧数据为空时按 id
+    rolled_to = Column(Integer, nullable=True)  # 复制顺延过：目标周期号（之后不再重复顺延）
 
     sprint = relationship("Sprint", back_populates="tasks")
 
 
+class RecurringTask(Base):
+    __tablename__ = "recurring_tasks"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String(255), nullable=False)
+    # 每期完成位集（第 n 期 ↔ 第 n-1 位），十六进制文本：周期数可超过 64，SQLite INTEGER 装不下
+    done_bits = Column(String(64), default="0")
+
+
 class CareRecord(Base):
     __tablename__ = "care_records"
 
@@ -133,8 +148,21 @@ class CareRecord(Base):
 # -------------------------
 # DB Helpers
 # -------------------------
+# 建表之后新增的列：create_all 不会给已有的表加列，这里补上（SQLite ALTER TABLE ADD COLUMN）
+_ADDED_COLUMNS = {
+    "sprint_tasks": {"rank": "TEXT", "rolled_to": "INTEGER", "done_at": "DATETIME"},
+}
+
+
 def init_db() -> None:
     Base.metadata.create_all(bind=engine)
+    insp = inspect(engine)
+    with engine.begin() as conn:
+        for table, cols in _ADDED_COLUMNS.items():
+            have = {c["name"] for c in insp.get_columns(table)}
+            for name, ddl in cols.items():
+                if name not in have:
+                    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl}"))
 
 
 def get_session():
@@ -232,6 +260,62 @@ def assign_backlog_item_to_sprint(item_id: int, sprint_no: Optional[int]):
 
 
 
+def assign_backlog_items_bulk(assignments: Dict[int, Optional[int]]) -> int:
+    """
+    批量写 backlog 的 sprint_no（自动排期确认后）：一次查询、一个事务。
+    和 store 一致：排进周期的条目同时在该周期生成一条任务（同名任务已存在则不重复加）；sprint_no=None 只取消排期。
+    """
+    if not assignments:
+        return 0
+    assignments = {int(k): v for k, v in assignments.items()}
+    db = get_session()
+    try:
+        sid = {no: s_id for no, s_id in db.query(Sprint.sprint_no, Sprint.id).all()}
+        items = db.query(BacklogItem).filter(BacklogItem.id.in_(list(assignments))).all()
+        last, seen = {}, {}
+        for it in items:
+            no = assignments[it.id]
+            it.sprint_no = no
+            s_id = sid.get(no)
+            if s_id is None:
+                continue
+            if s_id not in seen:
+                _ensure_ranks(db, s_id)
+                last[s_id] = _last_rank(db, s_id)
+                seen[s_id] = {
+                    (x or "").strip()
+                    for (x,) in db.query(SprintTask.title).filter(SprintTask.sprint_id == s_id).all()
+                }
+            title = (it.title or "").strip()
+            if not title or title in seen[s_id]:
+                continue
+            seen[s_id].add(title)
+            last[s_id] = rank_between(last[s_id], None)
+            db.add(SprintTask(sprint_id=s_id, title=title, done=False, evidence="", rank=last[s_id]))
+        db.commit()
+        return len(items)
+    finally:
+        db.close()
+
+
+def sprint_loads() -> Dict[int, int]:
+    """{sprint_no: 任务数}（一次分组查询），自动排期用；排进周期的 backlog 已经生成了任务，不再另算"""
+    db = get_session()
+    try:
+        loads = {no: 0 for (no,) in db.query(Sprint.sprint_no).all()}
+        rows = (
+            db.query(Sprint.sprint_no, func.count(SprintTask.id))
+            .join(SprintTask, SprintTask.sprint_id == Sprint.id)
+            .group_by(Sprint.sprint_no)
+            .all()
+        )
+        for no, n in rows:
+            loads[no] = n
+        return loads
+    finally:
+        db.close()
+
+
 def get_sprint_by_no(sprint_no: int) -> Optional[Sprint]:
     db = get_session()
     try:
@@ -240,30 +324,33 @@ def get_sprint_by_no(sprint_no: int) -> Optional[Sprint]:
         db.close()
 
 
-def regenerate_sprints(start: date):
-    """生成/重建 36 个 10 天 sprint（会清空旧 sprint 与 tasks）"""
+def regenerate_sprints(
+    start: date,
+    count: int = DEFAULT_COUNT,
+    length: int = DEFAULT_LENGTH,
+    skip: Optional[Iterable[date]] = None,
+):
+    """生成/重建 count 个 length 天 sprint（默认 36×10，会清空旧 sprint 与 tasks）；skip 里的日期不计入"""
     db = get_session()
     try:
         # 删除旧数据
         db.query(SprintTask).delete()
         db.query(Sprint).delete()
-        db.commit()
+        db.query(RecurringTask).update({RecurringTask.done_bits: "0"})  # 习惯保留，完成状态清零
 
-        # 生成 36 个 sprint
-        cur = start
-        for i in range(1, 37):
-            s = Sprint(
+        # 日期表一次算好，一次性写入
+        db.add_all(
+            Sprint(
                 sprint_no=i,
-                start_date=cur,
-                end_date=date.fromordinal(cur.toordinal() + 9),
+                start_date=s,
+                end_date=e,
                 theme="",
                 objective="",
                 review="",
                 mit="",
             )
-            db.add(s)
-            cur = date.fromordinal(cur.toordinal() + 10)
-
+            for i, (s, e) in enumerate(cycle_table(start, count, length, skip), start=1)
+        )
         db.commit()
     finally:
         db.close()
@@ -284,26 +371,56 @@ def update_sprint_text(sprint_no: int, theme: str, objective: str, review: str,
         db.close()
 
 
+def _ensure_ranks(db, sprint_id: int):
+    """旧数据没有 rank：按 id 顺序一次性补齐（只在该周期里有空 rank 时发生）"""
+    q = db.query(SprintTask).filter(SprintTask.sprint_id == sprint_id)
+    if q.filter(SprintTask.rank.is_(None)).first() is None:
+        return
+    rows = q.order_by(SprintTask.rank.asc(), SprintTask.id.asc()).all()
+    for t, r in zip(rows, initial_ranks(len(rows))):
+        t.rank = r
+    db.flush()
+
+
+def _last_rank(db, sprint_id: int, exclude_id: Optional[int] = None) -> Optional[str]:
+    q = db.query(func.max(SprintTask.rank)).filter(SprintTask.sprint_id == sprint_id)
+    if exclude_id is not None:
+        q = q.filter(SprintTask.id != exclude_id)
+    return q.scalar()
+
+
 def add_task_to_sprint(sprint_no: int, title: str, source_care_id: Optional[int] = None):
     db = get_session()
     try:
         s = db.query(Sprint).filter(Sprint.sprint_no == sprint_no).first()
         if not s:
             return
-        t = SprintTask(sprint_id=s.id, title=title, done=False, evidence="", source_care_id=source_care_id)
+        _ensure_ranks(db, s.id)
+        t = SprintTask(sprint_id=s.id, title=title, done=False, evidence="", source_care_id=source_care_id,
+                       rank=rank_between(_last_rank(db, s.id), None))
         db.add(t)
         db.commit()
     finally:
         db.close()
 
 
+def _set_done(t: SprintTask, done: bool):
+    """改完成状态：从未完成 → 完成时记下 done_at；取消完成时清掉"""
+    done = bool(done)
+    if done and not t.done:
+        t.done_at = datetime.now().replace(microsecond=0)
+    elif not done:
+        t.done_at = None
+    t.done = done
+
+
 def toggle_task_done(task_id: int, done: bool):
     db = get_session()
     try:
         t = db.query(SprintTask).filter(SprintTask.id == task_id).first()
         if not t:
             return
-        t.done = done
+        _set_done(t, done)
         db.commit()
     finally:
         db.close()
@@ -321,15 +438,362 @@ def update_task_evidence(task_id: int, evidence: str):
         db.close()
 
 
+def update_task_evidence_bulk(updates: Dict[int, str]) -> int:
+    """批量写证据：一次查询、一个事务（详情页攒下的多条编辑一起提交）"""
+    if not updates:
+        return 0
+    db = get_session()
+    try:
+        tasks = db.query(SprintTask).filter(SprintTask.id.in_(list(updates))).all()
+        for t in tasks:
+            t.evidence = updates[t.id] or ""
+        db.commit()
+        return len(tasks)
+    finally:
+        db.close()
+
+
+def bulk_update_plan(
+    sprint_updates: Optional[Dict[int, dict]] = None,
+    task_updates: Optional[Dict[int, dict]] = None,
+    new_tasks: Optional[List[tuple]] = None,
+    task_moves: Optional[Dict[int, int]] = None,
+) -> int:
+    """
+    批量改计划：一个事务（表格批量编辑 / 导入 Excel 用）。参数同 store.bulk_update_plan：
+    sprint_updates {sprint_no: {"theme"/"objective"/"review"}}，task_updates {task_id: {"title"/"done"/"evidence"}}，
+    new_tasks [(sprint_no, title, done[, evidence])]（同周期同名任务跳过），
+    task_moves {task_id: sprint_no}（移到该周期末尾）。返回实际改动条数。
+    """
+    sprint_updates = sprint_updates or {}
+    # 表格编辑传来的 task_id 是字符串：统一成 int，和 SprintTask.id 对得上
+    task_updates = {int(k): v for k, v in (task_updates or {}).items()}
+    task_moves = {int(k): int(v) for k, v in (task_moves or {}).items()}
+    new_tasks = new_tasks or []
+    n = 0
+    db = get_session()
+    try:
+        sprints = db.query(Sprint).all()
+        sid = {s.sprint_no: s.id for s in sprints}
+        for s in sprints:
+            for k, v in (sprint_updates.get(s.sprint_no) or {}).items():
+                if k in ("theme", "objective", "review"):
+                    setattr(s, k, v or "")
+                    n += 1
+        if task_updates:
+            for t in db.query(SprintTask).filter(SprintTask.id.in_(list(task_updates))).all():
+                for k, v in task_updates[t.id].items():
+                    if k == "done":
+                        _set_done(t, v)
+                        n += 1
+                    elif k in ("title", "evidence"):
+                        setattr(t, k, v or "")
+                        n += 1
+
+        last = {}
+        if task_moves:
+            db.flush()
+            moved = db.query(SprintTask).filter(SprintTask.id.in_(list(task_moves))).order_by(
+                SprintTask.sprint_id.asc(), SprintTask.rank.asc(), SprintTask.id.asc()).all()
+            for t in moved:
+                s_id = sid.get(task_moves[t.id])
+                if s_id is None or s_id == t.sprint_id:
+                    continue
+                if s_id not in last:
+                    _ensure_ranks(db, s_id)
+                    last[s_id] = _last_rank(db, s_id)
+                last[s_id] = rank_between(last[s_id], None)
+                t.sprint_id, t.rank = s_id, last[s_id]
+                n += 1
+
+        if new_tasks:
+            db.flush()
+            seen = {}
+            for sprint_no, title, done, *rest in new_tasks:
+                s_id = sid.get(int(sprint_no))
+                title = (title or "").strip()
+                if s_id is None or not title:
+                    continue
+                if s_id not in seen:
+                    if s_id not in last:
+                        _ensure_ranks(db, s_id)
+                        last[s_id] = _last_rank(db, s_id)
+                    seen[s_id] = {
+                        (x or "").strip()
+                        for (x,) in db.query(SprintTask.title).filter(SprintTask.sprint_id == s_id).all()
+                    }
+                if title in seen[s_id]:
+                    continue
+                seen[s_id].add(title)
+                last[s_id] = rank_between(last[s_id], None)
+                db.add(SprintTask(sprint_id=s_id, title=title, done=bool(done), evidence=(rest[0] if rest else "") or "",
+                                  done_at=datetime.now().replace(microsecond=0) if done else None, rank=last[s_id]))
+                n += 1
+        db.commit()
+        return n
+    finally:
+        db.close()
+
+
 def list_tasks_for_sprint(sprint_no: int) -> List[SprintTask]:
     db = get_session()
     try:
         s = db.query(Sprint).filter(Sprint.sprint_no == sprint_no).first()
         if not s:
             return []
-        return db.query(SprintTask).filter(SprintTask.sprint_id == s.id).order_by(SprintTask.id.asc()).all()
+        return (
+            db.query(SprintTask)
+            .filter(SprintTask.sprint_id == s.id)
+            .order_by(SprintTask.rank.asc(), SprintTask.id.asc())
+            .all()
+        )
+    finally:
+        db.close()
+
+
+def move_task(task_id: int, to_sprint: int, before_id: Optional[int] = None) -> bool:
+    """
+    把任务移到 to_sprint，排在 before_id 之前（None = 末尾）；同一周期内就是调整顺序。
+    一个事务，只更新被移动的这一行（sprint_id + rank）。
+    """
+    if task_id == before_id:
+        return False
+    db = get_session()
+    try:
+        t = db.query(SprintTask).filter(SprintTask.id == task_id).first()
+        s = db.query(Sprint).filter(Sprint.sprint_no == to_sprint).first()
+        if not t or not s:
+            return False
+        _ensure_ranks(db, s.id)
+
+        before = None
+        if before_id is not None:
+            before = (
+                db.query(SprintTask)
+                .filter(SprintTask.id == before_id, SprintTask.sprint_id == s.id)
+                .first()
+            )
+        if before is None:
+            prev_rank, next_rank = _last_rank(db, s.id, exclude_id=t.id), None
+        else:
+            prev_rank = (
+                db.query(func.max(SprintTask.rank))
+                .filter(SprintTask.sprint_id == s.id, SprintTask.rank < before.rank, SprintTask.id != t.id)
+                .scalar()
+            )
+            next_rank = before.rank
+
+        t.sprint_id = s.id
+        t.rank = rank_between(prev_rank, next_rank)
+        db.commit()
+        return True
+    finally:
+        db.close()
+
+
+def reorder_task(task_id: int, before_id: Optional[int] = None) -> bool:
+    """同一周期内调整顺序：排到 before_id 之前（None = 末尾）"""
+    db = get_session()
+    try:
+        row = (
+            db.query(Sprint.sprint_no)
+            .join(SprintTask, SprintTask.sprint_id == Sprint.id)
+            .filter(SprintTask.id == task_id)
+            .first()
+        )
     finally:
         db.close()
+    return bool(row) and move_task(task_id, row[0], before_id)
+
+
+def _rollover_plan(db, moves: Dict[int, int]) -> List[Tuple[SprintTask, int, int]]:
+    """
+    moves：{来源周期号: 目标周期号} → 实际会顺延的 [(任务, 目标 sprint_id, 目标周期号)]，只读。
+    没完成、没复制顺延过（rolled_to 为空）、目标周期里没有同名任务的才算。
+    """
+    if not moves:
+        return []
+    nos = set(moves) | set(moves.values())
+    sid = {s.sprint_no: s.id for s in db.query(Sprint).filter(Sprint.sprint_no.in_(list(nos))).all()}
+    pairs = {sid[a]: (sid[b], b) for a, b in moves.items() if a in sid and b in sid and a != b}
+    if not pairs:
+        return []
+    rows = (
+        db.query(SprintTask)
+        .filter(SprintTask.sprint_id.in_(list(pairs)), SprintTask.done.is_(False), SprintTask.rolled_to.is_(None))
+        .order_by(SprintTask.sprint_id.asc(), SprintTask.rank.asc(), SprintTask.id.asc())
+        .all()
+    )
+    seen = {
+        dst: {
+            (x or "").strip()
+            for (x,) in db.query(SprintTask.title).filter(SprintTask.sprint_id == dst).all()
+        }
+        for dst, _ in pairs.values()
+    }
+    plan = []
+    for t in rows:
+        dst, dst_no = pairs[t.sprint_id]
+        title = (t.title or "").strip()
+        if not title or title in seen[dst]:
+            continue
+        seen[dst].add(title)
+        plan.append((t, dst, dst_no))
+    return plan
+
+
+def _rollover(moves: Dict[int, int], copy: bool = False) -> int:
+    """
+    没完成的任务整批顺延（按 _rollover_plan），一个事务。证据和 source_care_id 保留。
+    copy=True 时原任务留在原周期、记下 rolled_to，在目标周期新建一份。
+    """
+    db = get_session()
+    try:
+        plan = _rollover_plan(db, moves)
+        last = {}
+        for dst in {dst for _, dst, _ in plan}:
+            _ensure_ranks(db, dst)
+            last[dst] = _last_rank(db, dst)
+        for t, dst, dst_no in plan:
+            last[dst] = rank_between(last[dst], None)
+            if copy:
+                t.rolled_to = dst_no
+                db.add(SprintTask(sprint_id=dst, title=(t.title or "").strip(), done=False, evidence=t.evidence or "",
+                                  source_care_id=t.source_care_id, rank=last[dst]))
+            else:
+                t.sprint_id, t.rank = dst, last[dst]
+        db.commit()
+        return len(plan)
+    finally:
+        db.close()
+
+
+def _pending(moves: Dict[int, int]) -> int:
+    db = get_session()
+    try:
+        return len(_rollover_plan(db, moves))
+    finally:
+        db.close()
+
+
+def _next_moves(from_no: int, to_no: Optional[int] = None) -> Dict[int, int]:
+    from_no = int(from_no)
+    return {from_no: int(to_no) if to_no is not None else from_no + 1}
+
+
+def rollover_unfinished(from_no: int, to_no: Optional[int] = None, copy: bool = False) -> int:
+    """第 from_no 期没完成的任务顺延到 to_no（默认下一期）；copy=True 时原周期保留一份"""
+    return _rollover(_next_moves(from_no, to_no), copy=copy)
+
+
+def rollover_pending(from_no: int, to_no: Optional[int] = None) -> int:
+    """rollover_unfinished 现在会顺延几条（已顺延过的、目标里已有同名的不算）"""
+    return _pending(_next_moves(from_no, to_no))
+
+
+def _catch_up_moves(today: Optional[date] = None) -> Tuple[Dict[int, int], Optional[int]]:
+    """已结束的各期 → 今天所在（或之后最先开始）的那一期"""
+    today = today or date.today()
+    db = get_session()
+    try:
+        target = (
+            db.query(Sprint.sprint_no)
+            .filter(Sprint.end_date >= today)
+            .order_by(Sprint.start_date.asc())
+            .first()
+        )
+        if not target:
+            return {}, None
+        elapsed = [no for (no,) in db.query(Sprint.sprint_no).filter(Sprint.end_date < today).all()]
+        return {no: target[0] for no in elapsed if no != target[0]}, target[0]
+    finally:
+        db.close()
+
+
+def catch_up_rollover(today: Optional[date] = None, copy: bool = False) -> Tuple[int, Optional[int]]:
+    """
+    所有已结束周期里没完成的任务，顺延到今天所在（或之后最先开始）的那一期。
+    返回 (顺延条数, 目标周期号)，和 store.catch_up_rollover 一致；计划已结束时返回 (0, None)。
+    """
+    moves, target = _catch_up_moves(today)
+    if target is None:
+        return 0, None
+    return _rollover(moves, copy=copy), target
+
+
+def catch_up_pending(today: Optional[date] = None) -> int:
+    """catch_up_rollover 现在会顺延几条（和它用同一份顺延清单）"""
+    moves, _ = _catch_up_moves(today)
+    return _pending(moves)
+
+
+# -------------------------
+# 重复习惯：一条定义 + 每期完成位集，按周期读取时展开
+# -------------------------
+def list_habits() -> List[RecurringTask]:
+    db = get_session()
+    try:
+        return db.query(RecurringTask).order_by(RecurringTask.id.asc()).all()
+    finally:
+        db.close()
+
+
+def add_habit(title: str) -> bool:
+    title = (title or "").strip()
+    if not title:
+        return False
+    db = get_session()
+    try:
+        if db.query(RecurringTask).filter(RecurringTask.title == title).first():
+            return False
+        db.add(RecurringTask(title=title, done_bits="0"))
+        db.commit()
+        return True
+    finally:
+        db.close()
+
+
+def update_habit_title(habit_id: int, title: str):
+    db = get_session()
+    try:
+        h = db.query(RecurringTask).filter(RecurringTask.id == habit_id).first()
+        if not h or not (title or "").strip():
+            return
+        h.title = title.strip()
+        db.commit()
+    finally:
+        db.close()
+
+
+def delete_habit(habit_id: int):
+    db = get_session()
+    try:
+        h = db.query(RecurringTask).filter(RecurringTask.id == habit_id).first()
+        if h:
+            db.delete(h)
+            db.commit()
+    finally:
+        db.close()
+
+
+def set_habit_done(habit_id: int, sprint_no: int, done: bool):
+    db = get_session()
+    try:
+        h = db.query(RecurringTask).filter(RecurringTask.id == habit_id).first()
+        if not h:
+            return
+        h.done_bits = format(bit_set(int(h.done_bits or "0", 16), sprint_no, done), "x")
+        db.commit()
+    finally:
+        db.close()
+
+
+def habit_tasks_for_sprint(sprint_no: int) -> List[dict]:
+    """本期的重复习惯：[{habit_id, title, done}]"""
+    return [
+        {"habit_id": h.id, "title": h.title, "done": bit_get(int(h.done_bits or "0", 16), sprint_no)}
+        for h in list_habits()
+    ]
 
 
 def add_care_record(
@@ -534,10 +998,14 @@ def list_goals():
         db.close()
 
 
-def list_backlog():
+def list_backlog(unscheduled_only: bool = False):
+    """unscheduled_only=True 时只要还没排进周期的（自动排期的来源）"""
     db = get_session()
     try:
-        return db.query(BacklogItem).filter(BacklogItem.profile_id == 1).order_by(BacklogItem.id.asc()).all()
+        q = db.query(BacklogItem).filter(BacklogItem.profile_id == 1)
+        if unscheduled_only:
+            q = q.filter(BacklogItem.sprint_no.is_(None))
+        return q.order_by(BacklogItem.id.asc()).all()
     finally:
         db.close()
 
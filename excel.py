@@ -0,0 +1,711 @@
+# excel.py
+# -*- coding: utf-8 -*-
+"""
+36×10 Excel 导出：6×6 大表（每格一个 10天行动周期：主题 / 交付物 / 任务）。
+- 网格按周期数排（cycles.grid_cols：36→6×6，52→8 列，12→4 列），标题里的 N×天数 按计划本身来
+- 样式全部注册为 NamedStyle，每个单元格只挂一个样式名（不再逐格 new Font/Fill/Border）
+- 按行 append 生成：同一套代码既能走普通 Workbook，也能走 write_only 流式模式
+- build_plans_workbook：多份计划写进同一个工作簿（每份一张表，默认流式）
+- 可选“进度”页：原生 Excel 图表（完成率柱图 / 累计燃起图 / CARE 转化），由 Excel 按数据区域绘制
+- parse_36x10_workbook / diff_plan：把用户改过的 6×6 大表读回来（read_only 流式），和当前计划对比
+- build_analysis_excel：分析版（pandas），Sprints / Tasks / CARE / AnnualDig 规范化多表，带 Excel 表格与筛选
+"""
+
+from __future__ import annotations
+
+import io
+import math
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+from openpyxl import Workbook, load_workbook
+from openpyxl.chart import BarChart, LineChart, Reference
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+from openpyxl.utils import get_column_letter
+from openpyxl.worksheet.cell_range import CellRange
+from openpyxl.worksheet.table import Table, TableStyleInfo
+
+from cycles import grid_cols, infer_length, plan_label
+
+XLSX_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+# =======================
+# 版式（页面/导入等处共用）
+# =======================
+BLOCK_COLS = 3      # 每个周期块宽 3 列
+BLOCK_ROWS = 10     # 每个周期块高 10 行：表头 1 + 交付物 2 + 任务 6 + 提示 1
+GAP_COL = 1
+GAP_ROW = 1
+GRID_COLS = 6       # 默认每行 6 个周期块（36 个周期）；实际按周期数 grid_cols() 算
+MAX_TASKS = 6
+FIRST_BLOCK_ROW = 2  # 第 1 行是大标题
+
+COL_WIDTH = 18
+GAP_COL_WIDTH = 3
+DEFAULT_ROW_HEIGHT = 18
+# 块内每一行的行高（按块内行号）
+BLOCK_ROW_HEIGHTS = [26, 38, 38] + [20] * MAX_TASKS + [18]
+
+_FONT = "Microsoft YaHei"
+
+
+def top_left_of_block(sprint_no: int, cols: int = GRID_COLS) -> Tuple[int, int]:
+    """第 sprint_no 个周期块左上角的 (行, 列)，都从 1 开始；cols = 每行几个块"""
+    idx = sprint_no - 1
+    block_r = idx // cols
+    block_c = idx % cols
+    start_row = FIRST_BLOCK_ROW + block_r * (BLOCK_ROWS + GAP_ROW)
+    start_col = 1 + block_c * (BLOCK_COLS + GAP_COL)
+    return start_row, start_col
+
+
+def total_cols(cols: int = GRID_COLS) -> int:
+    return cols * (BLOCK_COLS + GAP_COL)
+
+
+def _label(sprints: List[dict], length: Optional[int] = None) -> str:
+    """“36×10” 这样的计划名：周期数 × 每期天数（调用方传计划参数里的 length；没传时才按日期推）"""
+    return plan_label(len(sprints), length or infer_length(sprints))
+
+
+# =======================
+# NamedStyle（每个工作簿注册一次）
+# =======================
+def _named_styles() -> List[NamedStyle]:
+    thin = Side(style="thin", color="D0D0D0")
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    body = Font(name=_FONT, size=10, color="1F1F1F")
+    fill_task = PatternFill("solid", fgColor="FFFFFF")
+    task_align = Alignment(horizontal="left", vertical="center", wrap_text=True)
+    return [
+        NamedStyle(
+            name="wl_title",
+            font=Font(name=_FONT, bold=True, size=16, color="1F1F1F"),
+            alignment=Alignment(horizontal="center", vertical="center"),
+        ),
+        NamedStyle(
+            name="wl_header",
+            font=Font(name=_FONT, bold=True, size=11, color="FFFFFF"),
+            fill=PatternFill("solid", fgColor="6C5CE7"),
+            alignment=Alignment(horizontal="center", vertical="center", wrap_text=True),
+            border=border,
+        ),
+        NamedStyle(
+            name="wl_objective",
+            font=body,
+            fill=PatternFill("solid", fgColor="F7F7FB"),
+            alignment=Alignment(horizontal="left", vertical="top", wrap_text=True),
+            border=border,
+        ),
+        NamedStyle(name="wl_task", font=body, fill=fill_task, alignment=task_align, border=border),
+        NamedStyle(
+            name="wl_task_done",
+            font=body,
+            fill=PatternFill("solid", fgColor="E9F7EF"),
+            alignment=task_align,
+            border=border,
+        ),
+        NamedStyle(
+            name="wl_hint",
+            font=Font(name=_FONT, size=9, color="666666", italic=True),
+            fill=fill_task,
+            alignment=Alignment(horizontal="right", vertical="center"),
+            border=border,
+        ),
+    ]
+
+
+def register_styles(wb: Workbook):
+    """把 wl_* 样式注册到工作簿（重复调用无副作用）"""
+    existing = set(wb.named_styles)
+    for style in _named_styles():
+        if style.name not in existing:
+            wb.add_named_style(style)
+
+
+def _styled(ws, value, style: str):
+    # WriteOnlyCell 就是挂在 ws 上的 Cell：普通工作表的 append 也认
+    cell = WriteOnlyCell(ws, value=value)
+    cell.style = style
+    return cell
+
+
+# =======================
+# 单张 6×6 大表
+# =======================
+def _valid_sprints(sprints: Optional[Iterable]) -> List[dict]:
+    # store.py 的 sprint 是 dict；这里不依赖日期字段，直接容错
+    out = []
+    for sp in sprints or []:
+        if not isinstance(sp, dict):
+            continue
+        try:
+            no = int(sp.get("sprint_no") or 0)
+        except (TypeError, ValueError):
+            continue
+        if no > 0:
+            out.append(sp)
+    return out
+
+
+def _block_lines(sp: dict, is_en: bool) -> List[Tuple[Optional[str], str]]:
+    """一个周期块的 10 行：[(文本, 样式名)]"""
+    sprint_no = int(sp.get("sprint_no"))
+    theme = (sp.get("theme") or "").strip()
+    header_text = theme if theme else ("Untitled" if is_en else "未命名主题")
+    header_text = f"Cycle {sprint_no} | {header_text}" if is_en else f"第{sprint_no}周期｜{header_text}"
+
+    obj = (sp.get("objective") or "").strip()
+    obj_text = obj if obj else ("(Not set)" if is_en else "（未填写交付物）")
+    deliverable_label = "Deliverables:\n" if is_en else "交付物/成果：\n"
+
+    lines: List[Tuple[Optional[str], str]] = [
+        (header_text, "wl_header"),
+        (f"{deliverable_label}{obj_text}", "wl_objective"),
+        (None, "wl_objective"),
+    ]
+
+    tasks = sp.get("tasks") or []
+    tasks = tasks if isinstance(tasks, list) else []
+    show = tasks[:MAX_TASKS]
+    more = max(0, len(tasks) - len(show))
+    for i in range(MAX_TASKS):
+        if i < len(show):
+            tt = show[i]
+            done = bool(tt.get("done")) if isinstance(tt, dict) else False
+            title = (tt.get("title") if isinstance(tt, dict) else "") or ""
+            mark = "✅" if done else "⬜"
+            lines.append((f"{mark} {title}", "wl_task_done" if done else "wl_task"))
+        else:
+            lines.append(("", "wl_task"))
+
+    hint = (f"… {more} more tasks" if is_en else f"…还有 {more} 条任务") if more > 0 else ""
+    lines.append((hint, "wl_hint"))
+    return lines
+
+
+def _block_merges(r0: int, c0: int) -> List[CellRange]:
+    c1 = c0 + BLOCK_COLS - 1
+    ranges = [(r0, r0), (r0 + 1, r0 + 2)] + [(r0 + 3 + i, r0 + 3 + i) for i in range(MAX_TASKS)] + [(r0 + 9, r0 + 9)]
+    return [CellRange(min_col=c0, min_row=a, max_col=c1, max_row=b) for a, b in ranges]
+
+
+def write_36x10_sheet(ws, sprints, is_en: bool = False, length: Optional[int] = None) -> bool:
+    """
+    把一份计划按网格大表写进空工作表 ws（普通或 write_only 都行；36 个周期即 6×6）。
+    列宽/行高先设、再逐行 append；合并区域最后登记。没有有效周期时返回 False。
+    """
+    valid = _valid_sprints(sprints)
+    if not valid:
+        return False
+
+    by_no = {int(sp.get("sprint_no")): sp for sp in valid}
+    cols = grid_cols(max(by_no))
+    n_bands = math.ceil(max(by_no) / cols)
+    ncols = total_cols(cols)
+
+    # ---- 列宽 / 行高（write_only 必须在写行之前设）----
+    for c in range(1, ncols + 1):
+        gap = (c % (BLOCK_COLS + GAP_COL)) == 0
+        ws.column_dimensions[get_column_letter(c)].width = GAP_COL_WIDTH if gap else COL_WIDTH
+    ws.row_dimensions[1].height = 28
+    for band in range(n_bands):
+        r0 = FIRST_BLOCK_ROW + band * (BLOCK_ROWS + GAP_ROW)
+        for k, h in enumerate(BLOCK_ROW_HEIGHTS):
+            ws.row_dimensions[r0 + k].height = h
+        ws.row_dimensions[r0 + BLOCK_ROWS].height = DEFAULT_ROW_HEIGHT
+
+    # sheetView 和列宽一样在第一行写出之前就定下来
+    ws.freeze_panes = "A2"
+    merges = [CellRange(min_col=1, min_row=1, max_col=ncols, max_row=1)]
+
+    # ---- 第 1 行：大标题 ----
+    label, grid = _label(valid, length), f"{n_bands}×{cols}"
+    title_text = f"{label} Growth Plan ({grid} Master Sheet)" if is_en else f"{label} 自我提升计划（{grid} 大表）"
+    ws.append([_styled(ws, title_text, "wl_title")])
+
+    # ---- 逐个“块行”：每块行 cols 个周期并排，10 行 + 1 行间隔 ----
+    for band in range(n_bands):
+        lines_by_col = {}
+        for k in range(cols):
+            sp = by_no.get(band * cols + k + 1)
+            if sp is None:
+                continue
+            r0, c0 = top_left_of_block(int(sp.get("sprint_no")), cols)
+            lines_by_col[c0] = _block_lines(sp, is_en)
+            merges.extend(_block_merges(r0, c0))
+
+        for k in range(BLOCK_ROWS):
+            row = [None] * ncols
+            for c0, lines in lines_by_col.items():
+                text, style = lines[k]
+                row[c0 - 1] = _styled(ws, text, style)
+                # 合并区内被覆盖的格子也挂同一样式：边框才完整
+                for dc in range(1, BLOCK_COLS):
+                    row[c0 - 1 + dc] = _styled(ws, None, style)
+            ws.append(row)
+        ws.append([])
+
+    # 各块的合并区按构造互不重叠：直接并入集合，跳过 MultiCellRange.add 的逐个包含检查（O(n²)）
+    ws.merged_cells.ranges.update(merges)
+    return True
+
+
+# =======================
+# 进度页：数据区 + 原生图表（不渲染图片，文件小、打开即算）
+# =======================
+PROGRESS_HEADERS_EN = ["Cycle", "Tasks", "Done", "Done %", "Cum. tasks", "Cum. done"]
+PROGRESS_HEADERS_ZH = ["周期", "任务数", "完成数", "完成率", "累计任务", "累计完成"]
+_PROGRESS_FIRST_ROW = 3   # 第 1 行标题，第 2 行空，第 3 行表头
+_CARE_COL = 9             # CARE 转化数据从 I 列开始
+
+
+def progress_rows(sprints) -> List[Tuple[int, int, int, float, int, int]]:
+    """[(周期号, 任务数, 完成数, 完成率, 累计任务, 累计完成)]，按周期号排序"""
+    rows = []
+    cum_total = cum_done = 0
+    for sp in sorted(_valid_sprints(sprints), key=lambda x: int(x.get("sprint_no"))):
+        tasks = [t for t in (sp.get("tasks") or []) if isinstance(t, dict)]
+        total = len(tasks)
+        done = sum(1 for t in tasks if bool(t.get("done", False)))
+        cum_total += total
+        cum_done += done
+        rows.append((int(sp.get("sprint_no")), total, done, (done / total) if total else 0.0, cum_total, cum_done))
+    return rows
+
+
+def care_conversion(sprints, care_records) -> List[Tuple[str, int]]:
+    """CARE → 任务 漏斗：全部记录 / 强相关(≥4) / 已转任务 / 转化任务已完成"""
+    recs = [r for r in care_records or [] if isinstance(r, dict)]
+    tasks = [t for sp in _valid_sprints(sprints) for t in (sp.get("tasks") or []) if isinstance(t, dict)]
+    linked = {}
+    for t in tasks:
+        src = str(t.get("source_care_id") or "").strip()
+        if src:
+            linked[src] = linked.get(src, False) or bool(t.get("done", False))
+
+    def _score(r):
+        try:
+            return int(r.get("relevance_score") or 0)
+        except (TypeError, ValueError):
+            return 0
+
+    ids = [str(r.get("id", "")) for r in recs]
+    return [
+        ("records", len(recs)),
+        ("strong", sum(1 for r in recs if _score(r) >= 4)),
+        ("converted", sum(1 for i in ids if i in linked)),
+        ("done", sum(1 for i in ids if linked.get(i))),
+    ]
+
+
+def write_progress_sheet(ws, sprints, care_records=None, is_en: bool = False, length: Optional[int] = None) -> bool:
+    """进度页：左边周期数据，I:J 为 CARE 转化，右侧三张原生图表。没有周期时返回 False。"""
+    rows = progress_rows(sprints)
+    if not rows:
+        return False
+
+    first = _PROGRESS_FIRST_ROW
+    last = first + len(rows)
+    care = care_conversion(sprints, care_records)
+    care_labels = {
+        "records": ("CARE records", "CARE 记录"),
+        "strong": ("Strong (≥4)", "强相关（≥4）"),
+        "converted": ("Turned into tasks", "已转为任务"),
+        "done": ("Tasks done", "转化任务已完成"),
+    }
+
+    for c in range(1, 7):
+        ws.column_dimensions[get_column_letter(c)].width = 11
+    ws.column_dimensions[get_column_letter(_CARE_COL)].width = 18
+    ws.row_dimensions[1].height = 28
+    ws.freeze_panes = f"A{first + 1}"
+
+    label = _label(_valid_sprints(sprints), length)
+    title = f"{label} Progress" if is_en else f"{label} 进度"
+    ws.append([_styled(ws, title, "wl_title")])
+    ws.append([])
+
+    headers = PROGRESS_HEADERS_EN if is_en else PROGRESS_HEADERS_ZH
+    care_headers = ["CARE", "Count" if is_en else "数量"]
+    ws.append([_styled(ws, h, "wl_header") for h in headers] + [None, None]
+              + [_styled(ws, h, "wl_header") for h in care_headers])
+
+    for i, (no, total, done, rate, cum_total, cum_done) in enumerate(rows):
+        rate_cell = WriteOnlyCell(ws, value=rate)
+        rate_cell.number_format = "0%"
+        label = f"Cycle {no}" if is_en else f"第{no}周期"
+        row = [label, total, done, rate_cell, cum_total, cum_done]
+        if i < len(care):
+            key, n = care[i]
+            row += [None, None, care_labels[key][0 if is_en else 1], n]
+        ws.append(row)
+
+    cats = Reference(ws, min_col=1, min_row=first + 1, max_row=last)
+
+    bar = BarChart()
+    bar.type = "col"
+    bar.title = "Completion by cycle" if is_en else "各周期完成率"
+    bar.y_axis.title = headers[3]
+    bar.y_axis.number_format = "0%"
+    bar.y_axis.scaling.min = 0
+    bar.y_axis.scaling.max = 1
+    bar.add_data(Reference(ws, min_col=4, min_row=first, max_row=last), titles_from_data=True)
+    bar.set_categories(cats)
+    bar.legend = None
+    bar.width, bar.height = 24, 8
+    ws.add_chart(bar, "L3")
+
+    burn = LineChart()
+    burn.title = "Burn-up" if is_en else "累计燃起图"
+    burn.y_axis.title = "Tasks" if is_en else "任务"
+    burn.add_data(Reference(ws, min_col=5, max_col=6, min_row=first, max_row=last), titles_from_data=True)
+    burn.set_categories(cats)
+    burn.width, burn.height = 24, 8
+    ws.add_chart(burn, "L20")
+
+    funnel = BarChart()
+    funnel.type = "bar"
+    funnel.title = "CARE → tasks" if is_en else "CARE 转化"
+    funnel.add_data(Reference(ws, min_col=_CARE_COL + 1, min_row=first, max_row=first + len(care)), titles_from_data=True)
+    funnel.set_categories(Reference(ws, min_col=_CARE_COL, min_row=first + 1, max_row=first + len(care)))
+    funnel.x_axis.scaling.orientation = "maxMin"  # 漏斗自上而下
+    funnel.legend = None
+    funnel.width, funnel.height = 24, 7
+    ws.add_chart(funnel, "L37")
+
+    # openpyxl 3.1 不写 <c:delete val="0">，新版 Excel 会把坐标轴当成隐藏
+    for chart in (bar, burn, funnel):
+        chart.x_axis.delete = False
+        chart.y_axis.delete = False
+    return True
+
+
+def _save(wb: Workbook) -> bytes:
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+def build_36x10_excel(
+    sprints,
+    is_en: bool = False,
+    write_only: bool = False,
+    with_progress: bool = False,
+    care_records=None,
+    length: Optional[int] = None,
+) -> bytes:
+    """
+    单份计划 → xlsx 字节；没有周期时返回 b""（调用方据此提示先去生成周期）。
+    with_progress=True 时追加“进度”页（原生图表；CARE 转化需要传 care_records）。
+    length：每期天数（store.get_plan()["length"]），用于表名/标题。
+    """
+    wb = Workbook(write_only=write_only)
+    register_styles(wb)
+    ws = wb.create_sheet() if write_only else wb.active
+    label = _label(_valid_sprints(sprints), length)
+    ws.title = f"{label} Plan" if is_en else f"{label} 自我提升计划"
+    if not write_36x10_sheet(ws, sprints, is_en=is_en, length=length):
+        return b""
+    if with_progress:
+        write_progress_sheet(wb.create_sheet("Progress" if is_en else "进度"), sprints, care_records,
+                             is_en=is_en, length=length)
+    return _save(wb)
+
+
+# =======================
+# 多份计划 → 一个工作簿
+# =======================
+_BAD_TITLE_CHARS = set('[]:*?/\\')
+
+
+def _sheet_title(raw: str, used: set) -> str:
+    base = "".join("_" if ch in _BAD_TITLE_CHARS else ch for ch in (raw or "").strip()) or "Plan"
+    base = base[:31]
+    title = base
+    n = 2
+    while title.lower() in used:
+        suffix = f" ({n})"
+        title = base[: 31 - len(suffix)] + suffix
+        n += 1
+    used.add(title.lower())
+    return title
+
+
+def build_plans_workbook(plans, is_en: bool = False, write_only: bool = True) -> bytes:
+    """
+    plans: [(表名, sprints), ...]，每份计划一张 6×6 大表。
+    默认 write_only：行写完就落到临时文件，计划再多内存也基本不涨。
+    """
+    wb = Workbook(write_only=write_only)
+    register_styles(wb)
+    if not write_only:
+        wb.remove(wb.active)
+
+    used: set = set()
+    written = 0
+    for title, sprints in plans:
+        if not _valid_sprints(sprints):
+            continue
+        ws = wb.create_sheet(title=_sheet_title(title, used))
+        write_36x10_sheet(ws, sprints, is_en=is_en)
+        written += 1
+
+    if not written:
+        return b""
+    return _save(wb)
+
+
+# =======================
+# 导入：读回网格大表（和 write_36x10_sheet 同一套块几何；周期号取自块表头，和每行几块无关）
+# =======================
+_HEADER_RE = re.compile(r"^\s*(?:第\s*(\d+)\s*周期\s*[｜|]|Cycle\s*(\d+)\s*\|)\s*(.*)$", re.S)
+_DELIVERABLE_PREFIXES = ("交付物/成果：", "交付物/成果:", "Deliverables:")
+_PLACEHOLDERS = {"未命名主题", "Untitled", "（未填写交付物）", "(Not set)"}
+_DONE_MARKS = ("✅", "☑", "✔", "[x]", "[X]")
+_OPEN_MARKS = ("⬜", "☐", "[ ]")
+
+
+def _text(v) -> str:
+    return "" if v is None else str(v).strip()
+
+
+def _parse_header(v) -> Tuple[Optional[int], str]:
+    """块表头 → (周期号 或 None, 主题)"""
+    s = _text(v)
+    m = _HEADER_RE.match(s)
+    if not m:
+        return None, ("" if s in _PLACEHOLDERS else s)
+    theme = m.group(3).strip()
+    return int(m.group(1) or m.group(2)), ("" if theme in _PLACEHOLDERS else theme)
+
+
+def _parse_objective(v) -> str:
+    s = _text(v)
+    for prefix in _DELIVERABLE_PREFIXES:
+        if s.startswith(prefix):
+            s = s[len(prefix):].strip()
+            break
+    return "" if s in _PLACEHOLDERS else s
+
+
+def _parse_task(v) -> Optional[Tuple[str, bool]]:
+    """“✅ 标题” / “⬜ 标题” → (标题, 是否完成)；没有勾选标记的非空行当作未完成任务"""
+    s = _text(v)
+    if not s:
+        return None
+    for marks, done in ((_DONE_MARKS, True), (_OPEN_MARKS, False)):
+        for mark in marks:
+            if s.startswith(mark):
+                title = s[len(mark):].strip()
+                return (title, done) if title else None
+    return s, False
+
+
+def parse_36x10_workbook(fileobj) -> Dict[int, dict]:
+    """
+    read_only + values_only 逐行扫第一张表，按块几何（高 BLOCK_ROWS、宽 BLOCK_COLS）切块：
+    {sprint_no: {"theme": str, "objective": str, "tasks": [(title, done), ...]}}
+    只解析有表头的块；周期号读自表头（“第N周期｜” / “Cycle N |”），读不到时按 6 列网格推算。
+    不加载单元格对象/样式，几百份上传也不占内存。
+    """
+    wb = load_workbook(fileobj, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        band_h = BLOCK_ROWS + GAP_ROW
+        block_w = BLOCK_COLS + GAP_COL
+        plan: Dict[int, dict] = {}
+        band_nos: Dict[int, int] = {}  # 当前块行：块列 → 周期号
+        for r, row in enumerate(ws.iter_rows(min_row=FIRST_BLOCK_ROW, values_only=True), start=FIRST_BLOCK_ROW):
+            band, k = divmod(r - FIRST_BLOCK_ROW, band_h)
+            if k >= BLOCK_ROWS:
+                continue
+            if k == 0:
+                band_nos = {}
+            for bc in range(math.ceil(len(row) / block_w)):
+                col = bc * block_w  # 块左上角（0 起）
+                v = row[col] if col < len(row) else None
+                if k == 0:
+                    if _text(v):
+                        no, theme = _parse_header(v)
+                        no = no or band * GRID_COLS + bc + 1
+                        band_nos[bc] = no
+                        plan[no] = {"theme": theme, "objective": "", "tasks": []}
+                    continue
+                blk = plan.get(band_nos.get(bc))
+                if blk is None:
+                    continue
+                if k == 1:
+                    blk["objective"] = _parse_objective(v)
+                elif 3 <= k < 3 + MAX_TASKS:
+                    task = _parse_task(v)
+                    if task:
+                        blk["tasks"].append(task)
+        return plan
+    finally:
+        wb.close()
+
+
+def diff_plan(parsed: Dict[int, dict], sprints) -> dict:
+    """
+    对比解析结果与当前计划，产出 store.bulk_update_plan 的参数 + 可读的变更清单：
+    - 主题/交付物不同 → 更新
+    - 同名任务勾选状态不同 → 更新 done
+    - 表里多出来的任务 → 新增
+    表里只放得下前 6 条任务，所以表里没有的任务不删。
+    """
+    by_no = {int(sp.get("sprint_no")): sp for sp in _valid_sprints(sprints)}
+    sprint_updates: Dict[int, dict] = {}
+    task_updates: Dict[str, dict] = {}
+    new_tasks: List[Tuple[int, str, bool]] = []
+    changes: List[Tuple[int, str, str]] = []
+
+    for no in sorted(parsed):
+        sp = by_no.get(no)
+        if sp is None:
+            continue
+        blk = parsed[no]
+
+        upd = {}
+        for field in ("theme", "objective"):
+            if blk[field] != (sp.get(field) or "").strip():
+                upd[field] = blk[field]
+                changes.append((no, field, blk[field]))
+        if upd:
+            sprint_updates[no] = upd
+
+        existing = {}
+        for t in sp.get("tasks") or []:
+            if isinstance(t, dict):
+                existing.setdefault((t.get("title") or "").strip(), t)
+        seen = set()
+        for title, done in blk["tasks"]:
+            if title in seen:
+                continue
+            seen.add(title)
+            t = existing.get(title)
+            if t is None:
+                new_tasks.append((no, title, done))
+                changes.append((no, "task_add", title))
+            elif bool(t.get("done", False)) != done:
+                task_updates[str(t.get("id"))] = {"done": done}
+                changes.append((no, "task_done" if done else "task_undone", title))
+
+    return {"sprint_updates": sprint_updates, "task_updates": task_updates, "new_tasks": new_tasks, "changes": changes}
+
+
+# =======================
+# 分析版：规范化多表（pandas）
+# 列名固定用英文 snake_case，方便教练把几百份导出直接拼起来分析
+# =======================
+SPRINT_COLUMNS = ["sprint_no", "start_date", "end_date", "theme", "objective", "review",
+                  "task_count", "done_count", "done_rate"]
+TASK_COLUMNS = ["sprint_no", "position", "task_id", "title", "done", "evidence", "source_care_id"]
+CARE_COLUMNS = ["care_id", "created_at", "capture_source", "cognition", "action", "relationship",
+                "ego_drive", "vow_tag", "relevance_score", "tags"]
+DIG_COLUMNS = ["section", "category", "position", "item"]
+
+# 四象限：页面同时写中英两个 key（同一份清单），这里按英文 key 取一次
+_QUADRANTS = (("study", "学业"), ("career", "事业"), ("growth", "成长"), ("health", "身体"))
+_INTERSECTIONS = ("center", "resp_dream", "resp_talent", "dream_talent")
+
+
+def _sprints_frame(sprints) -> "tuple[pd.DataFrame, pd.DataFrame]":
+    valid = _valid_sprints(sprints)
+    sp_df = pd.DataFrame.from_records(
+        [{c: sp.get(c, "") for c in SPRINT_COLUMNS[:6]} for sp in valid],
+        columns=SPRINT_COLUMNS[:6],
+    )
+    task_df = pd.DataFrame.from_records(
+        [
+            (int(sp.get("sprint_no")), i + 1, t.get("id", ""), t.get("title", ""), bool(t.get("done", False)),
+             t.get("evidence", ""), t.get("source_care_id", ""))
+            for sp in valid
+            for i, t in enumerate(sp.get("tasks") or [])
+            if isinstance(t, dict)
+        ],
+        columns=TASK_COLUMNS,
+    )
+
+    sp_df["sprint_no"] = sp_df["sprint_no"].astype(int)
+    counts = task_df.groupby("sprint_no")["done"].agg(task_count="size", done_count="sum")
+    sp_df = sp_df.join(counts, on="sprint_no")
+    sp_df[["task_count", "done_count"]] = sp_df[["task_count", "done_count"]].fillna(0).astype(int)
+    sp_df["done_rate"] = (sp_df["done_count"] / sp_df["task_count"].where(sp_df["task_count"] > 0)).fillna(0.0).round(3)
+    return sp_df.sort_values("sprint_no")[SPRINT_COLUMNS], task_df
+
+
+def _care_frame(care_records) -> pd.DataFrame:
+    df = pd.DataFrame.from_records([r for r in care_records or [] if isinstance(r, dict)])
+    df = df.rename(columns={"id": "care_id"}).reindex(columns=CARE_COLUMNS, fill_value="")
+    df["relevance_score"] = pd.to_numeric(df["relevance_score"], errors="coerce").fillna(0).astype(int)
+    return df
+
+
+def _dig_frame(annual_dig) -> pd.DataFrame:
+    annual_dig = annual_dig if isinstance(annual_dig, dict) else {}
+    rows = []
+    for section in ("talent", "responsibility", "dream"):
+        quads = annual_dig.get(section) or {}
+        quads = quads if isinstance(quads, dict) else {}
+        for en_k, zh_k in _QUADRANTS:
+            items = quads.get(en_k) or quads.get(zh_k) or []
+            rows.extend((section, en_k, i + 1, str(x)) for i, x in enumerate(items) if str(x).strip())
+
+    inter = annual_dig.get("intersections") or {}
+    inter = inter if isinstance(inter, dict) else {}
+    for k in _INTERSECTIONS:
+        items = inter.get(k) or []
+        rows.extend(("intersection", k, i + 1, str(x)) for i, x in enumerate(items) if str(x).strip())
+    return pd.DataFrame.from_records(rows, columns=DIG_COLUMNS)
+
+
+def _clean_text(df: pd.DataFrame) -> pd.DataFrame:
+    # openpyxl 拒绝控制字符（粘贴来的文本偶尔带）；按列一次性替换
+    text_cols = [c for c in df.columns if pd.api.types.is_string_dtype(df[c])]
+    if text_cols:
+        df[text_cols] = df[text_cols].fillna("").astype(str).replace(ILLEGAL_CHARACTERS_RE, "", regex=True)
+    return df
+
+
+def _add_table(ws, df: pd.DataFrame, name: str):
+    """整张表注册成 Excel 表格（自带筛选按钮）；顺便按内容设列宽"""
+    ncols = len(df.columns)
+    for i, col in enumerate(df.columns, start=1):
+        longest = int(df[col].astype(str).str.len().max()) if len(df) else 0
+        ws.column_dimensions[get_column_letter(i)].width = min(60, max(10, len(col) + 2, longest + 2))
+    ws.freeze_panes = "A2"
+    if df.empty:
+        return
+    ref = f"A1:{get_column_letter(ncols)}{len(df) + 1}"
+    table = Table(displayName=name, ref=ref)
+    table.tableStyleInfo = TableStyleInfo(name="TableStyleMedium2", showRowStripes=True)
+    ws.add_table(table)
+
+
+def build_analysis_excel(sprints, care_records=None, annual_dig=None) -> bytes:
+    """
+    分析版工作簿：每张表一个 DataFrame、一次 to_excel 写完。
+    - Sprints：周期 + 任务数/完成数/完成率
+    - Tasks：全部任务（不截断），含 done / evidence / source_care_id
+    - CARE：全部 CARE 记录
+    - AnnualDig：四象限与交集条目（section / category / position / item）
+    """
+    sp_df, task_df = _sprints_frame(sprints)
+    sheets = [
+        ("Sprints", sp_df),
+        ("Tasks", task_df),
+        ("CARE", _care_frame(care_records)),
+        ("AnnualDig", _dig_frame(annual_dig)),
+    ]
+
+    buf = io.BytesIO()
+    with pd.ExcelWriter(buf, engine="openpyxl") as writer:
+        for name, df in sheets:
+            df = _clean_text(df)
+            df.to_excel(writer, sheet_name=name, index=False)
+            _add_table(writer.sheets[name], df, name)
+    return buf.getvalue()
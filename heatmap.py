@@ -0,0 +1,135 @@
+# heatmap.py
+# -*- coding: utf-8 -*-
+"""
+全年完成热力图（GitHub 风格：一列一周、一行一个星期几）：
+- 完成日期取任务的 done_at（勾选完成时记录）；旧数据没有 done_at 的，按所在周期的结束日算（不晚于今天）
+- 计数一次算完：ISO 日期 → datetime64[D] 数组 → 相对计划开始日的偏移 → np.bincount
+- 渲染成一张 imshow 栅格图（一个 AxesImage），而不是每天一个方块 patch
+"""
+
+from __future__ import annotations
+
+import io
+from datetime import date, timedelta
+from typing import Optional, Tuple
+
+import numpy as np
+from matplotlib.colors import ListedColormap
+from matplotlib.figure import Figure
+
+from poster import FORMAT_MIME, setup_fonts
+
+# 0 次 + 四档深浅（GitHub 配色）
+HEATMAP_COLORS = ["#ebedf0", "#9be9a8", "#40c463", "#30a14e", "#216e39"]
+HEATMAP_DPI = 160
+
+_WEEKDAYS_ZH = ["一", "", "三", "", "五", "", "日"]
+_WEEKDAYS_EN = ["Mon", "", "Wed", "", "Fri", "", "Sun"]
+
+
+def _plan_span(sprints) -> Optional[Tuple[date, int]]:
+    """(计划开始日, 天数)：第一期开始到最后一期结束"""
+    starts = [sp.get("start_date") for sp in sprints or [] if isinstance(sp, dict) and sp.get("start_date")]
+    ends = [sp.get("end_date") for sp in sprints or [] if isinstance(sp, dict) and sp.get("end_date")]
+    if not starts or not ends:
+        return None
+    first = date.fromisoformat(str(min(starts))[:10])
+    last = date.fromisoformat(str(max(ends))[:10])
+    return first, max(1, (last - first).days + 1)
+
+
+def completion_days(sprints, today: Optional[date] = None) -> Tuple[Optional[date], np.ndarray]:
+    """
+    (计划开始日, 每天完成数数组)。计划外的完成不计；没有周期时返回 (None, 空数组)。
+    """
+    span = _plan_span(sprints)
+    if span is None:
+        return None, np.zeros(0, dtype=int)
+    first, n_days = span
+    today_s = (today or date.today()).isoformat()
+
+    days = [
+        str(t.get("done_at") or min(str(sp.get("end_date") or ""), today_s))[:10]
+        for sp in sprints or []
+        if isinstance(sp, dict)
+        for t in sp.get("tasks") or []
+        if isinstance(t, dict) and t.get("done")
+    ]
+    arr = np.array([d for d in days if len(d) == 10], dtype="datetime64[D]")
+    offsets = (arr - np.datetime64(first, "D")).astype(int)
+    offsets = offsets[(offsets >= 0) & (offsets < n_days)]
+    return first, np.bincount(offsets, minlength=n_days)
+
+
+def heatmap_grid(first: date, counts: np.ndarray) -> np.ma.MaskedArray:
+    """每天计数 → 7 × 周数 的网格（行 = 周一..周日）；补齐首尾的空格子被遮住"""
+    lead = first.weekday()
+    total = lead + len(counts)
+    cols = -(-total // 7)
+    flat = np.full(cols * 7, -1, dtype=int)
+    flat[lead:lead + len(counts)] = counts
+    grid = flat.reshape(cols, 7).T
+    return np.ma.masked_less(grid, 0)
+
+
+def _levels(grid: np.ma.MaskedArray) -> np.ma.MaskedArray:
+    """计数 → 0..4 档：0 单独一档，其余按最大值四等分"""
+    peak = int(grid.max()) if grid.count() else 0
+    if peak <= 0:
+        return np.ma.zeros_like(grid)
+    return np.ma.where(grid > 0, np.ceil(grid / peak * 4).clip(1, 4), 0)
+
+
+def render_heatmap(
+    first: Optional[date],
+    counts: np.ndarray,
+    is_en: bool = False,
+    fmt: str = "png",
+) -> bytes:
+    """画一张热力图，返回文件字节；没有周期时返回 b""。"""
+    if first is None or not len(counts):
+        return b""
+    if fmt not in FORMAT_MIME:
+        raise ValueError(f"unknown heatmap format: {fmt}")
+    setup_fonts()
+
+    grid = heatmap_grid(first, counts)
+    n_weeks = grid.shape[1]
+    fig = Figure(figsize=(max(4.0, n_weeks * 0.16 + 1.0), 1.9), dpi=HEATMAP_DPI)
+    ax = fig.add_subplot()
+    cmap = ListedColormap(HEATMAP_COLORS)
+    cmap.set_bad("white")
+    ax.imshow(_levels(grid), cmap=cmap, vmin=0, vmax=len(HEATMAP_COLORS) - 1,
+              aspect="equal", interpolation="nearest")
+
+    # 月份刻度：每月 1 号所在的那一列
+    lead = first.weekday()
+    ticks, labels = [], []
+    for i in range(len(counts)):
+        d = first + timedelta(days=i)
+        if d.day == 1 or i == 0:
+            col = (lead + i) // 7
+            if not ticks or col > ticks[-1]:
+                ticks.append(col)
+                labels.append(d.strftime("%b") if is_en else f"{d.month}月")
+    ax.set_xticks(ticks, labels, fontsize=7)
+    ax.set_yticks(range(7), _WEEKDAYS_EN if is_en else _WEEKDAYS_ZH, fontsize=7)
+    # 格子之间留白：画在次刻度上的网格线，不是逐格 patch
+    ax.set_xticks(np.arange(-0.5, n_weeks), minor=True)
+    ax.set_yticks(np.arange(-0.5, 7), minor=True)
+    ax.grid(which="minor", color="white", linewidth=1.5)
+    ax.tick_params(length=0)
+    ax.tick_params(which="minor", length=0)
+    for side in ax.spines.values():
+        side.set_visible(False)
+
+    total = int(counts.sum())
+    active = int((counts > 0).sum())
+    ax.set_title(
+        f"{total} completions on {active} days" if is_en else f"共完成 {total} 次 · {active} 天有完成",
+        fontsize=8, loc="left",
+    )
+
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, dpi=HEATMAP_DPI, facecolor="white", bbox_inches="tight")
+    return buf.getvalue()
@@ -31,6 +31,40 @@ TRANSLATIONS = {
         "download_xhs_3x4": "📕 小红书 3:4",
         "download_xhs_4x5": "📕 小红书 4:5",
         "download_excel": "⬇️ 导出 Excel（6×6大表）",
+        "excel_with_progress": "附带「进度」图表页",
+        "excel_progress_help": "追加一页原生 Excel 图表：各周期完成率、累计燃起图、CARE → 任务转化（Excel 按数据实时绘制，不占体积）。",
+        "excel_cache_status": "Excel 生成于 {at} · {state}",
+        "excel_cache_reused": "数据未变，复用缓存",
+        "excel_cache_rebuilt": "本次新生成",
+        "download_excel_analysis": "📊 导出分析版 Excel（多表）",
+        "excel_analysis_help": "Sprints / Tasks / CARE / AnnualDig 四张明细表，全部任务不截断，自带筛选，适合汇总分析。",
+        "excel_import_title": "⬆️ 导入修改过的 6×6 Excel",
+        "excel_import_caption": "打印/编辑过导出的 6×6 大表后可传回来：主题、交付物、✅/⬜ 勾选和新增任务会同步到计划。表里只显示每周期前 6 条任务，表外的任务不会被删除。",
+        "excel_import_upload": "上传 6×6 Excel（.xlsx）",
+        "excel_import_invalid": "没有识别到 6×6 大表，请上传从这里导出的 Excel。",
+        "excel_import_nochange": "与当前计划一致，没有需要同步的修改。",
+        "excel_import_col_cycle": "周期",
+        "excel_import_col_change": "变更",
+        "excel_import_col_value": "内容",
+        "excel_import_apply": "✅ 应用这 {n} 处修改",
+        "excel_import_done": "已同步到计划 ✅",
+        "heatmap_title": "🔥 全年完成热力图",
+        "heatmap_caption": "一格一天、一列一周：颜色越深，当天完成的任务越多（按勾选完成的时间记录；更早完成的任务算在所在周期的最后一天）。",
+        "download_heatmap": "⬇️ 下载热力图（PNG）",
+        "bundle_section": "C｜一键打包下载",
+        "bundle_caption": "JSON 备份 + 分享版/完整版 4 种尺寸海报（按上面选的格式）+ 两份 Excel，打成一个 ZIP。",
+        "bundle_build_btn": "📦 生成打包文件",
+        "bundle_building": "正在打包…",
+        "bundle_download": "⬇️ 下载全部（ZIP）",
+        "format_label": "文件格式",
+        "format_help": "PNG 适合发朋友圈/社媒；SVG / PDF 是矢量格式，文件更小、放大不糊，适合打印。",
+        "print_section": "🖨 印刷版海报（A3 / A2）",
+        "print_caption": "高清印刷用：PNG 按所选 dpi 输出（分块渲染，大尺寸也不卡），PDF 为矢量文件。",
+        "print_paper": "纸张",
+        "print_vector_note": "矢量 PDF（任意缩放不失真）",
+        "print_build_btn": "🖨 生成印刷版",
+        "print_building": "正在生成印刷版海报…",
+        "print_download": "⬇️ 下载印刷版",
 
         # Annual Dig / Life Circle
         "page_dig_title": "① 年度挖掘：Life Circle",
@@ -111,6 +145,40 @@ TRANSLATIONS = {
         "download_xhs_3x4": "🖼 Poster 3:4",
         "download_xhs_4x5": "🖼 Poster 4:5",
         "download_excel": "⬇️ Export Excel (6×6)",
+        "excel_with_progress": "Include a Progress chart sheet",
+        "excel_progress_help": "Adds native Excel charts: completion by cycle, cumulative burn-up and CARE → task conversion (drawn by Excel from the data, tiny file size).",
+        "excel_cache_status": "Excel built at {at} · {state}",
+        "excel_cache_reused": "reused (no changes)",
+        "excel_cache_rebuilt": "freshly built",
+        "download_excel_analysis": "📊 Export analysis workbook (multi-sheet)",
+        "excel_analysis_help": "Sprints / Tasks / CARE / AnnualDig detail tables with every task and filters, ready for analysis.",
+        "excel_import_title": "⬆️ Import an edited 6×6 Excel",
+        "excel_import_caption": "Edited the exported 6×6 sheet? Upload it: themes, deliverables, ✅/⬜ ticks and new tasks sync back to the plan. The sheet shows only the first 6 tasks per cycle; tasks not shown are never deleted.",
+        "excel_import_upload": "Upload 6×6 Excel (.xlsx)",
+        "excel_import_invalid": "No 6×6 plan found. Please upload an Excel exported from this page.",
+        "excel_import_nochange": "Matches the current plan — nothing to sync.",
+        "excel_import_col_cycle": "Cycle",
+        "excel_import_col_change": "Change",
+        "excel_import_col_value": "Value",
+        "excel_import_apply": "✅ Apply {n} changes",
+        "excel_import_done": "Synced to your plan ✅",
+        "heatmap_title": "🔥 Year completion heatmap",
+        "heatmap_caption": "One square per day, one column per week: darker means more tasks completed that day (recorded when ticked; tasks completed earlier count on their cycle's last day).",
+        "download_heatmap": "⬇️ Download heatmap (PNG)",
+        "bundle_section": "C | Download everything",
+        "bundle_caption": "JSON backup + Share and Full posters in all 4 sizes (in the format chosen above) + both Excel workbooks, in one ZIP.",
+        "bundle_build_btn": "📦 Build bundle",
+        "bundle_building": "Packing…",
+        "bundle_download": "⬇️ Download all (ZIP)",
+        "format_label": "File format",
+        "format_help": "PNG for social media; SVG / PDF are vector files: smaller, sharp at any size, print-ready.",
+        "print_section": "🖨 Print poster (A3 / A2)",
+        "print_caption": "For printing: PNG at the chosen dpi (rendered in tiles, so large sizes stay fast); PDF is vector.",
+        "print_paper": "Paper",
+        "print_vector_note": "vector PDF (sharp at any size)",
+        "print_build_btn": "🖨 Build print poster",
+        "print_building": "Building print poster…",
+        "print_download": "⬇️ Download print poster",
 
         # Annual Dig
         "page_dig_title": "① Annual Dig: Life Circle",
@@ -1,30 +1,34 @@
 # pages/1_年度挖掘.py
 # -*- coding: utf-8 -*-
 
-import io
+import hashlib
 import json
-import textwrap
+import time
 from typing import Dict, List
 from datetime import date
 
 
 import streamlit as st
 
-# ✅ Matplotlib 在 Cloud 上建议用 Agg
-import matplotlib
-matplotlib.use("Agg")
-import matplotlib.pyplot as plt
-from matplotlib.patches import Circle
+from poster import render_life_circle_preview_png
 
 
+from cycles import assign_ranges
 from i18n import init_i18n, lang_selector
+from scheduler import DEFAULT_CAPACITY, schedule
 from store import (
     get_or_create_annual_dig,
     update_annual_dig,
     get_sprints,
     regenerate_sprints,          # ✅ 新增
     add_task_to_sprint_unique,
+    bulk_update_plan,
+    sprint_loads,
+    list_backlog,
+    add_backlog_item,
+    delete_backlog_item,
 )
+from utils import BACKLOG_CATEGORIES
 
 # -----------------------
 # ✅ set_page_config 必须在任何 st.xxx 前
@@ -111,268 +115,17 @@ def build_items_from_quadrants(d: Dict[str, List[str]]) -> List[str]:
                 seen.add(x)
     return out
 
-def clamp_list(items: List[str], n: int):
-    items = [str(x).strip() for x in (items or []) if str(x).strip()]
-    if len(items) <= n:
-        return items, 0
-    return items[:n], len(items) - n
-
-def one_line(s: str, width: int) -> str:
-    wrapped = textwrap.wrap(str(s), width=width)
-    return wrapped[0] if wrapped else str(s)
-
-def safe_radius(items, base=2.25, scale=0.03):
-    n = len([x for x in (items or []) if str(x).strip()])
-    return max(base, base + n * scale)
-
-def _pick_intersection_list(intersections: dict, keys: List[str]) -> List[str]:
-    for k in keys:
-        v = intersections.get(k)
-        if isinstance(v, list) and v:
-            return v
-    v0 = intersections.get(keys[0], [])
-    return v0 if isinstance(v0, list) else []
-
-# -----------------------
-# ✅ 关键：Cloud 中文字体修复
-# -----------------------
-def _mpl_font_setup():
-    """
-    让 Matplotlib 在 Streamlit Cloud 也能显示中文：
-    - 尝试从仓库里注册 NotoSansSC-Regular.ttf
-    - 再设置 rcParams 的 sans-serif 优先级
-    """
-    import matplotlib as mpl
-    from pathlib import Path
-    from matplotlib import font_manager as fm
-
-    # 常见放置位置：仓库根目录 / assets / fonts
-    root = Path(__file__).resolve().parents[1]  # .../wendy-life-cycle
-    candidates = [
-        root / "NotoSansSC-Regular.ttf",
-        root / "assets" / "NotoSansSC-Regular.ttf",
-        root / "fonts" / "NotoSansSC-Regular.ttf",
-        root / "assets" / "fonts" / "NotoSansSC-Regular.ttf",
-    ]
-
-    font_name = None
-    for p in candidates:
-        if p.exists():
-            try:
-                fm.fontManager.addfont(str(p))
-                # 取出字体的 family 名称
-                prop = fm.FontProperties(fname=str(p))
-                font_name = prop.get_name()
-                break
-            except Exception:
-                pass
-
-    # 设置字体优先级：先用我们注册的 Noto Sans SC
-    # 再兜底常见中文字体
-    if font_name:
-        mpl.rcParams["font.sans-serif"] = [
-            font_name, "Noto Sans CJK SC", "Source Han Sans SC",
-            "Microsoft YaHei", "SimHei", "Arial Unicode MS", "DejaVu Sans"
-        ]
-    else:
-        mpl.rcParams["font.sans-serif"] = [
-            "Noto Sans CJK SC", "Source Han Sans SC",
-            "Microsoft YaHei", "SimHei", "Arial Unicode MS", "DejaVu Sans"
-        ]
-
-    mpl.rcParams["axes.unicode_minus"] = False
-
-
-def draw_auto_title(ax, main_title: str, subtitle: str, signature: str, y_top: float, is_english: bool, mode: str):
-    if mode == "share":
-        main_fs, sub_fs, sig_fs = 26, 16, 12
-    else:
-        main_fs, sub_fs, sig_fs = 24, 16, 12
-
-    lines = []
-    if is_english:
-        words = main_title.split(" ")
-        cur = ""
-        for w in words:
-            if len(cur) + len(w) + (1 if cur else 0) <= 18:
-                cur = f"{cur} {w}".strip()
-            else:
-                if cur:
-                    lines.append(cur)
-                cur = w
-        if cur:
-            lines.append(cur)
-        if len(lines) > 2:
-            lines = [" ".join(lines[:-1]), lines[-1]]
-    else:
-        lines = [main_title]
-
-    y = y_top - 0.70
-    for line in lines:
-        ax.text(0, y, line, ha="center", va="center", fontsize=main_fs, fontweight="bold")
-        y -= 0.80
-    ax.text(0, y - 0.10, subtitle, ha="center", va="center", fontsize=sub_fs, fontweight="bold")
-    ax.text(0, y - 0.80, signature, ha="center", va="center", fontsize=sig_fs, color="#555", alpha=0.60)
-
-
-def render_life_circle_preview_png(
-    name: str,
-    dream_items: List[str],
-    resp_items: List[str],
-    talent_items: List[str],
-    intersections: dict,
-    mode: str = "full",  # share/full
-) -> bytes:
-    _mpl_font_setup()
-    is_en = st.session_state.get("lang", "zh") == "en"
-
-    blue = "#4DA3FF"
-    purple = "#7E57FF"
-    green = "#42C77A"
-
-    dpi = 170
-    fig = plt.figure(figsize=(10.5, 7.5), dpi=dpi)
-    ax = plt.gca()
-    ax.set_aspect("equal")
-    ax.axis("off")
-    ax.set_position([0, 0, 1, 1])
-
-    x_min, x_max = -6.6, 6.6
-    y_min, y_max = -5.3, 7.6
-    ax.set_xlim(x_min, x_max)
-    ax.set_ylim(y_min, y_max)
-
-    Dream_xy = (-1.85, -1.15)
-    Talent_xy = (1.85, -1.15)
-    Resp_xy = (0.0, 1.65)
-
-    r_dream = max(2.35, safe_radius(dream_items))
-    r_talent = max(2.35, safe_radius(talent_items))
-    r_resp = max(2.35, safe_radius(resp_items))
-
-    alpha_circle = 0.22 if mode == "share" else 0.26
-
-    # 圈：紫→蓝/绿（让左右圈更显眼）
-    ax.add_patch(Circle(Resp_xy, r_resp, color=purple, alpha=alpha_circle, lw=2, zorder=1))
-    ax.add_patch(Circle(Dream_xy, r_dream, color=blue, alpha=alpha_circle, lw=2, zorder=2))
-    ax.add_patch(Circle(Talent_xy, r_talent, color=green, alpha=alpha_circle, lw=2, zorder=2))
-
-    if is_en:
-        title_main = "Find Your 2026 Breakthrough"
-        dream_label, talent_label, resp_label = "Dream", "Talent", "Responsibility"
-        center_title = "Breakthrough (Center)"
-    else:
-        title_main = "找到2026年人生突破点"
-        dream_label, talent_label, resp_label = "梦想", "天赋", "责任"
-        center_title = "三者交汇（突破点）"
-
-    signature = f"{(name or 'YourName')} · 2026 · Life Circle"
-    draw_auto_title(ax, title_main, "Life Circle", signature, y_top=y_max, is_english=is_en, mode=mode)
-
-    # 底部标签（梦想/天赋）
-    label_fs = 18
-    bottom_label_y = Dream_xy[1] - r_dream - 0.55
-    ax.text(Dream_xy[0], bottom_label_y, dream_label, ha="center", va="center", fontsize=label_fs, fontweight="bold")
-    ax.text(Talent_xy[0], bottom_label_y, talent_label, ha="center", va="center", fontsize=label_fs, fontweight="bold")
-
-    # 责任标签：紫圈右侧（英文竖排）
-    resp_y = Resp_xy[1] + 0.10
-    ideal_x = Resp_xy[0] + r_resp + 0.55
-    if is_en:
-        resp_x = min(ideal_x, x_max - 0.35)
-        ax.text(resp_x, resp_y, resp_label, ha="center", va="center", fontsize=label_fs, fontweight="bold", rotation=90)
-    else:
-        resp_x = min(ideal_x, x_max - 1.2)
-        ax.text(resp_x, resp_y, resp_label, ha="left", va="center", fontsize=label_fs, fontweight="bold")
-
-    # slogan
-    ax.text(0, y_min + 0.20, "Mission → Action → Reality", ha="center", va="center", fontsize=13, color="#666", alpha=0.55)
-
-    # center
-    center = intersections.get("center", []) or intersections.get("中心", []) or []
-    show_center, more_center = clamp_list(center, 6 if mode == "share" else 10)
-    center_lines = [f"• {one_line(x, 18)}" for x in show_center]
-    if more_center > 0:
-        center_lines.append(f"… {more_center} more" if is_en else f"… 还有 {more_center} 条")
-    center_text = center_title + "\n" + ("\n".join(center_lines) if center_lines else ("(empty)" if is_en else "（空）"))
-
-    ax.text(
-        0.0, 0.20,
-        center_text,
-        ha="center", va="center",
-        fontsize=13 if mode == "share" else 12,
-        fontweight="bold",
-        bbox=dict(boxstyle="round,pad=0.55,rounding_size=0.15", facecolor="white", edgecolor="#333", linewidth=1.1, alpha=0.84),
-        zorder=6
-    )
-
-    # Full：三清单 + 三交集
-    if mode == "full":
-        def _list_block(title, items, x, y):
-            show, more = clamp_list(items, 7)
-            lines = [f"• {one_line(s, 18)}" for s in show]
-            if more > 0:
-                lines.append(f"… {more} more" if is_en else f"… 还有 {more} 条")
-            txt = title + "\n" + ("\n".join(lines) if lines else ("(empty)" if is_en else "（空）"))
-            ax.text(
-                x, y, txt,
-                ha="center", va="center",
-                fontsize=10,
-                bbox=dict(boxstyle="round,pad=0.30,rounding_size=0.12", facecolor="white", edgecolor="#999", linewidth=0.8, alpha=0.55),
-                zorder=5
-            )
-
-        _list_block("Responsibility List" if is_en else "责任清单", resp_items, Resp_xy[0], Resp_xy[1] + 0.75)
-        _list_block("Dream List" if is_en else "梦想清单", dream_items, Dream_xy[0] - 0.25, Dream_xy[1] + 0.15)
-        _list_block("Talent List" if is_en else "天赋清单", talent_items, Talent_xy[0] + 0.25, Talent_xy[1] + 0.15)
-
-        resp_dream = _pick_intersection_list(intersections, ["resp_dream", "责任∩梦想", "rd"])
-        resp_talent = _pick_intersection_list(intersections, ["resp_talent", "责任∩天赋", "rt"])
-        dream_talent = _pick_intersection_list(intersections, ["dream_talent", "梦想∩天赋", "dt"])
-
-        def _fmt_block(title, items, max_n=4):
-            show, more = clamp_list(items, max_n)
-            lines = [f"• {one_line(x, 14)}" for x in show]
-            if more > 0:
-                lines.append(f"… {more} more" if is_en else f"… 还有 {more} 条")
-            return title + "\n" + ("\n".join(lines) if lines else ("(empty)" if is_en else "（空）"))
-
-        ax.text(
-            -3.10, 0.95,
-            _fmt_block("Resp ∩ Dream" if is_en else "责任 ∩ 梦想", resp_dream),
-            ha="center", va="center",
-            fontsize=9,
-            bbox=dict(boxstyle="round,pad=0.25", facecolor="white", edgecolor="#AAA", alpha=0.60),
-            zorder=7
-        )
-        ax.text(
-            3.10, 0.95,
-            _fmt_block("Resp ∩ Talent" if is_en else "责任 ∩ 天赋", resp_talent),
-            ha="center", va="center",
-            fontsize=9,
-            bbox=dict(boxstyle="round,pad=0.25", facecolor="white", edgecolor="#AAA", alpha=0.60),
-            zorder=7
-        )
-        ax.text(
-            0.0, -2.75,
-            _fmt_block("Dream ∩ Talent" if is_en else "梦想 ∩ 天赋", dream_talent),
-            ha="center", va="center",
-            fontsize=9,
-            bbox=dict(boxstyle="round,pad=0.25", facecolor="white", edgecolor="#AAA", alpha=0.60),
-            zorder=7
-        )
-
-    buf = io.BytesIO()
-    fig.savefig(buf, format="png", dpi=dpi, facecolor="white", bbox_inches="tight")
-    b = buf.getvalue()
-    buf.close()
-    plt.close(fig)
-    return b
+# 输入停下来多久后自动出高清预览（秒）
+PREVIEW_SETTLE_SECONDS = 1.5
 
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_preview_png(preview_json: str, fast: bool) -> bytes:
+    """同一份输入（JSON 串）只渲染一次；fast=True 为低清实时预览"""
+    return render_life_circle_preview_png(**json.loads(preview_json), fast=fast)
 
 def ensure_sprints_ready() -> bool:
     sprints = get_sprints()
-    return bool(sprints) and len(sprints) >= 36
+    return bool(sprints)
 
 def assign_list_to_sprints(items: List[str], start_no: int, end_no: int):
     if not items:
@@ -546,7 +299,7 @@ dream_items = build_items_from_quadrants(dream)
 resp_items = build_items_from_quadrants(resp)
 talent_items = build_items_from_quadrants(talent)
 
-preview_png = render_life_circle_preview_png(
+preview_kwargs = dict(
     name=(name or "").strip(),
     dream_items=dream_items,
     resp_items=resp_items,
@@ -559,18 +312,50 @@ preview_png = render_life_circle_preview_png(
         "_meta": {"name": (name or "").strip()},
     },
     mode=mode_key,
+    is_en=st.session_state.get("lang", "zh") == "en",
 )
+preview_json = json.dumps(preview_kwargs, ensure_ascii=False, sort_keys=True)
+preview_sig = hashlib.sha1(preview_json.encode("utf-8")).hexdigest()
+
+# 输入变了：记下时间，先出低清预览；停一会儿（或手动点）再出高清
+if st.session_state.get("_preview_sig") != preview_sig:
+    st.session_state["_preview_sig"] = preview_sig
+    st.session_state["_preview_changed_at"] = time.time()
+
+full_ready = st.session_state.get("_preview_full_sig") == preview_sig
+
+
+@st.fragment(run_every=None if full_ready else PREVIEW_SETTLE_SECONDS)
+def _preview_panel(preview_json: str, preview_sig: str):
+    if st.session_state.get("_preview_full_sig") == preview_sig:
+        st.image(_cached_preview_png(preview_json, fast=False), width=1100)
+        return
+
+    want_full = st.button(TT("🔍 立即生成高清预览", "🔍 Render full preview now"), key="preview_full_btn")
+    settled = time.time() - st.session_state.get("_preview_changed_at", 0.0) >= PREVIEW_SETTLE_SECONDS
+    if want_full or settled:
+        _cached_preview_png(preview_json, fast=False)
+        st.session_state["_preview_full_sig"] = preview_sig
+        # 整页重跑一次：换上高清图，同时停掉定时刷新
+        st.rerun()
+
+    st.image(_cached_preview_png(preview_json, fast=True), width=1100)
+    st.caption(TT("实时预览（低清）· 停止输入后会自动生成高清版", "Live preview (low-res) · full resolution renders once you stop typing"))
 
-st.image(preview_png, width=1100)
+
+_preview_panel(preview_json, preview_sig)
 st.markdown("</div>", unsafe_allow_html=True)
 
-# D 分配到 36×10
+# D 分配到行动周期（区段按周期数切：36 个时是 1..6 / 7..18 / 19..36）
+n_sprints = len(get_sprints() or [])
+(r_lo, r_hi), (t_lo, t_hi), (d_lo, d_hi) = assign_ranges(n_sprints or 36)
+
 st.markdown('<div class="card">', unsafe_allow_html=True)
-st.subheader(TT("D｜一键分配到 36×10（与②页面联动）", "D | Assign to 36×10 (sync with page ②)"))
+st.subheader(TT("D｜一键分配到行动周期（与②页面联动）", "D | Assign to cycles (sync with page ②)"))
 st.caption(
     TT(
-        "规则：责任→Sprint 1..N；天赋→Sprint 7..18；梦想→Sprint 19..36。每个 Sprint 默认写入 1 条任务。",
-        "Rule: Responsibility→Sprint 1..N; Talent→Sprint 7..18; Dream→Sprint 19..36. One task per sprint by default.",
+        f"规则：责任→Sprint {r_lo}..N；天赋→Sprint {t_lo}..{t_hi}；梦想→Sprint {d_lo}..{d_hi}。每个 Sprint 默认写入 1 条任务。",
+        f"Rule: Responsibility→Sprint {r_lo}..N; Talent→Sprint {t_lo}..{t_hi}; Dream→Sprint {d_lo}..{d_hi}. One task per sprint by default.",
     )
 )
 
@@ -584,7 +369,7 @@ st.write(
 # ✅ 单一定义（不要重复）
 def ensure_sprints_ready() -> bool:
     sprints = get_sprints()
-    return isinstance(sprints, list) and len(sprints) >= 36
+    return isinstance(sprints, list) and len(sprints) > 0
 
 if not ensure_sprints_ready():
     st.warning(
@@ -622,45 +407,112 @@ else:
             use_container_width=True,
             key="assign_resp",
         ):
-            n = assign_list_to_sprints(resp_items, 1, 36)
+            n = assign_list_to_sprints(resp_items, r_lo, d_hi)
             st.success(
                 TT(
-                    f"已分配 {n} 条责任到 周期 1..{n}",
-                    f"Assigned {n} responsibility items to Cycle 1..{n}",
+                    f"已分配 {n} 条责任到 周期 {r_lo}..{n}",
+                    f"Assigned {n} responsibility items to Cycle {r_lo}..{n}",
                 )
             )
             st.rerun()
 
     with c2:
         if st.button(
-            TT("🚀 分配天赋 → 周期 7..18", "🚀 Assign Talent → Cycle 7..18"),
+            TT(f"🚀 分配天赋 → 周期 {t_lo}..{t_hi}", f"🚀 Assign Talent → Cycle {t_lo}..{t_hi}"),
             use_container_width=True,
             key="assign_talent",
         ):
-            n = assign_list_to_sprints(talent_items, 7, 18)
+            n = assign_list_to_sprints(talent_items, t_lo, t_hi)
             st.success(
                 TT(
-                    f"已分配 {n} 条天赋到 周期 7..{min(18, 7+n-1)}",
-                    f"Assigned {n} talent items to Cycle 7..{min(18, 7+n-1)}",
+                    f"已分配 {n} 条天赋到 周期 {t_lo}..{min(t_hi, t_lo+n-1)}",
+                    f"Assigned {n} talent items to Cycle {t_lo}..{min(t_hi, t_lo+n-1)}",
                 )
             )
             st.rerun()
 
     with c3:
         if st.button(
-            TT("🚀 分配梦想 → 周期 19..36", "🚀 Assign Dream → Cycle 19..36"),
+            TT(f"🚀 分配梦想 → 周期 {d_lo}..{d_hi}", f"🚀 Assign Dream → Cycle {d_lo}..{d_hi}"),
             use_container_width=True,
             key="assign_dream",
         ):
-            n = assign_list_to_sprints(dream_items, 19, 36)
+            n = assign_list_to_sprints(dream_items, d_lo, d_hi)
             st.success(
                 TT(
-                    f"已分配 {n} 条梦想到 周期 19..{min(36, 19+n-1)}",
-                    f"Assigned {n} dream items to Cycle 19..{min(36, 19+n-1)}",
+                    f"已分配 {n} 条梦想到 周期 {d_lo}..{min(d_hi, d_lo+n-1)}",
+                    f"Assigned {n} dream items to Cycle {d_lo}..{min(d_hi, d_lo+n-1)}",
                 )
             )
             st.rerun()
 
+    # 自动排期：待排期清单（项目/习惯/能力 + 关联目标）和年度清单一起，按每期容量均衡铺开；
+    # 同一目标的条目挨在相邻几期，类别尽量混搭。先预览，确认后一次批量写入
+    with st.expander(TT("🤖 自动排期（按容量均衡分配到全部周期）", "🤖 Auto-schedule (balance across all cycles by capacity)")):
+        cat_labels = {"项目": TT("项目", "Project"), "习惯": TT("习惯", "Habit"), "能力": TT("能力", "Skill")}
+        section_labels = {"resp": TT("责任", "Responsibility"), "talent": TT("天赋", "Talent"), "dream": TT("梦想", "Dream")}
+
+        # 待排期清单
+        st.markdown(TT("**待排期清单**（排进周期后会变成该周期的任务）", "**Backlog** (becomes a task in its cycle once scheduled)"))
+        for it in list_backlog(unscheduled_only=True):
+            bc1, bc2, bc3 = st.columns([6, 3, 0.6])
+            bc1.write(it["title"])
+            bc2.caption(cat_labels.get(it.get("category"), it.get("category", "")) + (f" · 🎯 {it['linked_goal']}" if it.get("linked_goal") else ""))
+            if bc3.button("🗑️", key=f"backlog_del_{it['id']}", help=TT("删除", "Delete")):
+                delete_backlog_item(it["id"])
+                st.rerun()
+        with st.form("backlog_add_form", clear_on_submit=True):
+            fc1, fc2, fc3 = st.columns([4, 2, 3])
+            bl_title = fc1.text_input(TT("新条目", "New item"))
+            bl_cat = fc2.selectbox(TT("类别", "Category"), BACKLOG_CATEGORIES, format_func=lambda c: cat_labels[c])
+            bl_goal = fc3.text_input(TT("关联目标（同一目标会排在相邻周期）", "Linked goal (kept in adjacent cycles)"))
+            bl_add = st.form_submit_button(TT("➕ 加入待排期", "➕ Add to backlog"))
+        if bl_add and add_backlog_item(bl_title, bl_cat, bl_goal):
+            st.rerun()
+
+        capacity = st.number_input(
+            TT("每个周期最多几条任务（含已有任务）", "Max tasks per cycle (incl. existing)"),
+            min_value=1, max_value=50, value=DEFAULT_CAPACITY, key="auto_capacity",
+        )
+        existing = {(t.get("title") or "").strip() for sp in get_sprints() for t in sp.get("tasks", [])}
+        # 年度清单条目按“项目”算，来源（责任/天赋/梦想）当作关联目标分组
+        pool = [
+            {"title": it["title"], "category": it.get("category") or "项目", "linked_goal": it.get("linked_goal", ""),
+             "backlog_id": it["id"]}
+            for it in list_backlog(unscheduled_only=True)
+        ] + [
+            {"title": title.strip(), "category": "项目", "linked_goal": section_labels[sec]}
+            for sec, items in (("resp", resp_items), ("talent", talent_items), ("dream", dream_items))
+            for title in items
+            if title.strip() and title.strip() not in existing
+        ]
+        planned, overflow = schedule(pool, sprint_loads(), capacity=int(capacity))
+
+        if not pool:
+            st.info(TT("清单里的条目都已经在计划里了。", "Every item is already in the plan."))
+        else:
+            st.dataframe(
+                [
+                    {TT("周期", "Cycle"): no, TT("类别", "Type"): cat_labels.get(it["category"], it["category"]),
+                     TT("关联目标", "Goal"): it["linked_goal"], TT("任务", "Task"): it["title"]}
+                    for no, it in sorted(planned, key=lambda x: x[0])
+                ],
+                hide_index=True,
+                use_container_width=True,
+            )
+            if overflow:
+                st.warning(TT(f"{len(overflow)} 条放不下（各周期都已满），可以调高容量：",
+                              f"{len(overflow)} items don't fit (all cycles full); raise the capacity: ")
+                           + "、".join(it["title"] for it in overflow))
+            if planned and st.button(TT(f"✅ 应用这 {len(planned)} 条排期", f"✅ Apply {len(planned)} assignments"),
+                                     use_container_width=True, key="auto_apply"):
+                n = bulk_update_plan(
+                    new_tasks=[(no, it["title"], False) for no, it in planned if "backlog_id" not in it],
+                    backlog_assignments={it["backlog_id"]: no for no, it in planned if "backlog_id" in it},
+                )
+                st.success(TT(f"已排入 {n} 条 ✅", f"Scheduled {n} items ✅"))
+                st.rerun()
+
 st.markdown("</div>", unsafe_allow_html=True)
 
 st.info(
@@ -1,11 +1,20 @@
 # pages/2_36x10天_Growth_Plan.py
 # -*- coding: utf-8 -*-
 
+import html
+
 import streamlit as st
 from datetime import date
 
+from bulk_edit import diff_edits, editor_frames
+from cycles import MAX_COUNT, MAX_LENGTH, PRESETS, bit_count, grid_cols, plan_label
+from heatmap import completion_days, render_heatmap
 from i18n import init_i18n, lang_selector
 from store import (
+    bulk_update_plan,
+    cached_artifact,
+    store_version,
+    get_plan,
     get_sprints,
     regenerate_sprints,
     get_sprint_by_no,
@@ -13,8 +22,26 @@ from store import (
     list_tasks_for_sprint,
     add_task_to_sprint_unique,
     toggle_task_done,
-    update_task_evidence,
+    update_task_evidence_bulk,
+    delete_task,
+    move_task,
+    reorder_task,
+    rollover_unfinished,
+    rollover_pending,
+    catch_up_rollover,
+    catch_up_pending,
+    sprint_progress,
+    plan_progress,
+    cycle_for_date,
+    next_cycle_after,
+    care_records_by_cycle,
+    list_habits,
+    add_habit,
+    update_habit_title,
+    delete_habit,
+    habit_tasks_for_sprint,
 )
+from utils import HABIT_TEMPLATES
 
 # -----------------------
 # set_page_config（必须在 st.xxx 前）
@@ -37,19 +64,29 @@ def _norm(s: str) -> str:
 
 def sprints_ready() -> bool:
     sps = get_sprints() or []
-    return isinstance(sps, list) and len(sps) >= 36
-
-def _progress_for_sp(sp: dict) -> tuple[int, int]:
-    tasks = sp.get("tasks", []) or []
-    total = len(tasks)
-    done = sum(1 for t in tasks if bool(t.get("done", False)))
-    return done, total
+    return isinstance(sps, list) and len(sps) > 0
+
+def _parse_skip_days(raw: str) -> tuple[list[date], list[str]]:
+    """每行一个 YYYY-MM-DD（逗号/空格分隔也行）→ (日期, 认不出的片段)"""
+    days, bad = [], []
+    for tok in (raw or "").replace(",", " ").replace("，", " ").split():
+        try:
+            days.append(date.fromisoformat(tok))
+        except ValueError:
+            bad.append(tok)
+    return days, bad
 
 def _ratio(done: int, total: int) -> float:
     if total <= 0:
         return 0.0
     return max(0.0, min(1.0, done / total))
 
+def _day_of_cycle(sp: dict, d: date) -> tuple[int, int]:
+    """(今天是本期第几天, 本期跨几天)，按日历天算"""
+    s = date.fromisoformat(sp["start_date"])
+    e = date.fromisoformat(sp["end_date"])
+    return (d - s).days + 1, (e - s).days + 1
+
 def _theme_preview(sp: dict) -> str:
     t = _norm(sp.get("theme", ""))
     if not t:
@@ -66,7 +103,7 @@ def get_cycle_from_query() -> int | None:
         return None
     try:
         n = int(raw)
-        if 1 <= n <= 36:
+        if 1 <= n <= plan["count"]:
             return n
     except Exception:
         return None
@@ -76,6 +113,16 @@ def goto_cycle(n: int):
     st.query_params["cycle"] = str(int(n))
     st.rerun()
 
+def _on_pick_cycle():
+    # pills 回调：切到详情，并清空选中状态（回到总览后可以再点同一个周期）
+    picked = st.session_state.get("overview_pick")
+    if picked:
+        st.query_params["cycle"] = str(int(picked))
+    st.session_state["overview_pick"] = None
+
+def _on_habit_title(hid: str):
+    update_habit_title(hid, st.session_state.get(f"habit_title_{hid}", ""))
+
 def goto_overview():
     # 清掉 cycle 参数 -> 回到总览页
     if "cycle" in st.query_params:
@@ -120,19 +167,33 @@ st.markdown(
 .cycle-theme span{ font-weight: 500; color:#444; }
 .cycle-progress{ margin-top: 8px; font-size: 12px; color:#444; }
 .hr-soft{ margin: 10px 0 12px 0; border-top: 1px solid rgba(0,0,0,0.06); }
+
+.cycle-grid{ display:grid; grid-template-columns:repeat(var(--cols, 6), minmax(0, 1fr)); gap:10px; }
+.cycle-grid .cycle-card{ min-height: 118px; }
+.cycle-grid .cycle-card.today{ border:2px solid #ff4b4b; }
+.care-line{ font-size:13px; margin:4px 0; }
+.cycle-bar{ height:6px; border-radius:999px; background:rgba(0,0,0,0.06); margin-top:6px; overflow:hidden; }
+.cycle-bar span{ display:block; height:100%; background:#ff4b4b; border-radius:999px; }
+@media (max-width: 900px){ .cycle-grid{ grid-template-columns:repeat(3, minmax(0, 1fr)); } }
+@media (max-width: 520px){ .cycle-grid{ grid-template-columns:repeat(2, minmax(0, 1fr)); } }
 </style>
 """,
     unsafe_allow_html=True,
 )
 
 # -----------------------
-# 页面头
+# 页面头（周期数 / 天数 / 网格都来自当前计划；没生成过时是默认 36×10）
 # -----------------------
-st.title(TT("② 36×10：自我提升计划（10天行动周期）", "② 36×10: Growth Plan (10-day cycles)"))
+plan = get_plan()
+label = plan_label(plan["count"], plan["length"])
+cols = grid_cols(plan["count"])
+
+st.title(TT(f"② {label}：自我提升计划（{plan['length']}天行动周期）",
+            f"② {label}: Growth Plan ({plan['length']}-day cycles)"))
 st.caption(
     TT(
-        "体验：总览只看 6×6 卡片；点击「查看」进入周期详情与任务清单。",
-        "Experience: Overview shows only 6×6 cards. Click “Open” to enter cycle details & tasks.",
+        "体验：总览只看周期卡片；在「打开周期」里点编号进入周期详情与任务清单。",
+        "Experience: Overview shows only cycle cards. Pick a number under “Open cycle” to enter cycle details & tasks.",
     )
 )
 
@@ -140,25 +201,55 @@ st.caption(
 # A | 生成/重建（总览页、详情页都需要）
 # -----------------------
 st.markdown('<div class="card">', unsafe_allow_html=True)
-st.subheader(TT("A｜生成/重建 36×10 周期", "A | Generate / Rebuild 36×10"))
+st.subheader(TT("A｜生成/重建行动周期", "A | Generate / Rebuild cycles"))
 
 if not sprints_ready():
-    st.warning(TT("你还没有生成 36×10 周期。请选择开始日期并生成。", "No cycles yet. Pick a start date and generate."))
+    st.warning(TT("你还没有生成行动周期。请选择周期规格和开始日期并生成。", "No cycles yet. Pick a plan shape and start date, then generate."))
 else:
     st.info(
-        TT("已生成 36×10 周期。如需重新开始，可重建（会清空旧周期主题与任务）。",
-           "Cycles generated. You can rebuild (will clear existing themes & tasks).")
+        TT(f"已生成 {label} 周期。如需重新开始，可重建（会清空旧周期主题与任务）。",
+           f"{label} cycles generated. You can rebuild (will clear existing themes & tasks).")
     )
 
-start = st.date_input(TT("请选择开始日期", "Pick a start date"), value=date.today(), key="gp_start_date")
+custom_key = "custom"
+preset = st.radio(
+    TT("周期规格", "Plan shape"),
+    options=list(PRESETS) + [custom_key],
+    format_func=lambda k: TT("自定义", "Custom") if k == custom_key else plan_label(*PRESETS[k]),
+    horizontal=True,
+    key="gp_preset",
+)
+g1, g2, g3 = st.columns(3)
+with g1:
+    start = st.date_input(TT("请选择开始日期", "Pick a start date"), value=date.today(), key="gp_start_date")
+if preset == custom_key:
+    with g2:
+        n_cycles = st.number_input(TT("周期数", "Cycles"), min_value=1, max_value=MAX_COUNT,
+                                   value=int(plan["count"]), key="gp_count")
+    with g3:
+        n_days = st.number_input(TT("每期天数", "Days per cycle"), min_value=1, max_value=MAX_LENGTH,
+                                 value=int(plan["length"]), key="gp_length")
+else:
+    n_cycles, n_days = PRESETS[preset]
+skip_raw = st.text_area(
+    TT("跳过的日期（可选，如节假日；每行一个 YYYY-MM-DD，不计入周期天数）",
+       "Skipped days (optional, e.g. holidays; one YYYY-MM-DD per line, not counted in cycles)"),
+    value="\n".join(plan.get("skip") or []),
+    height=80,
+    key="gp_skip_days",
+)
+skip_days, skip_bad = _parse_skip_days(skip_raw)
+if skip_bad:
+    st.warning(TT("认不出这些日期，已忽略：", "Ignored unrecognised dates: ") + "、".join(skip_bad))
 
+new_label = plan_label(n_cycles, n_days)
 if st.button(
-    TT("🚀 生成/重建 36×10（会清空旧周期与任务）", "🚀 Generate/Rebuild 36×10 (clears old data)"),
+    TT(f"🚀 生成/重建 {new_label}（会清空旧周期与任务）", f"🚀 Generate/Rebuild {new_label} (clears old data)"),
     use_container_width=True,
     key="gp_rebuild_btn",
 ):
-    regenerate_sprints(start)
-    st.success(TT("已生成 36 个周期 ✅", "Generated 36 cycles ✅"))
+    regenerate_sprints(start, int(n_cycles), int(n_days), skip_days)
+    st.success(TT(f"已生成 {int(n_cycles)} 个周期 ✅", f"Generated {int(n_cycles)} cycles ✅"))
     goto_overview()
 
 st.markdown("</div>", unsafe_allow_html=True)
@@ -179,75 +270,182 @@ cycle_q = get_cycle_from_query()
 # B | 总览（只显示卡片）
 # -----------------------
 if cycle_q is None:
-    task_cnt = 0
-    done_cnt = 0
-    for sp in sps:
-        d, t = _progress_for_sp(sp)
-        done_cnt += d
-        task_cnt += t
+    # 计数由 store 增量维护，总览不遍历任务
+    done_cnt, task_cnt = plan_progress()
 
+    # 今天在哪一期：按开始日二分查找，不扫全部周期
+    today = date.today()
+    today_no = cycle_for_date(today)
+    next_no = None if today_no else next_cycle_after(today)
     st.markdown('<div class="card">', unsafe_allow_html=True)
-    st.subheader(TT("B｜总览（小卡片 6×6）", "B | Overview (6×6 cards)"))
+    if today_no:
+        cur = get_sprint_by_no(today_no)
+        k, span = _day_of_cycle(cur, today)
+        d, t = sprint_progress(today_no)
+        st.subheader(TT(f"📍 今天 {today.isoformat()}：周期 {today_no}（第 {k}/{span} 天）",
+                        f"📍 Today {today.isoformat()}: Cycle {today_no} (day {k}/{span})"))
+        st.caption(
+            TT("主题：", "Theme: ") + _theme_preview(cur)
+            + TT(f" ｜ 任务 {d}/{t} 已完成", f" | Tasks {d}/{t} done")
+        )
+        if st.button(TT("进入今天的周期 →", "Open today's cycle →"), key="today_btn"):
+            goto_cycle(today_no)
+    elif next_no:
+        nxt = get_sprint_by_no(next_no)
+        st.subheader(TT(f"📍 今天 {today.isoformat()} 不在任何周期里", f"📍 Today {today.isoformat()} is outside the cycles"))
+        st.caption(TT(f"下一期：周期 {next_no}，{nxt.get('start_date', '')} 开始。",
+                      f"Next: Cycle {next_no}, starts {nxt.get('start_date', '')}."))
+        if st.button(TT(f"预览周期 {next_no} →", f"Preview Cycle {next_no} →"), key="today_btn"):
+            goto_cycle(next_no)
+    else:
+        st.subheader(TT(f"📍 今天 {today.isoformat()}：计划已全部结束 🎉", f"📍 Today {today.isoformat()}: the plan is complete 🎉"))
+
+    # 补齐顺延：已结束周期里还没完成的任务，一次全部挪到今天这一期（待顺延条数和真正执行时用同一份清单）
+    pending = catch_up_pending(today) if (today_no or next_no) else 0
+    if pending:
+        target_no = today_no or next_no
+        cu1, cu2 = st.columns([3, 1])
+        with cu1:
+            st.warning(TT(f"已结束的周期里还有 {pending} 条任务没完成。",
+                          f"{pending} unfinished task(s) are left in past cycles."))
+            cu_copy = st.toggle(TT("复制（原周期保留一份）", "Copy (keep originals)"), key="catch_up_copy")
+        with cu2:
+            if st.button(TT(f"⏭️ 全部顺延到周期 {target_no}", f"⏭️ Roll all into Cycle {target_no}"),
+                         key="catch_up_btn", use_container_width=True):
+                n, _ = catch_up_rollover(today, copy=cu_copy)
+                st.toast(TT(f"已顺延 {n} 条任务 ✅", f"Rolled over {n} task(s) ✅"))
+                st.rerun()
+    st.markdown("</div>", unsafe_allow_html=True)
+
+    care_by_no = care_records_by_cycle()
+
+    st.markdown('<div class="card">', unsafe_allow_html=True)
+    st.subheader(TT(f"B｜总览（{label} 小卡片）", f"B | Overview ({label} cards)"))
 
     st.markdown(
-        f'<span class="badge">{TT("周期数","Cycles")}: 36</span>'
+        f'<span class="badge">{TT("周期数","Cycles")}: {len(sps)}</span>'
         f'<span class="badge">{TT("任务","Tasks")}: {task_cnt}</span>'
         f'<span class="badge">{TT("完成","Done")}: {done_cnt}</span>',
         unsafe_allow_html=True
     )
 
-    # 可选：跳转到某个周期
-    jump_no = st.number_input(
-        TT("跳转到周期编号（1-36）", "Jump to cycle (1-36)"),
-        min_value=1, max_value=36, value=1,
-        key="jump_cycle_input",
-    )
-    if st.button(TT("跳转到详情", "Go to details"), key="jump_go_btn"):
-        goto_cycle(int(jump_no))
+    # 周期网格（36 个即 6×6）：整张拼成一段 HTML，一个元素（原来每个周期 columns/markdown/progress/button 各一个）
+    cards = []
+    for idx, sp in enumerate(sps):
+        no = int(sp.get("sprint_no", idx + 1))
+        d, t = sprint_progress(no)
+        pct = int(round(_ratio(d, t) * 100))
+        n_care = len(care_by_no.get(no, ()))
+        care_tag = f'<div title="{TT("本期捕获的灵感","Inspirations captured")}">💡 {n_care}</div>' if n_care else ""
+        cards.append(
+            f'<div class="cycle-card{" today" if no == today_no else ""}">'
+            f'<div class="cycle-top"><div>{TT("周期","Cycle")} {no}</div>{care_tag}</div>'
+            f'<div class="cycle-sub">{sp.get("start_date", "")} ~ {sp.get("end_date", "")}</div>'
+            f'<div class="cycle-theme">{TT("主题","Theme")}: <span>{html.escape(_theme_preview(sp))}</span></div>'
+            f'<div class="cycle-progress">{TT("进度","Progress")}: {d}/{t} · {pct}%</div>'
+            f'<div class="cycle-bar"><span style="width:{pct}%"></span></div>'
+            f'</div>'
+        )
+    st.markdown(f'<div class="cycle-grid" style="--cols:{cols}">{"".join(cards)}</div>', unsafe_allow_html=True)
 
     st.markdown('<div class="hr-soft"></div>', unsafe_allow_html=True)
 
-    for row in range(6):
-        cols = st.columns(6, gap="small")
-        for col_i in range(6):
-            idx = row * 6 + col_i
-            sp = sps[idx]
-            no = int(sp.get("sprint_no", idx + 1))
-            start_s = sp.get("start_date", "")
-            end_s = sp.get("end_date", "")
-            theme = _theme_preview(sp)
-
-            d, t = _progress_for_sp(sp)
-            ratio = _ratio(d, t)
-            pct = int(round(ratio * 100))
-
-            with cols[col_i]:
-                st.markdown(
-                    f"""
-<div class="cycle-card">
-  <div class="cycle-top">
-    <div>{TT("周期","Cycle")} {no}</div>
-    <div style="color:#777;font-weight:700;font-size:12px;"></div>
-  </div>
-  <div class="cycle-sub">{start_s} ~ {end_s}</div>
-  <div class="cycle-theme">{TT("主题","Theme")}: <span>{theme}</span></div>
-  <div class="cycle-progress">{TT("进度","Progress")}: {d}/{t} · {pct}%</div>
-</div>
-""",
-                    unsafe_allow_html=True,
-                )
-                st.progress(ratio)
-
-                # ✅ 真正“进入详情页”
-                if st.button(TT("查看", "Open"), key=f"open_{no}", use_container_width=True):
-                    goto_cycle(no)
+    # 进入详情：一个 pills 控件（不用 <a href="?cycle=N">：整页跳转会新开会话，session 里的数据就没了）
+    st.pills(
+        TT("打开周期", "Open cycle"),
+        options=list(range(1, len(sps) + 1)),
+        selection_mode="single",
+        key="overview_pick",
+        on_change=_on_pick_cycle,
+    )
 
     st.markdown("</div>", unsafe_allow_html=True)
 
+    # 全年完成热力图：和导出中心共用同一份缓存（store 版本 + 语言 + 今天）
+    with st.expander(TT("🔥 全年完成热力图", "🔥 Year completion heatmap")):
+        is_en = st.session_state.get("lang", "zh") == "en"
+        heat_png, _, _ = cached_artifact(
+            "heatmap",
+            lambda: render_heatmap(*completion_days(sps), is_en=is_en),
+            key=(is_en, date.today().isoformat()),
+        )
+        st.caption(TT("一格一天、一列一周：颜色越深，当天完成的任务越多。",
+                      "One square per day, one column per week: darker means more tasks completed that day."))
+        st.image(heat_png)
+
+    # 表格批量编辑：全部周期 + 全部任务两张表，放在一个表单里，提交时对比出改动，一次批量写入
+    with st.expander(TT("📝 表格批量编辑（全部周期）", "📝 Bulk edit as a table (all cycles)")):
+        st.caption(TT("直接在表格里改主题 / 交付物 / 复盘和任务的完成、证据、所在周期；任务表最下面可以新增行。改完点一次「保存」。",
+                      "Edit themes, objectives, reviews and each task's done flag, evidence and cycle in place; add tasks at the bottom. Save once."))
+        frames, _, _ = cached_artifact("bulk_edit_frames", lambda: editor_frames(sps))
+        ver = store_version()  # 写入后版本变了，编辑器换 key，清掉上一轮的编辑记录
+        with st.form("bulk_edit_form"):
+            cyc_ed = st.data_editor(
+                frames[0], key=f"bulk_cycles_{ver}", hide_index=True, num_rows="fixed", width="stretch",
+                disabled=["sprint_no", "start_date", "end_date"],
+                column_config={
+                    "sprint_no": st.column_config.NumberColumn(TT("周期", "Cycle"), width="small"),
+                    "start_date": st.column_config.TextColumn(TT("开始", "Start"), width="small"),
+                    "end_date": st.column_config.TextColumn(TT("结束", "End"), width="small"),
+                    "theme": st.column_config.TextColumn(TT("主题", "Theme")),
+                    "objective": st.column_config.TextColumn(TT("交付物/目标", "Objective")),
+                    "review": st.column_config.TextColumn(TT("复盘", "Review")),
+                },
+            )
+            task_ed = st.data_editor(
+                frames[1], key=f"bulk_tasks_{ver}", hide_index=True, num_rows="add", width="stretch",
+                column_config={
+                    "task_id": None,
+                    "sprint_no": st.column_config.NumberColumn(TT("周期", "Cycle"), min_value=1, max_value=len(sps),
+                                                               step=1, required=True, width="small"),
+                    "title": st.column_config.TextColumn(TT("任务", "Task"), required=True),
+                    "done": st.column_config.CheckboxColumn(TT("完成", "Done"), default=False, width="small"),
+                    "evidence": st.column_config.TextColumn(TT("证据/备注", "Evidence/Notes")),
+                },
+            )
+            bulk_saved = st.form_submit_button(TT("💾 保存全部改动", "💾 Save all changes"))
+        if bulk_saved:
+            edits = diff_edits(cyc_ed, task_ed, get_sprints())
+            if not edits["changes"]:
+                st.info(TT("没有改动。", "Nothing changed."))
+            else:
+                # 改了周期的任务一并移到新周期末尾：同一次写入、一次版本号 +1
+                bulk_update_plan(edits["sprint_updates"], edits["task_updates"], edits["new_tasks"],
+                                 task_moves=edits["task_moves"])
+                st.toast(TT(f"已保存 {len(edits['changes'])} 处改动 ✅", f"Saved {len(edits['changes'])} change(s) ✅"))
+                st.rerun()
+
+    # 重复习惯：只定义一次，每个周期的任务清单里自动出现（不再按周期复制任务）
+    habits = list_habits()
+    with st.expander(TT(f"🔁 重复习惯（每个周期都有）· {len(habits)}", f"🔁 Recurring habits (in every cycle) · {len(habits)}")):
+        for h in habits:
+            hid = h["id"]
+            hc1, hc2, hc3 = st.columns([6, 2, 0.6])
+            with hc1:
+                st.text_input(TT("习惯", "Habit"), value=h.get("title", ""), key=f"habit_title_{hid}",
+                              on_change=_on_habit_title, args=(hid,), label_visibility="collapsed")
+            with hc2:
+                st.caption(TT(f"已完成 {bit_count(h.get('done_bits', 0), len(sps))}/{len(sps)} 期",
+                              f"Done in {bit_count(h.get('done_bits', 0), len(sps))}/{len(sps)} cycles"))
+            with hc3:
+                if st.button("🗑️", key=f"habit_del_{hid}", help=TT("删除习惯", "Delete habit")):
+                    delete_habit(hid)
+                    st.rerun()
+
+        have = {_norm(h.get("title", "")) for h in habits}
+        with st.form("habit_add_form", clear_on_submit=True):
+            picked = st.multiselect(TT("从推荐习惯添加", "Add from suggestions"),
+                                    options=[x for x in HABIT_TEMPLATES if x not in have])
+            custom = st.text_input(TT("或自己写一条", "Or write your own"))
+            add_habit_btn = st.form_submit_button(TT("➕ 添加重复习惯", "➕ Add recurring habit"))
+        if add_habit_btn:
+            if sum(add_habit(t) for t in picked + [custom]):
+                st.rerun()
+
     st.info(
         TT(
-            "提示：点击卡片「查看」进入该周期详情与任务清单。",
-            "Tip: Click “Open” on a card to enter details & tasks."
+            "提示：在「打开周期」里点编号，进入该周期详情与任务清单。",
+            "Tip: Pick a number under “Open cycle” to enter details & tasks."
         )
     )
     st.stop()
@@ -268,7 +466,7 @@ with topR:
         goto_overview()
 
 if not sp:
-    st.error(TT("未找到该周期，请先重建 36×10。", "Cycle not found. Please rebuild 36×10."))
+    st.error(TT("未找到该周期，请先重建周期。", "Cycle not found. Please rebuild the cycles."))
     st.stop()
 
 start_s = sp.get("start_date", "")
@@ -282,21 +480,93 @@ with nav1:
         goto_cycle(max(1, no - 1))
 with nav3:
     if st.button(TT("下一个 →", "Next →"), use_container_width=True, key="next_btn"):
-        goto_cycle(min(36, no + 1))
+        goto_cycle(min(len(sps), no + 1))
 
-# 进度
-tasks = list_tasks_for_sprint(no) or []
-total = len(tasks)
-done = sum(1 for t in tasks if bool(t.get("done", False)))
-ratio = _ratio(done, total)
+# -----------------------
+# 局部重跑：
+# - 进度头是带 key 的 fragment；勾选任务的回调里只点名重跑它（勾选框本身前端已是新状态，这一行不用重跑）
+# - 每条任务一行一个 fragment：改证据只重跑这一行
+# - 证据不逐条写：离开输入框/回车时先记进待写缓冲，本次（整页或单行）重跑开头一次性批量写入
+# - 周期表单、导航、其它任务行都不重跑；删除 / 新增会改变行数，仍整页重跑
+# -----------------------
+@st.fragment(key="gp_progress")
+def _progress_header(no: int):
+    done, total = sprint_progress(no)
+    ratio = _ratio(done, total)
+    st.markdown(
+        f'<span class="badge">{TT("任务","Tasks")}: {total}</span>'
+        f'<span class="badge">{TT("完成","Done")}: {done}</span>'
+        f'<span class="badge">{TT("完成率","Rate")}: {int(round(ratio*100))}%</span>',
+        unsafe_allow_html=True
+    )
+    st.progress(ratio)
+
+def _on_toggle(tid: str):
+    toggle_task_done(tid, bool(st.session_state.get(f"done_{tid}", False)))
+    st.rerun("gp_progress")
+
+def _on_evidence(tid: str):
+    st.session_state.setdefault("_evidence_pending", {})[tid] = st.session_state.get(f"ev_{tid}", "")
+
+def _flush_evidence():
+    pending = st.session_state.get("_evidence_pending")
+    if pending:
+        update_task_evidence_bulk(dict(pending))
+        pending.clear()
+
+@st.fragment
+def _task_row(tsk: dict, ids: tuple = ()):
+    """ids：本周期普通任务的 id（按顺序），用来算上移/下移要排到谁前面"""
+    _flush_evidence()
+    tid = tsk.get("id", "")
+    src = _norm(tsk.get("source_care_id", ""))
+
+    if tsk.get("habit_id"):
+        # 重复习惯展开的虚拟任务：只有勾选；改名/删除在总览的「重复习惯」里
+        st.checkbox(tsk.get("title", ""), value=bool(tsk.get("done", False)), key=f"done_{tid}",
+                    on_change=_on_toggle, args=(tid,))
+        st.markdown(f'<span class="badge">🔁 {TT("每期重复", "Recurring")}</span>', unsafe_allow_html=True)
+        return
+
+    left, right, mv, act = st.columns([4, 2, 0.5, 0.5])
+    with left:
+        st.checkbox(tsk.get("title", ""), value=bool(tsk.get("done", False)), key=f"done_{tid}",
+                    on_change=_on_toggle, args=(tid,))
+        if src:
+            st.markdown(
+                f'<span class="badge">from CARE</span><span class="badge">care_id={src}</span>',
+                unsafe_allow_html=True
+            )
+    with right:
+        st.text_input(TT("证据/备注", "Evidence/Notes"),
+                      value=tsk.get("evidence", ""), key=f"ev_{tid}",
+                      on_change=_on_evidence, args=(tid,))
+    with mv:
+        # 移动 / 调整顺序：只改这一条的 rank，不重排整列；行数和顺序变了，整页重跑
+        pos = ids.index(tid) if tid in ids else -1
+        with st.popover("↕️", help=TT("移动 / 调整顺序", "Move / reorder")):
+            u, d = st.columns(2)
+            if u.button(TT("⬆️ 上移", "⬆️ Up"), key=f"up_{tid}", disabled=pos <= 0, use_container_width=True):
+                reorder_task(tid, ids[pos - 1])
+                st.rerun()
+            if d.button(TT("⬇️ 下移", "⬇️ Down"), key=f"down_{tid}", disabled=pos < 0 or pos >= len(ids) - 1,
+                        use_container_width=True):
+                reorder_task(tid, ids[pos + 2] if pos + 2 < len(ids) else None)
+                st.rerun()
+            to_no = st.selectbox(TT("移到周期", "Move to cycle"), options=list(range(1, len(sps) + 1)),
+                                 index=no - 1, key=f"mvto_{tid}")
+            if st.button(TT("移过去（排在末尾）", "Move (to the end)"), key=f"mvgo_{tid}",
+                         disabled=int(to_no) == no, use_container_width=True):
+                move_task(tid, int(to_no))
+                st.rerun()
+    with act:
+        if st.button("🗑️", key=f"del_{tid}", help=TT("删除任务", "Delete task")):
+            delete_task(tid)
+            st.rerun()
 
-st.markdown(
-    f'<span class="badge">{TT("任务","Tasks")}: {total}</span>'
-    f'<span class="badge">{TT("完成","Done")}: {done}</span>'
-    f'<span class="badge">{TT("完成率","Rate")}: {int(round(ratio*100))}%</span>',
-    unsafe_allow_html=True
-)
-st.progress(ratio)
+# 进度
+_flush_evidence()
+_progress_header(no)
 
 # 周期内容编辑
 with st.form(f"cycle_text_form_{no}"):
@@ -320,31 +590,41 @@ st.divider()
 # 任务清单
 st.subheader(TT("任务清单", "Tasks"))
 
+real_tasks = list_tasks_for_sprint(no) or []
+tasks = habit_tasks_for_sprint(no) + real_tasks
 if not tasks:
     st.info(TT("暂无任务。你可以：1）从年度挖掘/CARE 分配；2）在这里新增任务。", "No tasks yet. Assign from Annual/CARE or add below."))
 else:
+    task_ids = tuple(x.get("id", "") for x in real_tasks)
     for tsk in tasks:
-        tid = tsk.get("id", "")
-        title = tsk.get("title", "")
-        done_now = bool(tsk.get("done", False))
-        src = _norm(tsk.get("source_care_id", ""))
-
-        left, right = st.columns([4, 2])
-        with left:
-            new_done = st.checkbox(title, value=done_now, key=f"done_{tid}")
-            if new_done != done_now:
-                toggle_task_done(tid, new_done)
-                st.rerun()
-            if src:
-                st.markdown(
-                    f'<span class="badge">from CARE</span><span class="badge">care_id={src}</span>',
-                    unsafe_allow_html=True
-                )
-        with right:
-            ev = st.text_input(TT("证据/备注", "Evidence/Notes"),
-                               value=tsk.get("evidence", ""), key=f"ev_{tid}")
-            if ev != (tsk.get("evidence", "") or ""):
-                update_task_evidence(tid, ev)
+        _task_row(tsk, task_ids)
+
+# 顺延：本期没完成的任务整批挪到下一期（证据、CARE 来源一起带过去；重复习惯不用顺延）
+open_cnt = rollover_pending(no) if no < len(sps) else 0
+if open_cnt:
+    ro1, ro2 = st.columns([3, 1])
+    with ro1:
+        ro_copy = st.toggle(TT("复制（本期保留一份）", "Copy (keep in this cycle)"), key=f"rollover_copy_{no}")
+    with ro2:
+        if st.button(TT(f"⏭️ 顺延 {open_cnt} 条未完成到周期 {no + 1}", f"⏭️ Roll {open_cnt} open task(s) into Cycle {no + 1}"),
+                     key=f"rollover_btn_{no}", use_container_width=True):
+            n = rollover_unfinished(no, copy=ro_copy)
+            st.toast(TT(f"已顺延 {n} 条任务 ✅", f"Rolled over {n} task(s) ✅"))
+            st.rerun()
+
+# 本期捕获的灵感：CARE 按记录日期归到周期
+care_here = care_records_by_cycle().get(no, [])
+if care_here:
+    with st.expander(TT(f"💡 本期捕获的灵感（{len(care_here)}）", f"💡 Inspirations captured this cycle ({len(care_here)})")):
+        lines = []
+        for r in care_here:
+            action = html.escape(_norm(r.get("action", ""))) or "—"
+            src = html.escape(_norm(r.get("capture_source", "")))
+            lines.append(
+                f'<div class="care-line"><span class="badge">{html.escape(str(r.get("created_at", ""))[:10])}</span>'
+                f'<b>{action}</b>' + (f' <span class="small">· {src}</span>' if src else "") + '</div>'
+            )
+        st.markdown("".join(lines), unsafe_allow_html=True)
 
 st.divider()
 
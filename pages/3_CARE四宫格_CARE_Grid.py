@@ -94,21 +94,18 @@ def _rebuild_tags_from_history():
                     _add_tag_if_new(x)
 
 
-def find_assignment_by_care_id(care_id: str):
-    sprints = get_sprints() or []
-    if not sprints:
-        return None
-
-    care_id_str = str(care_id)
-    for sp in sprints:
+def assignments_by_care_id() -> dict:
+    """care_id -> (周期号, 任务 dict)；一次遍历全部任务（原来每条记录各扫一遍）"""
+    out = {}
+    for sp in get_sprints() or []:
         sp_no = sp.get("sprint_no")
         if not sp_no:
             continue
-        tasks = list_tasks_for_sprint(int(sp_no)) or []
-        for t in tasks:
-            if str(t.get("source_care_id", "")) == care_id_str:
-                return (int(sp_no), bool(t.get("done", False)), t.get("title", ""))
-    return None
+        for t in list_tasks_for_sprint(int(sp_no)) or []:
+            cid = str(t.get("source_care_id", "") or "")
+            if cid and cid not in out:
+                out[cid] = (int(sp_no), t)
+    return out
 
 
 # -----------------------
@@ -187,6 +184,7 @@ st.markdown("</div>", unsafe_allow_html=True)
 
 # -----------------------
 # B | 列表 + 编辑 + 分配到 36×10 + 同步完成状态
+# 每条记录是一个 fragment：勾选「完成了吗」只重跑这一条；编辑 / 分配 / 删除仍整页重跑
 # -----------------------
 st.markdown('<div class="card">', unsafe_allow_html=True)
 st.subheader(TT("记录列表", "Records"))
@@ -218,124 +216,132 @@ def match(r: dict) -> bool:
             return False
     return True
 
-records_show = [r for r in records if match(r)]
-sprints_exist = bool(get_sprints())
+def _on_done_sync(sp_no: int, care_id: str):
+    toggle_task_done_by_source(sp_no, care_id, bool(st.session_state.get(f"done_sync_{care_id}", False)))
 
-if not records_show:
-    st.info(TT("暂无记录。你可以先添加一条 CARE。", "No records yet. Add your first CARE above."))
-else:
-    for r in records_show:
-        care_id = str(r.get("id"))
-        vt = _norm(r.get("vow_tag", "")) or TT("（无标签）", "(no tag)")
-        score = int(r.get("relevance_score", 0))
-
-        assign_info = find_assignment_by_care_id(care_id)
-        if assign_info:
-            sp_no, done, _ = assign_info
-            badge = f"{TT('已分配','Assigned')} · {TT('周期','Cycle')} {sp_no} · {'✅' if done else '⬜'}"
-        else:
-            badge = TT("未分配到 36×10", "Not assigned to 36×10")
 
-        st.markdown(
-            f'<span class="badge">⭐ {score}</span>'
-            f'<span class="badge">{vt}</span>'
-            f'<span class="badge">{badge}</span>',
-            unsafe_allow_html=True
-        )
+@st.fragment
+def _care_row(r: dict, sp_no, assign_task):
+    care_id = str(r.get("id"))
+    done = bool(assign_task.get("done", False)) if assign_task else False
+    vt = _norm(r.get("vow_tag", "")) or TT("（无标签）", "(no tag)")
+    score = int(r.get("relevance_score", 0))
 
-        st.write(r.get("action", ""))
-
-        with st.expander(TT("展开详情 / 编辑 / 分配", "Details / Edit / Assign"), expanded=False):
-
-            # ✅ 若已分配：允许直接勾选完成（同步 36×10）
-            if assign_info:
-                sp_no, done, _ = assign_info
-                new_done = st.checkbox(
-                    TT(f"本行动已加入 周期 {sp_no} 的任务：完成了吗？", f"Assigned to Cycle {sp_no}: Mark done?"),
-                    value=bool(done),
-                    key=f"done_sync_{care_id}",
-                )
-                if new_done != bool(done):
-                    toggle_task_done_by_source(sp_no, care_id, new_done)
-                    st.success(TT("已同步到 36×10 ✅", "Synced to 36×10 ✅"))
-                    st.rerun()
+    if assign_task:
+        badge = f"{TT('已分配','Assigned')} · {TT('周期','Cycle')} {sp_no} · {'✅' if done else '⬜'}"
+    else:
+        badge = TT("未分配到 36×10", "Not assigned to 36×10")
 
-            # 编辑
-            with st.form(f"edit_{care_id}"):
-                cap_e = st.text_area("Capture/Source", value=r.get("capture_source",""), height=70)
-                cog_e = st.text_area("Cognition", value=r.get("cognition",""), height=70)
-                act_e = st.text_area("Action", value=r.get("action",""), height=70)
-
-                c1, c2 = st.columns(2)
-                with c1:
-                    rel_e = st.text_input("Relationship", value=r.get("relationship",""))
-                with c2:
-                    ego_e = st.text_input("Ego drive", value=r.get("ego_drive",""))
-
-                st.markdown("**Vow Tag**")
-                colA, colB = st.columns([2, 3])
-                with colA:
-                    vow_opts_now = [vow_none] + (st.session_state.get("vow_tags", []) or [])
-                    cur_v = _norm(r.get("vow_tag",""))
-                    idx = vow_opts_now.index(cur_v) if (cur_v and cur_v in vow_opts_now) else 0
-                    vow_pick_e = st.selectbox("Pick", vow_opts_now, index=idx, key=f"pick_{care_id}")
-                with colB:
-                    vow_new_e = st.text_input(TT("输入新标签（可选）","New tag (optional)"), key=f"new_{care_id}")
-
-                score_e = st.slider("Relevance Score", 0, 5, int(r.get("relevance_score",0)), key=f"sc_{care_id}")
-                tags_e = st.text_input("Tags", value=r.get("tags",""), key=f"tg_{care_id}")
-                save_edit = st.form_submit_button(TT("保存修改", "Save changes"))
-
-            if save_edit:
-                final_v = _norm(vow_new_e) if _norm(vow_new_e) else ("" if vow_pick_e == vow_none else _norm(vow_pick_e))
-                if final_v:
-                    _add_tag_if_new(final_v)
-
-                update_care_record(
-                    care_id,
-                    capture_source=_norm(cap_e),
-                    cognition=_norm(cog_e),
-                    action=_norm(act_e),
-                    relationship=_norm(rel_e),
-                    ego_drive=_norm(ego_e),
-                    vow_tag=final_v,
-                    relevance_score=int(score_e),
-                    tags=_norm(tags_e),
-                )
-                st.success(TT("已保存 ✅", "Saved ✅"))
-                st.rerun()
-
-            st.divider()
-
-            # 分配到 36×10
-            if not sprints_exist:
-                st.info(TT("还没有生成 36×10 周期。请先去「36×10天」页面生成周期。",
-                           "No 36×10 cycles yet. Please generate them first."))
-            else:
-                st.markdown("**" + TT("把这条行动分配到 36×10", "Assign this action to 36×10") + "**")
-                colX, colY = st.columns([2, 1])
-                with colX:
-                    sp_no_sel = st.selectbox(TT("选择周期", "Select cycle"), options=list(range(1, 37)), index=0, key=f"sp_{care_id}")
-                with colY:
-                    assign_btn = st.button(TT("一键分配", "Assign"), key=f"as_{care_id}")
-
-                if assign_btn:
-                    title = _norm(r.get("action",""))
-                    if not title:
-                        st.warning(TT("这条记录的 Action 为空，无法分配。", "Action is empty — cannot assign."))
-                    else:
-                        add_task_to_sprint_unique(int(sp_no_sel), title, source_care_id=care_id)
-                        st.success(TT(f"已分配到 周期 {sp_no_sel}", f"Assigned to Cycle {sp_no_sel}"))
-                        st.rerun()
-
-            st.divider()
-
-            # 删除
-            if st.button(TT("🗑 删除这条", "🗑 Delete"), key=f"del_{care_id}"):
-                delete_care_record(care_id)
-                st.success(TT("已删除", "Deleted"))
-                st.rerun()
+    st.markdown(
+        f'<span class="badge">⭐ {score}</span>'
+        f'<span class="badge">{vt}</span>'
+        f'<span class="badge">{badge}</span>',
+        unsafe_allow_html=True
+    )
+
+    st.write(r.get("action", ""))
+
+    with st.expander(TT("展开详情 / 编辑 / 分配", "Details / Edit / Assign"), expanded=False):
+
+        # ✅ 若已分配：允许直接勾选完成（同步 36×10）
+        if assign_task:
+            st.checkbox(
+                TT(f"本行动已加入 周期 {sp_no} 的任务：完成了吗？", f"Assigned to Cycle {sp_no}: Mark done?"),
+                value=done,
+                key=f"done_sync_{care_id}",
+                on_change=_on_done_sync,
+                args=(sp_no, care_id),
+            )
+
+        # 编辑
+        with st.form(f"edit_{care_id}"):
+            cap_e = st.text_area("Capture/Source", value=r.get("capture_source",""), height=70)
+            cog_e = st.text_area("Cognition", value=r.get("cognition",""), height=70)
+            act_e = st.text_area("Action", value=r.get("action",""), height=70)
+
+            c1, c2 = st.columns(2)
+            with c1:
+                rel_e = st.text_input("Relationship", value=r.get("relationship",""))
+            with c2:
+                ego_e = st.text_input("Ego drive", value=r.get("ego_drive",""))
+
+            st.markdown("**Vow Tag**")
+            colA, colB = st.columns([2, 3])
+            with colA:
+                vow_opts_now = [vow_none] + (st.session_state.get("vow_tags", []) or [])
+                cur_v = _norm(r.get("vow_tag",""))
+                idx = vow_opts_now.index(cur_v) if (cur_v and cur_v in vow_opts_now) else 0
+                vow_pick_e = st.selectbox("Pick", vow_opts_now, index=idx, key=f"pick_{care_id}")
+            with colB:
+                vow_new_e = st.text_input(TT("输入新标签（可选）","New tag (optional)"), key=f"new_{care_id}")
+
+            score_e = st.slider("Relevance Score", 0, 5, int(r.get("relevance_score",0)), key=f"sc_{care_id}")
+            tags_e = st.text_input("Tags", value=r.get("tags",""), key=f"tg_{care_id}")
+            save_edit = st.form_submit_button(TT("保存修改", "Save changes"))
+
+        if save_edit:
+            final_v = _norm(vow_new_e) if _norm(vow_new_e) else ("" if vow_pick_e == vow_none else _norm(vow_pick_e))
+            if final_v:
+                _add_tag_if_new(final_v)
+
+            update_care_record(
+                care_id,
+                capture_source=_norm(cap_e),
+                cognition=_norm(cog_e),
+                action=_norm(act_e),
+                relationship=_norm(rel_e),
+                ego_drive=_norm(ego_e),
+                vow_tag=final_v,
+                relevance_score=int(score_e),
+                tags=_norm(tags_e),
+            )
+            st.success(TT("已保存 ✅", "Saved ✅"))
+            st.rerun()
 
         st.divider()
 
+        # 分配到 36×10
+        if not sprints_exist:
+            st.info(TT("还没有生成行动周期。请先去「36×10天」页面生成周期。",
+                       "No cycles yet. Please generate them first."))
+        else:
+            st.markdown("**" + TT("把这条行动分配到 36×10", "Assign this action to 36×10") + "**")
+            colX, colY = st.columns([2, 1])
+            with colX:
+                sp_no_sel = st.selectbox(TT("选择周期", "Select cycle"), options=list(range(1, n_sprints + 1)), index=0, key=f"sp_{care_id}")
+            with colY:
+                assign_btn = st.button(TT("一键分配", "Assign"), key=f"as_{care_id}")
+
+            if assign_btn:
+                title = _norm(r.get("action",""))
+                if not title:
+                    st.warning(TT("这条记录的 Action 为空，无法分配。", "Action is empty — cannot assign."))
+                else:
+                    add_task_to_sprint_unique(int(sp_no_sel), title, source_care_id=care_id)
+                    st.success(TT(f"已分配到 周期 {sp_no_sel}", f"Assigned to Cycle {sp_no_sel}"))
+                    st.rerun()
+
+        st.divider()
+
+        # 删除
+        if st.button(TT("🗑 删除这条", "🗑 Delete"), key=f"del_{care_id}"):
+            delete_care_record(care_id)
+            st.success(TT("已删除", "Deleted"))
+            st.rerun()
+
+    st.divider()
+
+
+records_show = [r for r in records if match(r)]
+n_sprints = len(get_sprints() or [])
+sprints_exist = n_sprints > 0
+
+if not records_show:
+    st.info(TT("暂无记录。你可以先添加一条 CARE。", "No records yet. Add your first CARE above."))
+else:
+    assigned = assignments_by_care_id()
+    for r in records_show:
+        sp_no, assign_task = assigned.get(str(r.get("id")), (None, None))
+        _care_row(r, sp_no, assign_task)
+
 st.markdown("</div>", unsafe_allow_html=True)
@@ -0,0 +1,114 @@
+# pages/6_完成分析_Analytics.py
+# -*- coding: utf-8 -*-
+
+from datetime import date, datetime
+
+import streamlit as st
+
+from analytics import chart_frames, compute_analytics
+from i18n import init_i18n, lang_selector
+from store import cached_artifact, get_plan, get_sprints, list_care_records, list_habits
+
+# -----------------------
+# set_page_config（必须在 st.xxx 前）
+# -----------------------
+lang = st.session_state.get("lang", "zh")
+st.set_page_config(
+    page_title=("⑥ 完成分析" if lang == "zh" else "⑥ Analytics"),
+    page_icon="📈",
+    layout="wide",
+)
+
+init_i18n(default="zh")
+lang_selector()
+
+def TT(zh: str, en: str) -> str:
+    return zh if st.session_state.get("lang", "zh") == "zh" else en
+
+def _pct(x) -> str:
+    return f"{x * 100:.0f}%"
+
+st.title(TT("📈 完成分析", "📈 Completion Analytics"))
+st.caption(
+    TT(
+        "每期完成率、滚动速度、燃起图、CARE 转化与证据覆盖。数据不变时直接复用上次的计算结果。",
+        "Completion per cycle, rolling velocity, burn-up, CARE conversion and evidence coverage. Reused until your data changes.",
+    )
+)
+
+if not get_sprints():
+    st.info(TT("还没有生成行动周期。请先去「36×10天」页面生成周期。", "No cycles yet. Please generate them on the Growth Plan page first."))
+    st.stop()
+
+# -----------------------
+# 计算：按 (store 版本, 今天) 缓存；“今天”决定哪些周期算已开始
+# -----------------------
+def _build() -> dict:
+    res = compute_analytics(get_sprints(), list_care_records(), list_habits())
+    res["charts"] = chart_frames(res["cycles"])
+    return res
+
+res, built_at, reused = cached_artifact("analytics", _build, key=date.today().isoformat())
+summary, charts = res["summary"], res["charts"]
+
+# -----------------------
+# 指标
+# -----------------------
+m1, m2, m3, m4, m5 = st.columns(5)
+m1.metric(TT("完成率", "Completion"), _pct(summary["rate"]), f'{summary["done"]}/{summary["tasks"]}', delta_color="off")
+m2.metric(TT("滚动速度（条/期）", "Velocity (tasks/cycle)"), f'{summary["velocity"]:.1f}')
+m3.metric(
+    TT("按当前速度还需", "Cycles to finish"),
+    "—" if summary["cycles_to_finish"] is None else TT(f'{summary["cycles_to_finish"]:.1f} 期', f'{summary["cycles_to_finish"]:.1f}'),
+    TT(f'剩 {summary["remaining"]} 条', f'{summary["remaining"]} left'),
+    delta_color="off",
+)
+m4.metric(
+    TT("CARE → 任务", "CARE → tasks"),
+    _pct(summary["care_conversion"]),
+    f'{summary["care_converted"]}/{summary["care_total"]}',
+    delta_color="off",
+)
+m5.metric(TT("证据覆盖率", "Evidence coverage"), _pct(summary["evidence_coverage"]))
+
+if summary["current_no"]:
+    st.caption(TT(f"当前在第 {summary['current_no']} 期（共 {get_plan()['count']} 期）。速度取最近几期的平均完成数。",
+                  f"Currently in cycle {summary['current_no']} of {get_plan()['count']}. Velocity = average completions over recent cycles."))
+else:
+    st.caption(TT("计划还没开始：速度和燃起图的实际线会从第 1 期开始出现。",
+                  "The plan hasn't started yet: velocity and the actual burn-up line appear from cycle 1."))
+
+# -----------------------
+# 图表
+# -----------------------
+c1, c2 = st.columns(2)
+with c1:
+    st.subheader(TT("燃起图：累计完成 vs 计划", "Burn-up: done vs plan"))
+    st.line_chart(
+        charts["burnup"].rename(columns={"planned_cum": TT("计划累计", "Planned"), "actual_cum": TT("实际累计", "Actual")}),
+        x_label=TT("周期", "Cycle"),
+    )
+with c2:
+    st.subheader(TT("每期完成率（%）", "Completion per cycle (%)"))
+    st.bar_chart(charts["rate"].rename(columns={"rate": TT("完成率", "Completion")}), x_label=TT("周期", "Cycle"))
+
+c3, c4 = st.columns(2)
+with c3:
+    st.subheader(TT("速度：每期完成数与滚动平均", "Velocity: done per cycle & rolling mean"))
+    st.line_chart(
+        charts["velocity"].rename(columns={"done": TT("本期完成", "Done"), "velocity": TT("滚动平均", "Rolling mean")}),
+        x_label=TT("周期", "Cycle"),
+    )
+with c4:
+    st.subheader(TT("证据覆盖率（%）", "Evidence coverage (%)"))
+    st.bar_chart(charts["evidence"].rename(columns={"evidence_rate": TT("有证据", "With evidence")}), x_label=TT("周期", "Cycle"))
+
+with st.expander(TT("每期明细", "Per-cycle table")):
+    st.dataframe(res["cycles"], hide_index=True, width="stretch")
+
+st.caption(
+    TT(
+        f"计算于 {datetime.fromtimestamp(built_at):%H:%M:%S}" + ("（数据未变，已复用）" if reused else ""),
+        f"Computed at {datetime.fromtimestamp(built_at):%H:%M:%S}" + (" (data unchanged, reused)" if reused else ""),
+    )
+)
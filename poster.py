@@ -0,0 +1,647 @@
+# poster.py
+# -*- coding: utf-8 -*-
+"""
+Life Circle 海报的 Matplotlib 公共层：
+- 中文字体只在进程内发现/注册一次（不再每次渲染都探测路径、改 rcParams）
+- 可选预热：服务启动时先画一张小图，让字体缓存在第一位用户之前就建好
+- 海报渲染：PNG（位图）/ SVG / PDF（矢量，适合印刷）
+- 印刷版（A3/A2，300~600dpi）：按横向条带分块渲染、边画边写 PNG，内存占用与尺寸无关
+"""
+
+from __future__ import annotations
+
+import io
+import os
+import struct
+import textwrap
+import threading
+import zlib
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, List, Optional
+
+import numpy as np
+
+# ✅ Matplotlib 在 Cloud 上建议用 Agg
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib as mpl
+from matplotlib import font_manager as fm
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.patches import Circle
+
+
+FONT_FILE = "NotoSansSC-Regular.ttf"
+
+# 常见放置位置：仓库根目录 / assets / fonts
+_ROOT = Path(__file__).resolve().parent
+FONT_CANDIDATES = [
+    _ROOT / FONT_FILE,
+    _ROOT / "assets" / FONT_FILE,
+    _ROOT / "fonts" / FONT_FILE,
+    _ROOT / "assets" / "fonts" / FONT_FILE,
+]
+
+FALLBACK_FONTS = [
+    "Noto Sans CJK SC", "Source Han Sans SC",
+    "Microsoft YaHei", "SimHei", "Arial Unicode MS", "DejaVu Sans",
+]
+
+
+@lru_cache(maxsize=None)
+def setup_fonts() -> Optional[fm.FontProperties]:
+    """
+    让 Matplotlib 在 Streamlit Cloud 也能显示中文（每个进程只执行一次）：
+    - 尝试从仓库里注册 NotoSansSC-Regular.ttf
+    - 再设置 rcParams 的 sans-serif 优先级
+    返回注册成功的 FontProperties；没找到字体文件时返回 None（走系统兜底字体）。
+    """
+    prop = None
+    for p in FONT_CANDIDATES:
+        if p.exists():
+            try:
+                fm.fontManager.addfont(str(p))
+                prop = fm.FontProperties(fname=str(p))
+                break
+            except Exception:
+                prop = None
+
+    if prop is not None:
+        mpl.rcParams["font.sans-serif"] = [prop.get_name()] + FALLBACK_FONTS
+    else:
+        mpl.rcParams["font.sans-serif"] = list(FALLBACK_FONTS)
+
+    mpl.rcParams["axes.unicode_minus"] = False
+    return prop
+
+
+_warm_lock = threading.Lock()
+_warm_started = False
+
+
+def _render_warmup_figure() -> None:
+    setup_fonts()
+    fig = Figure(figsize=(1.0, 1.0), dpi=50)
+    ax = fig.add_subplot()
+    ax.axis("off")
+    # 中英文都画一遍：触发字体查找 + 字形缓存
+    ax.text(0.5, 0.5, "生命之轮 Life Circle", ha="center", va="center", fontsize=8, fontweight="bold")
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=50)
+    buf.close()
+
+
+def warm_up(background: bool = True) -> None:
+    """
+    预热 Matplotlib（每个进程只执行一次）：注册字体并渲染一张极小的图。
+    - background=True：放到后台线程，不阻塞当前页面
+    - 设置环境变量 WENDY_MPL_WARMUP=0 可关闭
+    """
+    global _warm_started
+    if os.environ.get("WENDY_MPL_WARMUP", "1") == "0":
+        return
+    with _warm_lock:
+        if _warm_started:
+            return
+        _warm_started = True
+
+    if background:
+        threading.Thread(target=_render_warmup_figure, name="mpl-warmup", daemon=True).start()
+    else:
+        _render_warmup_figure()
+
+
+# =======================
+# 画布与格式
+# =======================
+POSTER_DPI = 220
+PREVIEW_DPI = 170
+PREVIEW_FIGSIZE = (10.5, 7.5)
+
+# 快速预览档：低 dpi + 画布比例直接贴合内容（不用 bbox_inches="tight" 再排一遍版）
+PREVIEW_FAST_DPI = 80
+
+CANVAS_PX = {
+    "ig_square": (1080, 1080),
+    "ig_story": (1080, 1920),
+    "xhs_3x4": (1080, 1440),
+    "xhs_4x5": (1080, 1350),
+}
+
+FORMAT_MIME = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "pdf": "application/pdf",
+}
+
+# 矢量输出：SVG 把文字转成路径（不依赖对方电脑有中文字体）；
+# PDF 只嵌入用到的字形子集（Type 3）。Type 42 要对整个中文字体做子集化，慢好几倍，体积却差不多
+_VECTOR_RC = {
+    "svg": {"svg.fonttype": "path", "svg.hashsalt": "life-circle"},
+    "pdf": {"pdf.fonttype": 3},
+}
+# rc_context 改的是进程级 rcParams：矢量格式串行渲染；PNG 不碰 rc，多线程并行也安全
+_VECTOR_RC_LOCK = threading.Lock()
+
+
+@contextmanager
+def _format_rc(fmt: str):
+    if fmt not in _VECTOR_RC:
+        yield
+        return
+    with _VECTOR_RC_LOCK, mpl.rc_context(_VECTOR_RC[fmt]):
+        yield
+
+
+# 去掉时间戳等元数据：同样的输入 → 同样的文件（方便缓存/对比）
+_VECTOR_METADATA = {
+    "svg": {"Date": None},
+    "pdf": {"CreationDate": None, "ModDate": None},
+}
+
+
+# =======================
+# 工具函数
+# =======================
+def clamp_list(items, n):
+    items = [str(x).strip() for x in (items or []) if str(x).strip()]
+    if len(items) <= n:
+        return items, 0
+    return items[:n], len(items) - n
+
+def one_line(s: str, width: int) -> str:
+    wrapped = textwrap.wrap(str(s), width=width)
+    return wrapped[0] if wrapped else str(s)
+
+def safe_radius(items, base=2.25, scale=0.03):
+    n = len([x for x in (items or []) if str(x).strip()])
+    return max(base, base + n * scale)
+
+def _pick_intersection_list(intersections: dict, keys: List[str]) -> List[str]:
+    for k in keys:
+        v = intersections.get(k)
+        if isinstance(v, list) and v:
+            return v
+    v0 = intersections.get(keys[0], [])
+    return v0 if isinstance(v0, list) else []
+
+
+# =======================
+# 标题自动换行（英文两行）
+# =======================
+def draw_auto_title(ax, main_title, subtitle, signature, y_top, is_english, mode, compact=False, scale=1.0):
+    # compact：年度挖掘页预览用的紧凑标题（分享版字号略小、行距略紧）
+    if mode == "share":
+        main_fs, sub_fs, sig_fs = (26, 16, 12) if compact else (28, 18, 12)
+    else:
+        main_fs, sub_fs, sig_fs = 24, 16, 12
+    top_gap, line_gap = (0.70, 0.80) if compact else (0.75, 0.85)
+
+    lines = []
+    if is_english:
+        words = main_title.split(" ")
+        cur = ""
+        for w in words:
+            if len(cur) + len(w) + (1 if cur else 0) <= 18:
+                cur = f"{cur} {w}".strip()
+            else:
+                if cur:
+                    lines.append(cur)
+                cur = w
+        if cur:
+            lines.append(cur)
+        if len(lines) > 2:
+            lines = [" ".join(lines[:-1]), lines[-1]]
+    else:
+        lines = [main_title]
+
+    y = y_top - top_gap
+    for line in lines:
+        ax.text(0, y, line, ha="center", va="center", fontsize=main_fs * scale, fontweight="bold")
+        y -= line_gap
+
+    ax.text(0, y - 0.10, subtitle, ha="center", va="center", fontsize=sub_fs * scale, fontweight="bold")
+    ax.text(0, y - 0.80, signature, ha="center", va="center", fontsize=sig_fs * scale, color="#555", alpha=0.60)
+
+
+# =======================
+# Life Circle 海报渲染（含两两交集 + 三清单）
+# =======================
+X_LIM = (-6.6, 6.6)
+Y_LIM = (-5.3, 7.6)
+
+
+def _draw_life_circle(
+    ax,
+    mode: str,
+    name: str,
+    dream_items, resp_items, talent_items,
+    intersections: dict,
+    is_en: bool,
+    show_n_full=10,
+    center_n_share=6,
+    compact_title=False,
+    scale=1.0,
+):
+    # scale：字号/线宽的整体倍数（印刷版纸张比社媒画布大，按比例放大，版式不变）
+    blue = "#4DA3FF"
+    purple = "#7E57FF"
+    green = "#42C77A"
+
+    x_min, x_max = X_LIM
+    y_min, y_max = Y_LIM
+
+    Dream_xy = (-1.85, -1.15)
+    Talent_xy = (1.85, -1.15)
+    Resp_xy = (0.0, 1.65)
+
+    r_dream = max(2.35, safe_radius(dream_items))
+    r_talent = max(2.35, safe_radius(talent_items))
+    r_resp = max(2.35, safe_radius(resp_items))
+
+    alpha_circle = 0.22 if mode == "share" else 0.26
+
+    # 圈：紫→蓝/绿（让左右圈更显眼）
+    ax.add_patch(Circle(Resp_xy,  r_resp,  color=purple, alpha=alpha_circle, lw=2 * scale, zorder=1))
+    ax.add_patch(Circle(Dream_xy, r_dream, color=blue,   alpha=alpha_circle, lw=2 * scale, zorder=2))
+    ax.add_patch(Circle(Talent_xy,r_talent,color=green,  alpha=alpha_circle, lw=2 * scale, zorder=2))
+
+    if is_en:
+        title_main = "Find Your 2026 Breakthrough"
+        dream_label, talent_label, resp_label = "Dream", "Talent", "Responsibility"
+        center_title = "Breakthrough (Center)"
+    else:
+        title_main = "找到2026年人生突破点"
+        dream_label, talent_label, resp_label = "梦想", "天赋", "责任"
+        center_title = "三者交汇（突破点）"
+
+    signature = f"{(name or 'YourName')} · 2026 · Life Circle"
+    draw_auto_title(ax, title_main, "Life Circle", signature, y_top=y_max, is_english=is_en, mode=mode,
+                    compact=compact_title, scale=scale)
+
+    # 标签：梦想/天赋底部，责任右侧（英文竖排）
+    label_fs = 18 * scale
+    bottom_label_y = Dream_xy[1] - r_dream - 0.55
+    ax.text(Dream_xy[0], bottom_label_y, dream_label, ha="center", va="center", fontsize=label_fs, fontweight="bold")
+    ax.text(Talent_xy[0], bottom_label_y, talent_label, ha="center", va="center", fontsize=label_fs, fontweight="bold")
+
+    resp_y = Resp_xy[1] + 0.10
+    ideal_x = Resp_xy[0] + r_resp + 0.55
+    if is_en:
+        resp_x = min(ideal_x, x_max - 0.35)
+        ax.text(resp_x, resp_y, resp_label, ha="center", va="center", fontsize=label_fs, fontweight="bold", rotation=90)
+    else:
+        resp_x = min(ideal_x, x_max - 1.2)
+        ax.text(resp_x, resp_y, resp_label, ha="left", va="center", fontsize=label_fs, fontweight="bold")
+
+    # slogan
+    ax.text(0, y_min + 0.20, "Mission → Action → Reality",
+            ha="center", va="center", fontsize=13 * scale, color="#666", alpha=0.55)
+
+    # center
+    center = intersections.get("center", []) or intersections.get("中心", []) or []
+    show_center, more_center = clamp_list(center, center_n_share if mode == "share" else min(10, show_n_full))
+    center_lines = [f"• {one_line(x, 18)}" for x in show_center]
+    if more_center > 0:
+        center_lines.append(f"… {more_center} more" if is_en else f"… 还有 {more_center} 条")
+
+    center_text = center_title + "\n" + (
+        "\n".join(center_lines) if center_lines else ("(empty)" if is_en else "（空）")
+    )
+
+    ax.text(
+        0.0, 0.20,
+        center_text,
+        ha="center", va="center",
+        fontsize=(13 if mode == "share" else 12) * scale,
+        fontweight="bold",
+        bbox=dict(
+            boxstyle="round,pad=0.55,rounding_size=0.15",
+            facecolor="white",
+            edgecolor="#333",
+            linewidth=1.1 * scale,
+            alpha=0.84,
+        ),
+        zorder=6
+    )
+
+    # Full：三清单 + 三交集
+    if mode == "full":
+        def _list_block(title, items, x, y):
+            show, more = clamp_list(items, 7)
+            lines = [f"• {one_line(s, 18)}" for s in show]
+            if more > 0:
+                lines.append(f"… {more} more" if is_en else f"… 还有 {more} 条")
+            txt = title + "\n" + ("\n".join(lines) if lines else ("(empty)" if is_en else "（空）"))
+            ax.text(
+                x, y, txt,
+                ha="center", va="center",
+                fontsize=10 * scale,
+                bbox=dict(boxstyle="round,pad=0.30,rounding_size=0.12",
+                          facecolor="white", edgecolor="#999", linewidth=0.8 * scale, alpha=0.55),
+                zorder=5
+            )
+
+        _list_block("Responsibility List" if is_en else "责任清单", resp_items, Resp_xy[0], Resp_xy[1] + 0.75)
+        _list_block("Dream List" if is_en else "梦想清单", dream_items, Dream_xy[0] - 0.25, Dream_xy[1] + 0.15)
+        _list_block("Talent List" if is_en else "天赋清单", talent_items, Talent_xy[0] + 0.25, Talent_xy[1] + 0.15)
+
+        resp_dream = _pick_intersection_list(intersections, ["resp_dream", "责任∩梦想", "rd"])
+        resp_talent = _pick_intersection_list(intersections, ["resp_talent", "责任∩天赋", "rt"])
+        dream_talent = _pick_intersection_list(intersections, ["dream_talent", "梦想∩天赋", "dt"])
+
+        def _fmt_block(title, items, max_n=4):
+            show, more = clamp_list(items, max_n)
+            lines = [f"• {one_line(x, 14)}" for x in show]
+            if more > 0:
+                lines.append(f"… {more} more" if is_en else f"… 还有 {more} 条")
+            return title + "\n" + ("\n".join(lines) if lines else ("(empty)" if is_en else "（空）"))
+
+        ax.text(-3.10, 0.95, _fmt_block("Resp ∩ Dream" if is_en else "责任 ∩ 梦想", resp_dream),
+                ha="center", va="center", fontsize=9 * scale,
+                bbox=dict(boxstyle="round,pad=0.25", facecolor="white", edgecolor="#AAA", linewidth=scale, alpha=0.60),
+                zorder=7)
+        ax.text(3.10, 0.95, _fmt_block("Resp ∩ Talent" if is_en else "责任 ∩ 天赋", resp_talent),
+                ha="center", va="center", fontsize=9 * scale,
+                bbox=dict(boxstyle="round,pad=0.25", facecolor="white", edgecolor="#AAA", linewidth=scale, alpha=0.60),
+                zorder=7)
+        ax.text(0.0, -2.75, _fmt_block("Dream ∩ Talent" if is_en else "梦想 ∩ 天赋", dream_talent),
+                ha="center", va="center", fontsize=9 * scale,
+                bbox=dict(boxstyle="round,pad=0.25", facecolor="white", edgecolor="#AAA", linewidth=scale, alpha=0.60),
+                zorder=7)
+
+
+def _new_canvas(figsize, dpi):
+    # 不走 pyplot：Figure 不进全局状态，不用 plt.close，也可以在多线程里各画各的
+    fig = Figure(figsize=figsize, dpi=dpi)
+    ax = fig.add_subplot()
+    ax.set_aspect("equal")
+    ax.axis("off")
+    ax.set_position([0, 0, 1, 1])
+    ax.set_xlim(*X_LIM)
+    ax.set_ylim(*Y_LIM)
+    return fig, ax
+
+
+def render_life_circle(
+    canvas: str,   # preview/ig_square/ig_story/xhs_3x4/xhs_4x5
+    mode: str,     # share/full
+    name: str,
+    dream_items, resp_items, talent_items,
+    intersections: dict,
+    is_en: bool = False,
+    fmt: str = "png",  # png/svg/pdf
+    show_n_full=10,
+    center_n_share=6,
+) -> bytes:
+    """
+    渲染 Life Circle 海报，返回文件字节。
+    fmt="svg"/"pdf" 时输出矢量文件：不需要按 dpi 栅格化，文件更小，印刷也不糊。
+    """
+    if fmt not in FORMAT_MIME:
+        raise ValueError(f"unknown poster format: {fmt}")
+    setup_fonts()
+
+    if canvas == "preview":
+        dpi = PREVIEW_DPI
+        figsize = PREVIEW_FIGSIZE
+        fixed = False
+    else:
+        dpi = POSTER_DPI
+        fixed = True
+        px = CANVAS_PX.get(canvas, (1080, 1080))
+        figsize = (px[0] / dpi, px[1] / dpi)
+
+    with _format_rc(fmt):
+        fig, ax = _new_canvas(figsize, dpi)
+        _draw_life_circle(
+            ax, mode, name, dream_items, resp_items, talent_items, intersections,
+            is_en=is_en, show_n_full=show_n_full, center_n_share=center_n_share,
+        )
+
+        buf = io.BytesIO()
+        kwargs = dict(format=fmt, dpi=dpi, facecolor="white")
+        if fmt in _VECTOR_METADATA:
+            kwargs["metadata"] = _VECTOR_METADATA[fmt]
+        if not fixed:
+            kwargs["bbox_inches"] = "tight"
+        fig.savefig(buf, **kwargs)
+    b = buf.getvalue()
+    buf.close()
+    return b
+
+
+def render_life_circle_png(
+    canvas: str,
+    mode: str,
+    name: str,
+    dream_items, resp_items, talent_items,
+    intersections: dict,
+    is_en: bool = False,
+    show_n_full=10,
+    center_n_share=6,
+) -> bytes:
+    return render_life_circle(
+        canvas, mode, name, dream_items, resp_items, talent_items, intersections,
+        is_en=is_en, fmt="png", show_n_full=show_n_full, center_n_share=center_n_share,
+    )
+
+
+def render_life_circle_preview_png(
+    name: str,
+    dream_items: List[str],
+    resp_items: List[str],
+    talent_items: List[str],
+    intersections: dict,
+    mode: str = "full",  # share/full
+    is_en: bool = False,
+    fast: bool = False,
+) -> bytes:
+    """
+    年度挖掘页的 Life Circle 预览。
+    - fast=False：完整清晰度（170dpi + bbox_inches="tight"）
+    - fast=True：输入时的实时预览（低 dpi，画布按内容比例裁好，省掉 tight 的二次排版）
+    """
+    setup_fonts()
+
+    if fast:
+        # 与完整预览同一比例尺（英寸/单位），上下各留一点边给圈外的标签
+        dpi = PREVIEW_FAST_DPI
+        pad = 0.6
+        w_units = X_LIM[1] - X_LIM[0]
+        h_units = Y_LIM[1] - Y_LIM[0]
+        scale = PREVIEW_FIGSIZE[1] / h_units
+        figsize = (w_units * scale, (h_units + 2 * pad) * scale)
+    else:
+        dpi = PREVIEW_DPI
+        figsize = PREVIEW_FIGSIZE
+
+    fig, ax = _new_canvas(figsize, dpi)
+    if fast:
+        pad_frac = pad / (h_units + 2 * pad)
+        ax.set_position([0, pad_frac, 1, 1 - 2 * pad_frac])
+    _draw_life_circle(
+        ax, mode, name, dream_items, resp_items, talent_items, intersections,
+        is_en=is_en, compact_title=True,
+    )
+
+    buf = io.BytesIO()
+    if fast:
+        fig.savefig(buf, format="png", dpi=dpi, facecolor="white")
+    else:
+        fig.savefig(buf, format="png", dpi=dpi, facecolor="white", bbox_inches="tight")
+    b = buf.getvalue()
+    buf.close()
+    return b
+
+
+# =======================
+# 印刷版海报（A3/A2 · 300~600dpi）
+# =======================
+PRINT_PAPER_MM = {
+    "a3": (297, 420),
+    "a2": (420, 594),
+}
+PRINT_DPI_CHOICES = (300, 450, 600)
+
+# 每个条带的 RGBA 缓冲上限（字节）：A2@600dpi 整张要 ~550MB，分块后始终 ≤ 这个值
+PRINT_TILE_BYTES = 16 * 1024 * 1024
+
+# 社媒画布的设计宽度（英寸）：字号/线宽都是按这个宽度调的，印刷版按纸宽等比放大
+_DESIGN_WIDTH_IN = CANVAS_PX["ig_square"][0] / POSTER_DPI
+
+
+class _PngStreamWriter:
+    """
+    极简 PNG 流式写出：逐条带追加像素行，边压缩边写（8-bit RGB，Sub 滤波）。
+    不需要把整张图放进内存；只用标准库 zlib/struct。
+    """
+
+    _IDAT_CHUNK = 256 * 1024
+
+    def __init__(self, out: BinaryIO, width: int, height: int, dpi: int):
+        self.out = out
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self._z = zlib.compressobj(6)
+        self._pending = bytearray()
+
+        out.write(b"\x89PNG\r\n\x1a\n")
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        ppm = int(round(dpi / 0.0254))  # 像素/米：打开时按真实印刷尺寸显示
+        self._chunk(b"pHYs", struct.pack(">IIB", ppm, ppm, 1))
+
+    def _chunk(self, kind: bytes, data: bytes):
+        self.out.write(struct.pack(">I", len(data)))
+        self.out.write(kind)
+        self.out.write(data)
+        self.out.write(struct.pack(">I", zlib.crc32(data, zlib.crc32(kind)) & 0xFFFFFFFF))
+
+    def _flush_idat(self, final: bool = False):
+        while len(self._pending) >= self._IDAT_CHUNK or (final and self._pending):
+            part = bytes(self._pending[: self._IDAT_CHUNK])
+            del self._pending[: self._IDAT_CHUNK]
+            self._chunk(b"IDAT", part)
+
+    def write_rows(self, rgb: np.ndarray):
+        h, w, _ = rgb.shape
+        if w != self.width or self.rows_written + h > self.height:
+            raise ValueError("tile does not fit the PNG canvas")
+        # Sub 滤波：每个字节减去左边像素的同通道字节（uint8 自动取模），纯色大块压得更小
+        rows = np.empty((h, 1 + w * 3), dtype=np.uint8)
+        rows[:, 0] = 1
+        flat = np.ascontiguousarray(rgb, dtype=np.uint8).reshape(h, w * 3)
+        rows[:, 1:4] = flat[:, :3]
+        np.subtract(flat[:, 3:], flat[:, :-3], out=rows[:, 4:])
+        self._pending += self._z.compress(rows.tobytes())
+        self.rows_written += h
+        self._flush_idat()
+
+    def close(self):
+        if self.rows_written != self.height:
+            raise ValueError("PNG canvas is incomplete")
+        self._pending += self._z.flush()
+        self._flush_idat(final=True)
+        self._chunk(b"IEND", b"")
+
+
+def print_canvas_px(paper: str, dpi: int):
+    w_mm, h_mm = PRINT_PAPER_MM[paper]
+    return int(round(w_mm / 25.4 * dpi)), int(round(h_mm / 25.4 * dpi))
+
+
+def render_life_circle_print(
+    out: BinaryIO,
+    paper: str,    # a3/a2
+    dpi: int,      # 300/450/600（fmt="pdf" 时只影响元数据，矢量不按 dpi 栅格化）
+    mode: str,     # share/full
+    name: str,
+    dream_items, resp_items, talent_items,
+    intersections: dict,
+    is_en: bool = False,
+    fmt: str = "png",  # png/pdf
+    tile_bytes: int = PRINT_TILE_BYTES,
+):
+    """
+    印刷版 Life Circle，直接写进 out（文件/临时文件），不在内存里拼整张图。
+    - PNG：整张画布按横向条带逐块用 Agg 渲染，每块渲染完马上压缩写出；
+      峰值内存 ≈ 一个条带（≤ tile_bytes），与纸张尺寸/dpi 无关
+    - PDF：本身是矢量，直接按纸张尺寸输出（文字为字形子集，不需要分块）
+    """
+    if paper not in PRINT_PAPER_MM:
+        raise ValueError(f"unknown paper size: {paper}")
+    if fmt not in ("png", "pdf"):
+        raise ValueError(f"unsupported print format: {fmt}")
+    setup_fonts()
+
+    w_px, h_px = print_canvas_px(paper, dpi)
+    w_in, h_in = w_px / dpi, h_px / dpi
+    scale = w_in / _DESIGN_WIDTH_IN
+    draw_kwargs = dict(is_en=is_en, scale=scale)
+
+    if fmt == "pdf":
+        with _format_rc("pdf"):
+            fig, ax = _new_canvas((w_in, h_in), dpi)
+            _draw_life_circle(ax, mode, name, dream_items, resp_items, talent_items, intersections, **draw_kwargs)
+            fig.savefig(out, format="pdf", dpi=dpi, facecolor="white", metadata=_VECTOR_METADATA["pdf"])
+        return
+
+    # 内容区（等比、水平铺满、垂直居中）在整张画布上的位置（英寸，自下而上）
+    x_units = X_LIM[1] - X_LIM[0]
+    y_units = Y_LIM[1] - Y_LIM[0]
+    ax_w_in = min(w_in, h_in * x_units / y_units)
+    ax_h_in = ax_w_in * y_units / x_units
+    ax_left_in = (w_in - ax_w_in) / 2
+    ax_bottom_in = (h_in - ax_h_in) / 2
+
+    tile_rows = max(16, min(h_px, tile_bytes // (w_px * 4)))
+    tile_h_in = tile_rows / dpi
+    writer = _PngStreamWriter(out, w_px, h_px, dpi)
+
+    # 只建一张“条带高”的 Figure，内容画一次；每个条带只是把内容区向下平移再重绘。
+    # 条带高度是整数像素 → 各条带的像素网格与整张图完全对齐，拼接处没有缝
+    fig = Figure(figsize=(w_in, tile_h_in), dpi=dpi)
+    fig.patch.set_facecolor("white")
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.axis("off")
+    ax.set_xlim(*X_LIM)
+    ax.set_ylim(*Y_LIM)
+    _draw_life_circle(ax, mode, name, dream_items, resp_items, talent_items, intersections, **draw_kwargs)
+
+    for top in range(0, h_px, tile_rows):
+        rows = min(tile_rows, h_px - top)
+        tile_bottom_in = h_in - (top + tile_rows) / dpi  # 最后一块可能伸出画布底部，多出来的行丢掉
+        ax.set_position([
+            ax_left_in / w_in,
+            (ax_bottom_in - tile_bottom_in) / tile_h_in,
+            ax_w_in / w_in,
+            ax_h_in / tile_h_in,
+        ])
+        canvas.draw()
+        writer.write_rows(np.asarray(canvas.buffer_rgba())[:rows, :, :3])
+
+    writer.close()
@@ -0,0 +1,65 @@
+# ranks.py
+# -*- coding: utf-8 -*-
+"""
+分数索引（fractional index）：任务排序用的 rank 字符串，按字典序比较。
+- 任意两个 rank 之间总能再插一个（rank_between），移动/拖拽排序只改被移动的那一条，不用给整列重新编号
+- 62 进制数字（0-9A-Za-z，ASCII 顺序即大小顺序），小数部分写法：不允许以 "0" 结尾（"V" 和 "V0" 是同一个值）
+- 只有旧数据（没有 rank 的任务）才需要 initial_ranks 一次性补齐
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+_BASE = len(DIGITS)
+
+
+def _midpoint(a: str, b: Optional[str]) -> str:
+    """a < c < b（b=None 表示上界无穷大）；a 可以是 ""（下界 0）"""
+    if b is not None:
+        # 公共前缀照抄，从第一个不同的位开始取中间
+        n = 0
+        while n < len(b) and (a[n] if n < len(a) else "0") == b[n]:
+            n += 1
+        if n > 0:
+            return b[:n] + _midpoint(a[n:], b[n:])
+    da = DIGITS.index(a[0]) if a else 0
+    db = DIGITS.index(b[0]) if b is not None else _BASE
+    if db - da > 1:
+        return DIGITS[(da + db + 1) // 2]
+    # 首位相邻：b 还有后续位时直接取 b 的首位；否则保留 a 的首位，在下一位上继续取中间
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[da] + _midpoint(a[1:], None)
+
+
+def rank_between(before: Optional[str] = None, after: Optional[str] = None) -> str:
+    """
+    排在 before 之后、after 之前的新 rank；两者都可为 None（列表开头 / 末尾）。
+    before >= after 时抛 ValueError。
+    """
+    a = before or ""
+    if after is not None and a >= after:
+        raise ValueError(f"rank_between: {before!r} >= {after!r}")
+    if a.endswith("0") or (after or "").endswith("0"):
+        raise ValueError("rank must not end with '0'")
+    return _midpoint(a, after)
+
+
+def initial_ranks(n: int) -> List[str]:
+    """n 个均匀分布、严格递增的 rank（给旧数据一次性补 rank 用）"""
+    if n <= 0:
+        return []
+    width = 1
+    while _BASE ** width <= n:
+        width += 1
+    step = _BASE ** width // (n + 1)
+    out = []
+    for i in range(1, n + 1):
+        v, s = step * i, []
+        for _ in range(width):
+            v, r = divmod(v, _BASE)
+            s.append(DIGITS[r])
+        out.append("".join(reversed(s)).rstrip("0"))
+    return out
@@ -0,0 +1,87 @@
+# scheduler.py
+# -*- coding: utf-8 -*-
+"""
+自动排期：把一批条目（年度挖掘清单 / backlog）分配到各个周期，O(n log n)。
+- 容量：每个周期最多 capacity 条（已有任务也算在内），都满了的条目进 overflow
+- 均衡：总是放进当前负载最小的周期；负载相同时，优先放进同类条目最少的周期（类别混搭），再按周期号从前往后
+- 分组：同一 linked_goal 的条目排在一起依次处理；组里第一条照常放进负载最小的周期，
+  之后的条目优先放进该组上一条所在的周期或它前后相邻的一期（有空位时），于是同组条目挨在一起；
+  这几期都满了才回到全局负载最小的周期
+实现：每个类别一个小根堆 (负载, 同类负载, 周期号)，分配后把该周期的新键推进各堆，旧键出堆时按当前值核对丢弃（惰性删除）。
+组内就近只看 3 个候选周期，整体仍是 O(n log n)。
+"""
+
+from __future__ import annotations
+
+import heapq
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+DEFAULT_CAPACITY = 3
+
+
+def _grouped(items: List[dict], group_key: str) -> List[dict]:
+    """同组条目排到一起；组按首次出现的顺序，组内保持原顺序（稳定排序）"""
+    first: Dict[str, int] = {}
+    for i, it in enumerate(items):
+        first.setdefault(str(it.get(group_key) or ""), i)
+    return sorted(items, key=lambda it: first[str(it.get(group_key) or "")])
+
+
+def schedule(
+    items: Iterable[dict],
+    loads: Dict[int, int],
+    capacity: int = DEFAULT_CAPACITY,
+    group_key: str = "linked_goal",
+) -> Tuple[List[Tuple[int, dict]], List[dict]]:
+    """
+    items：[{title, category, linked_goal, ...}]；loads：{周期号: 已有条数}（决定参与排期的周期）。
+    返回 (分配 [(周期号, 条目)], 放不下的条目)。不改动传入的数据。
+    """
+    load = {int(no): int(n) for no, n in loads.items()}
+    cat_load: Dict[Tuple[int, str], int] = defaultdict(int)
+    heaps: Dict[str, list] = {}
+
+    def heap_for(cat: str) -> list:
+        h = heaps.get(cat)
+        if h is None:
+            h = [(load[no], cat_load[(no, cat)], no) for no in load]
+            heapq.heapify(h)
+            heaps[cat] = h
+        return h
+
+    def near_group(last_no: int, cat: str):
+        """组里上一条所在的周期及前后相邻的一期里，挑有空位、负载最小的（再按同类负载、距离、周期号）"""
+        cands = [
+            (load[no], cat_load[(no, cat)], abs(no - last_no), no)
+            for no in (last_no, last_no - 1, last_no + 1)
+            if no in load and load[no] < capacity
+        ]
+        return min(cands)[3] if cands else None
+
+    assigned: List[Tuple[int, dict]] = []
+    overflow: List[dict] = []
+    last_of: Dict[str, int] = {}
+    for it in _grouped(list(items), group_key):
+        cat = str(it.get("category") or "")
+        group = str(it.get(group_key) or "")
+        no = near_group(last_of[group], cat) if group and group in last_of else None
+        if no is None:
+            h = heap_for(cat)
+            # 丢掉过期的键：负载已变的周期在堆里还有更新的那一条
+            while h and (h[0][0] != load[h[0][2]] or h[0][1] != cat_load[(h[0][2], cat)]):
+                heapq.heappop(h)
+            if not h or h[0][0] >= capacity:
+                overflow.append(it)
+                continue
+            no = heapq.heappop(h)[2]
+
+        if group:
+            last_of[group] = no
+        load[no] += 1
+        cat_load[(no, cat)] += 1
+        assigned.append((no, it))
+        for k, hk in heaps.items():
+            heapq.heappush(hk, (load[no], cat_load[(no, k)], no))
+
+    return assigned, overflow
@@ -9,12 +9,17 @@ from __future__ import annotations
 
 import uuid
 import json
+import time
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from datetime import date, timedelta
-from typing import Dict, List, Optional, Any
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import streamlit as st
 
+from cycles import DEFAULT_COUNT, DEFAULT_LENGTH, bit_count, bit_get, bit_set, cycle_table, infer_length
+from ranks import initial_ranks, rank_between
+
 
 # -----------------------
 # 基础：每个访问者唯一 user_key
@@ -58,11 +63,181 @@ def _ensure_store() -> Dict[str, Any]:
         },
     )
 
-    store.setdefault("sprints", [])       # List[dict] len=36
+    store.setdefault("sprints", [])       # List[dict]，长度 = plan["count"]
+    store.setdefault("plan", {})          # 周期引擎参数：count / length / start / skip
+    store.setdefault("habits", [])        # 重复习惯：只存定义 + 每期完成位集，读取时按周期展开
+    store.setdefault("backlog", [])       # 待排期条目：{id, title, category(项目/习惯/能力), linked_goal, sprint_no}
     store.setdefault("care_records", [])  # List[dict]
     return store
 
 
+# -----------------------
+# 版本号：每次写操作 +1，派生产物（Excel 等）据此判断要不要重建
+# 放在 STORE 外面：不进 JSON 备份
+# -----------------------
+def _bump_version():
+    st.session_state["STORE_VERSION"] = int(st.session_state.get("STORE_VERSION", 0)) + 1
+
+
+def store_version() -> int:
+    return int(st.session_state.get("STORE_VERSION", 0))
+
+
+def cached_artifact(name: str, build: Callable[[], Any], key: Any = None) -> Tuple[Any, float, bool]:
+    """
+    按 (store 版本, key) 缓存当前用户的派生产物，每个 name 只留最新一份。
+    返回 (产物, 构建时间戳, 是否复用)。
+    """
+    cache = st.session_state.setdefault("_ARTIFACTS", {})
+    sig = (store_version(), key)
+    hit = cache.get(name)
+    if hit is not None and hit[0] == sig:
+        return hit[1], hit[2], True
+
+    value = build()
+    built_at = time.time()
+    cache[name] = (sig, value, built_at)
+    return value, built_at, False
+
+
+def peek_artifact(name: str, key: Any = None) -> Any:
+    """只查不建：缓存仍有效就返回产物，否则 None"""
+    hit = st.session_state.get("_ARTIFACTS", {}).get(name)
+    if hit is not None and hit[0] == (store_version(), key):
+        return hit[1]
+    return None
+
+
+# -----------------------
+# 进度计数：每个周期 [done, total] + 全计划合计，写操作时 O(1) 增减
+# 同样放在 STORE 外面；sprints 列表被整体替换（重建/导入）时按需全量重算一次
+# 判断“还是不是同一个列表”用 is 比对引用本身，不用 id()：旧列表回收后 id 可能被新列表复用
+# -----------------------
+def _rebuild_progress(sprints: List[dict]) -> dict:
+    by_no: Dict[int, List[int]] = {}
+    done_all = total_all = 0
+    for sp in sprints:
+        tasks = sp.get("tasks", []) or []
+        d = sum(1 for t in tasks if bool(t.get("done", False)))
+        by_no[sp.get("sprint_no")] = [d, len(tasks)]
+        done_all += d
+        total_all += len(tasks)
+    prog = {"sprints": sprints, "by_no": by_no, "done": done_all, "total": total_all}
+    st.session_state["PROGRESS"] = prog
+    return prog
+
+
+def _progress() -> dict:
+    sprints = get_sprints()
+    prog = st.session_state.get("PROGRESS")
+    if prog is None or prog.get("sprints") is not sprints:
+        prog = _rebuild_progress(sprints)
+    return prog
+
+
+def _count(sprint_no: int, d_done: int = 0, d_total: int = 0):
+    prog = _progress()
+    cnt = prog["by_no"].setdefault(sprint_no, [0, 0])
+    cnt[0] += d_done
+    cnt[1] += d_total
+    prog["done"] += d_done
+    prog["total"] += d_total
+
+
+def sprint_progress(sprint_no: int) -> Tuple[int, int]:
+    """(已完成, 任务总数)，不遍历任务；重复习惯每期各算一条"""
+    by_no = _progress()["by_no"]
+    d, t = by_no.get(sprint_no, (0, 0))
+    habits = list_habits()
+    if habits and sprint_no in by_no:
+        d += sum(bit_get(h.get("done_bits", 0), sprint_no) for h in habits)
+        t += len(habits)
+    return d, t
+
+
+def sprint_loads() -> Dict[int, int]:
+    """{周期号: 任务数}（不含重复习惯），直接取计数，自动排期用"""
+    return {no: cnt[1] for no, cnt in _progress()["by_no"].items()}
+
+
+def plan_progress() -> Tuple[int, int]:
+    """全计划 (已完成, 任务总数)"""
+    prog = _progress()
+    d, t = prog["done"], prog["total"]
+    habits = list_habits()
+    if habits:
+        n = len(prog["by_no"])
+        d += sum(bit_count(h.get("done_bits", 0), n) for h in habits)
+        t += len(habits) * n
+    return d, t
+
+
+# -----------------------
+# 日期 → 周期索引：各期开始日升序排好（ISO 字符串可直接比大小），bisect 查找 O(log n)
+# 同样放在 STORE 外面；sprints 列表被整体替换或增删周期时重建
+# -----------------------
+def _iso_day(d) -> str:
+    """date / datetime / ISO 字符串（可带时间）→ YYYY-MM-DD"""
+    if isinstance(d, date):
+        d = d.isoformat()
+    return str(d or "")[:10]
+
+
+def _rebuild_cycle_index(sprints: List[dict]) -> dict:
+    rows = sorted(
+        (_iso_day(sp.get("start_date")), _iso_day(sp.get("end_date")), sp.get("sprint_no"))
+        for sp in sprints
+        if sp.get("start_date")
+    )
+    idx = {
+        "sprints": sprints,
+        "n": len(sprints),
+        "starts": [r[0] for r in rows],
+        "ends": [r[1] for r in rows],
+        "nos": [r[2] for r in rows],
+    }
+    st.session_state["CYCLE_INDEX"] = idx
+    return idx
+
+
+def _cycle_index() -> dict:
+    sprints = get_sprints()
+    idx = st.session_state.get("CYCLE_INDEX")
+    if idx is None or idx.get("sprints") is not sprints or idx.get("n") != len(sprints):
+        idx = _rebuild_cycle_index(sprints)
+    return idx
+
+
+def _lookup_cycle(idx: dict, day: str) -> Optional[int]:
+    i = bisect_right(idx["starts"], day) - 1
+    if i < 0 or not day or day > idx["ends"][i]:
+        return None
+    return idx["nos"][i]
+
+
+def cycle_for_date(d) -> Optional[int]:
+    """d 落在第几期；计划开始前 / 结束后 / 两期之间被跳过的日子返回 None"""
+    return _lookup_cycle(_cycle_index(), _iso_day(d))
+
+
+def next_cycle_after(d) -> Optional[int]:
+    """d 之后最先开始的一期（d 不在任何周期里时用）；计划已结束返回 None"""
+    idx = _cycle_index()
+    i = bisect_right(idx["starts"], _iso_day(d))
+    return idx["nos"][i] if i < len(idx["nos"]) else None
+
+
+def care_records_by_cycle() -> Dict[int, List[dict]]:
+    """CARE 按 created_at 归到周期：{sprint_no: [记录]}，组内保持原顺序；不在任何周期里的不收"""
+    idx = _cycle_index()
+    out: Dict[int, List[dict]] = {}
+    for r in list_care_records():
+        no = _lookup_cycle(idx, _iso_day(r.get("created_at")))
+        if no is not None:
+            out.setdefault(no, []).append(r)
+    return out
+
+
 # -----------------------
 # AnnualDig（模拟 DB 行对象）
 # -----------------------
@@ -95,30 +270,55 @@ def update_annual_dig(talent: dict, responsibility: dict, dream: dict, intersect
         "dream": dream or {},
         "intersections": intersections or {},
     }
+    _bump_version()
 
 
 # -----------------------
-# 36×10 Sprint + Task（dict）
+# Sprint + Task（dict）：默认 36×10，周期数/天数/跳过日期由 plan 决定
 # -----------------------
-def regenerate_sprints(start: date):
-    """生成 36 个 10天周期（会清空旧 sprints 和 tasks）"""
+def regenerate_sprints(
+    start: date,
+    count: int = DEFAULT_COUNT,
+    length: int = DEFAULT_LENGTH,
+    skip: Optional[Iterable[date]] = None,
+):
+    """生成 count 个 length 天周期（会清空旧 sprints 和 tasks）；skip 里的日期不计入周期天数"""
     store = _ensure_store()
+    skip_iso = sorted({d.isoformat() if isinstance(d, date) else str(d) for d in (skip or [])})
     sprints: List[dict] = []
-    cur = start
-    for i in range(1, 37):
+    for i, (s, e) in enumerate(cycle_table(start, count, length, skip_iso), start=1):
         sprints.append(
             {
                 "sprint_no": i,
-                "start_date": cur.isoformat(),
-                "end_date": (cur + timedelta(days=9)).isoformat(),
+                "start_date": s.isoformat(),
+                "end_date": e.isoformat(),
                 "theme": "",
                 "objective": "",
                 "review": "",
                 "tasks": [],  # List[dict]
             }
         )
-        cur = cur + timedelta(days=10)
     store["sprints"] = sprints
+    for h in list_habits():
+        h["done_bits"] = 0  # 习惯定义保留，完成状态跟着新周期从头开始
+    store["plan"] = {"count": len(sprints), "length": int(length), "start": start.isoformat(), "skip": skip_iso}
+    _rebuild_progress(sprints)
+    _rebuild_cycle_index(sprints)
+    _bump_version()
+
+
+def get_plan() -> dict:
+    """当前计划参数 {count, length, start, skip}；旧备份没有 plan 时按 sprints 推断"""
+    store = _ensure_store()
+    sps = get_sprints()
+    plan = dict(store.get("plan") or {})
+    if sps:
+        plan["count"] = len(sps)
+    plan.setdefault("count", DEFAULT_COUNT)
+    if "length" not in plan:
+        plan["length"] = infer_length(sps)
+    plan.setdefault("skip", [])
+    return plan
 
 
 def get_sprints() -> List[dict]:
@@ -141,6 +341,7 @@ def update_sprint_text(sprint_no: int, theme: str, objective: str, review: str):
     sp["theme"] = theme or ""
     sp["objective"] = objective or ""
     sp["review"] = review or ""
+    _bump_version()
 
 
 def list_tasks_for_sprint(sprint_no: int) -> List[dict]:
@@ -151,6 +352,90 @@ def list_tasks_for_sprint(sprint_no: int) -> List[dict]:
     return tasks if isinstance(tasks, list) else []
 
 
+# -----------------------
+# 重复习惯：定义只存一份（改标题一处生效），每个周期读取时展开成“虚拟任务”
+# 完成状态是一个整数位集 done_bits：第 n 期 ↔ 第 n-1 位
+# 虚拟任务 id = "habit:<习惯 id>:<周期号>"，勾选走 toggle_task_done 同一个入口
+# -----------------------
+HABIT_TASK_PREFIX = "habit:"
+
+
+def list_habits() -> List[dict]:
+    store = _ensure_store()
+    habits = store.get("habits", [])
+    return habits if isinstance(habits, list) else []
+
+
+def _get_habit(habit_id: str) -> Optional[dict]:
+    for h in list_habits():
+        if h.get("id") == habit_id:
+            return h
+    return None
+
+
+def add_habit(title: str) -> bool:
+    """新增重复习惯（同名跳过）；返回是否新增"""
+    title = (title or "").strip()
+    if not title or any((h.get("title") or "").strip() == title for h in list_habits()):
+        return False
+    _ensure_store()["habits"].append({"id": str(uuid.uuid4()), "title": title, "done_bits": 0})
+    _bump_version()
+    return True
+
+
+def update_habit_title(habit_id: str, title: str):
+    h = _get_habit(habit_id)
+    title = (title or "").strip()
+    if not h or not title:
+        return
+    h["title"] = title
+    _bump_version()
+
+
+def delete_habit(habit_id: str) -> bool:
+    store = _ensure_store()
+    before = len(store["habits"])
+    store["habits"] = [h for h in list_habits() if h.get("id") != habit_id]
+    if len(store["habits"]) == before:
+        return False
+    _bump_version()
+    return True
+
+
+def set_habit_done(habit_id: str, sprint_no: int, done: bool) -> bool:
+    h = _get_habit(habit_id)
+    if not h or get_sprint_by_no(int(sprint_no)) is None:
+        return False
+    h["done_bits"] = bit_set(h.get("done_bits", 0), int(sprint_no), bool(done))
+    _bump_version()
+    return True
+
+
+def habit_tasks_for_sprint(sprint_no: int) -> List[dict]:
+    """本期的重复习惯，展开成和普通任务同形的 dict（只读；勾选用 toggle_task_done）"""
+    return [
+        {
+            "id": f"{HABIT_TASK_PREFIX}{h.get('id')}:{int(sprint_no)}",
+            "title": h.get("title", ""),
+            "done": bit_get(h.get("done_bits", 0), int(sprint_no)),
+            "evidence": "",
+            "source_care_id": "",
+            "habit_id": h.get("id"),
+        }
+        for h in list_habits()
+    ]
+
+
+def _parse_habit_task_id(task_id: str) -> Optional[Tuple[str, int]]:
+    if not str(task_id).startswith(HABIT_TASK_PREFIX):
+        return None
+    habit_id, _, no = str(task_id)[len(HABIT_TASK_PREFIX):].rpartition(":")
+    try:
+        return habit_id, int(no)
+    except ValueError:
+        return None
+
+
 def _task_exists(sp: dict, title: str) -> bool:
     title = (title or "").strip()
     if not title:
@@ -161,6 +446,73 @@ def _task_exists(sp: dict, title: str) -> bool:
     return False
 
 
+# -----------------------
+# 排序：每条任务一个分数索引 rank（ranks.py），列表顺序始终与 rank 一致
+# 移动 / 调整顺序只改被移动那一条的 rank，不给整列重新编号；旧数据没有 rank 时按现有顺序一次性补齐
+# -----------------------
+def _ensure_ranks(sp: dict) -> List[dict]:
+    tasks = sp.setdefault("tasks", [])
+    if any(not t.get("rank") for t in tasks):
+        for t, r in zip(tasks, initial_ranks(len(tasks))):
+            t["rank"] = r
+    return tasks
+
+
+def _append_rank(sp: dict) -> str:
+    """排到本周期末尾的新 rank（在 append 之前调用）"""
+    tasks = sp.get("tasks") or []
+    if tasks and not tasks[-1].get("rank"):
+        _ensure_ranks(sp)
+    return rank_between(tasks[-1]["rank"] if tasks else None, None)
+
+
+def move_task(task_id: str, to_sprint: int, before_id: Optional[str] = None) -> bool:
+    """
+    把任务移到 to_sprint，排在 before_id 之前（None = 末尾）；同一周期内就是调整顺序。
+    只改这一条任务的 rank（和所在周期），进度计数同步增减。
+    """
+    if _parse_habit_task_id(task_id) or task_id == before_id:
+        return False
+    dst = get_sprint_by_no(int(to_sprint))
+    if not dst:
+        return False
+
+    src = t = None
+    for sp in get_sprints():
+        for i, x in enumerate(sp.get("tasks", [])):
+            if x.get("id") == task_id:
+                src, t = sp, sp["tasks"].pop(i)
+                break
+        if t is not None:
+            break
+    if t is None:
+        return False
+
+    tasks = _ensure_ranks(dst)
+    pos = len(tasks)
+    if before_id is not None:
+        pos = next((i for i, x in enumerate(tasks) if x.get("id") == before_id), len(tasks))
+    prev_rank = tasks[pos - 1]["rank"] if pos > 0 else None
+    next_rank = tasks[pos]["rank"] if pos < len(tasks) else None
+    t["rank"] = rank_between(prev_rank, next_rank)
+    tasks.insert(pos, t)
+
+    if src is not dst:
+        done = int(bool(t.get("done", False)))
+        _count(src.get("sprint_no"), -done, -1)
+        _count(dst.get("sprint_no"), done, 1)
+    _bump_version()
+    return True
+
+
+def reorder_task(task_id: str, before_id: Optional[str] = None) -> bool:
+    """同一周期内调整顺序：排到 before_id 之前（None = 末尾）"""
+    for sp in get_sprints():
+        if any(x.get("id") == task_id for x in sp.get("tasks", [])):
+            return move_task(task_id, sp.get("sprint_no"), before_id)
+    return False
+
+
 def add_task_to_sprint_unique(sprint_no: int, title: str, source_care_id: Optional[str] = None):
     sp = get_sprint_by_no(int(sprint_no))
     if not sp:
@@ -177,28 +529,73 @@ def add_task_to_sprint_unique(sprint_no: int, title: str, source_care_id: Option
             "done": False,
             "evidence": "",
             "source_care_id": str(source_care_id) if source_care_id is not None else "",
+            "rank": _append_rank(sp),
         }
     )
+    _count(sp.get("sprint_no"), 0, 1)
+    _bump_version()
+
+
+def _now_iso() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _set_done(sp: dict, t: dict, done: bool):
+    done = bool(done)
+    was = bool(t.get("done", False))
+    _count(sp.get("sprint_no"), int(done) - int(was))
+    t["done"] = done
+    # 完成时间（热力图用）：从未完成 → 完成时记下；取消完成时清掉
+    if done and not was:
+        t["done_at"] = _now_iso()
+    elif not done:
+        t["done_at"] = ""
 
 
 def toggle_task_done(task_id: str, done: bool):
+    habit = _parse_habit_task_id(task_id)
+    if habit:
+        set_habit_done(habit[0], habit[1], done)
+        return
     store = _ensure_store()
     for sp in store.get("sprints", []):
         for t in sp.get("tasks", []):
             if t.get("id") == task_id:
-                t["done"] = bool(done)
+                _set_done(sp, t, done)
+                _bump_version()
                 return
 
 
+def delete_task(task_id: str) -> bool:
+    store = _ensure_store()
+    for sp in store.get("sprints", []):
+        tasks = sp.get("tasks", [])
+        for i, t in enumerate(tasks):
+            if t.get("id") == task_id:
+                del tasks[i]
+                _count(sp.get("sprint_no"), -int(bool(t.get("done", False))), -1)
+                _bump_version()
+                return True
+    return False
+
+
 def update_task_evidence(task_id: str, evidence: str):
     store = _ensure_store()
     for sp in store.get("sprints", []):
         for t in sp.get("tasks", []):
             if t.get("id") == task_id:
                 t["evidence"] = evidence or ""
+                _bump_version()
                 return
 
 
+def update_task_evidence_bulk(updates: Dict[str, str]) -> int:
+    """批量写证据：{task_id: evidence}，一次遍历、一次版本号 +1"""
+    if not updates:
+        return 0
+    return bulk_update_plan(task_updates={tid: {"evidence": ev} for tid, ev in updates.items()})
+
+
 def find_task_by_source(sprint_no: int, source_care_id: str) -> Optional[dict]:
     source_care_id = str(source_care_id)
     for t in list_tasks_for_sprint(int(sprint_no)):
@@ -208,13 +605,273 @@ def find_task_by_source(sprint_no: int, source_care_id: str) -> Optional[dict]:
 
 
 def toggle_task_done_by_source(sprint_no: int, source_care_id: str, done: bool) -> bool:
+    sp = get_sprint_by_no(int(sprint_no))
     t = find_task_by_source(int(sprint_no), str(source_care_id))
-    if not t:
+    if not sp or not t:
+        return False
+    _set_done(sp, t, done)
+    _bump_version()
+    return True
+
+
+def bulk_update_plan(
+    sprint_updates: Optional[Dict[int, dict]] = None,
+    task_updates: Optional[Dict[str, dict]] = None,
+    new_tasks: Optional[List[tuple]] = None,
+    backlog_assignments: Optional[Dict[str, int]] = None,
+    task_moves: Optional[Dict[str, int]] = None,
+) -> int:
+    """
+    批量改计划：一次遍历、一次版本号 +1（导入 Excel / 批量编辑 / 自动排期用）。
+    - sprint_updates: {sprint_no: {"theme"/"objective"/"review": str}}
+    - task_updates:   {task_id: {"title"/"done"/"evidence": ...}}
+    - new_tasks:      [(sprint_no, title, done)] 或 [(sprint_no, title, done, evidence)]，同周期同名任务会跳过
+    - backlog_assignments: {backlog_id: sprint_no}，写条目的 sprint_no，并在该周期生成一条任务（source_backlog_id）
+    - task_moves:     {task_id: sprint_no}，移到该周期末尾（先改字段再移动；进度计数随之增减）
+    返回实际改动条数。
+    """
+    sprint_updates = sprint_updates or {}
+    task_updates = task_updates or {}
+    new_tasks = new_tasks or []
+    backlog_assignments = backlog_assignments or {}
+    task_moves = task_moves or {}
+    text_fields = ("theme", "objective", "review")
+    task_fields = ("title", "done", "evidence")
+
+    n = 0
+    by_no = {}
+    for sp in get_sprints():
+        no = sp.get("sprint_no")
+        by_no[no] = sp
+        for k, v in (sprint_updates.get(no) or {}).items():
+            if k in text_fields:
+                sp[k] = v or ""
+                n += 1
+        if task_updates:
+            for t in sp.get("tasks", []):
+                for k, v in (task_updates.get(t.get("id")) or {}).items():
+                    if k == "done":
+                        _set_done(sp, t, v)
+                        n += 1
+                    elif k in task_fields:
+                        t[k] = v or ""
+                        n += 1
+
+    if task_moves:
+        picked = []
+        for no, sp in by_no.items():
+            stay = []
+            for t in sp.get("tasks", []):
+                to_no = task_moves.get(t.get("id"))
+                if to_no is not None and int(to_no) != no and int(to_no) in by_no:
+                    picked.append((no, t, int(to_no)))
+                else:
+                    stay.append(t)
+            sp["tasks"][:] = stay
+        for no, t, to_no in picked:
+            dst = by_no[to_no]
+            _ensure_ranks(dst)
+            t["rank"] = _append_rank(dst)
+            dst["tasks"].append(t)
+            d = int(bool(t.get("done")))
+            _count(no, -d, -1)
+            _count(to_no, d, 1)
+            n += 1
+
+    for sprint_no, title, done, *rest in new_tasks:
+        sp = by_no.get(int(sprint_no))
+        title = (title or "").strip()
+        if not sp or _task_exists(sp, title):
+            continue
+        sp["tasks"].append(
+            {
+                "id": str(uuid.uuid4()),
+                "title": title,
+                "done": bool(done),
+                "done_at": _now_iso() if done else "",
+                "evidence": (rest[0] if rest else "") or "",
+                "source_care_id": "",
+                "rank": _append_rank(sp),
+            }
+        )
+        _count(sp.get("sprint_no"), int(bool(done)), 1)
+        n += 1
+
+    for it in list_backlog() if backlog_assignments else []:
+        sp = by_no.get(backlog_assignments.get(it.get("id")))
+        if not sp:
+            continue
+        it["sprint_no"] = sp.get("sprint_no")
+        n += 1
+        if _task_exists(sp, it.get("title", "")):
+            continue
+        sp["tasks"].append(
+            {
+                "id": str(uuid.uuid4()),
+                "title": (it.get("title") or "").strip(),
+                "done": False,
+                "done_at": "",
+                "evidence": "",
+                "source_care_id": "",
+                "source_backlog_id": it.get("id", ""),
+                "rank": _append_rank(sp),
+            }
+        )
+        _count(sp.get("sprint_no"), 0, 1)
+
+    if n:
+        _bump_version()
+    return n
+
+
+# -----------------------
+# 待排期清单（backlog）：条目带类别（项目/习惯/能力）和关联目标，由自动排期分到各周期
+# session 版没有单独的 backlog 视图：排进周期时同时在该周期生成一条任务
+# -----------------------
+def list_backlog(unscheduled_only: bool = False) -> List[dict]:
+    items = _ensure_store().setdefault("backlog", [])
+    return [it for it in items if not it.get("sprint_no")] if unscheduled_only else items
+
+
+def add_backlog_item(title: str, category: str = "项目", linked_goal: str = "") -> bool:
+    """同名的未排期条目不重复添加"""
+    title = (title or "").strip()
+    if not title or any(it.get("title") == title for it in list_backlog(unscheduled_only=True)):
         return False
-    t["done"] = bool(done)
+    list_backlog().append(
+        {
+            "id": str(uuid.uuid4()),
+            "title": title,
+            "category": category or "项目",
+            "linked_goal": (linked_goal or "").strip(),
+            "sprint_no": None,
+        }
+    )
+    _bump_version()
     return True
 
 
+def delete_backlog_item(item_id: str) -> bool:
+    items = list_backlog()
+    for i, it in enumerate(items):
+        if it.get("id") == item_id:
+            del items[i]
+            _bump_version()
+            return True
+    return False
+
+
+def assign_backlog_items_bulk(assignments: Dict[str, int]) -> int:
+    """批量写 backlog 的 sprint_no（自动排期确认后），一次版本号 +1"""
+    if not assignments:
+        return 0
+    return bulk_update_plan(backlog_assignments=assignments)
+
+
+# -----------------------
+# 顺延：把没完成的任务整批挪（或复制）到后面的周期，一次遍历、一次版本号 +1
+# 证据、source_care_id 原样保留；目标周期已有同名任务的跳过（移动模式下留在原周期）
+# 复制模式下原任务记 rolled_to=目标周期号，之后不再重复顺延，也不再算进待顺延
+# 重复习惯每期都会出现，不参与顺延
+# -----------------------
+def _rollover_plan(moves: Dict[int, int]) -> List[Tuple[dict, dict, dict]]:
+    """moves：{来源周期号: 目标周期号} → 实际会顺延的 [(来源周期, 任务, 目标周期)]，不改数据"""
+    by_no = {sp.get("sprint_no"): sp for sp in get_sprints()}
+    titles: Dict[int, set] = {}
+    plan = []
+    for src_no in sorted(moves):
+        src, dst = by_no.get(src_no), by_no.get(moves[src_no])
+        if not src or not dst or src is dst:
+            continue
+        seen = titles.setdefault(id(dst), {(t.get("title") or "").strip() for t in dst.get("tasks", [])})
+        for t in src.get("tasks", []):
+            title = (t.get("title") or "").strip()
+            if t.get("done", False) or t.get("rolled_to") or not title or title in seen:
+                continue
+            seen.add(title)
+            plan.append((src, t, dst))
+    return plan
+
+
+def _rollover(moves: Dict[int, int], copy: bool = False) -> int:
+    """按 _rollover_plan 执行；返回顺延的任务条数"""
+    plan = _rollover_plan(moves)
+    moved = {id(t) for _, t, _ in plan}
+    for src, t, dst in plan:
+        if copy:
+            t["rolled_to"] = dst.get("sprint_no")
+            t = {
+                "id": str(uuid.uuid4()),
+                "title": (t.get("title") or "").strip(),
+                "done": False,
+                "done_at": "",
+                "evidence": t.get("evidence", "") or "",
+                "source_care_id": t.get("source_care_id", "") or "",
+            }
+        else:
+            _count(src.get("sprint_no"), 0, -1)
+        t["rank"] = _append_rank(dst)
+        dst.setdefault("tasks", []).append(t)
+        _count(dst.get("sprint_no"), 0, 1)
+    if not copy:
+        for src in {id(src): src for src, _, _ in plan}.values():
+            src["tasks"] = [t for t in src.get("tasks", []) if id(t) not in moved]
+
+    if plan:
+        _bump_version()
+    return len(plan)
+
+
+def _next_moves(from_no: int, to_no: Optional[int] = None) -> Dict[int, int]:
+    from_no = int(from_no)
+    return {from_no: int(to_no) if to_no is not None else from_no + 1}
+
+
+def rollover_unfinished(from_no: int, to_no: Optional[int] = None, copy: bool = False) -> int:
+    """第 from_no 期没完成的任务顺延到 to_no（默认下一期）；copy=True 时原周期保留一份"""
+    return _rollover(_next_moves(from_no, to_no), copy=copy)
+
+
+def rollover_pending(from_no: int, to_no: Optional[int] = None) -> int:
+    """rollover_unfinished 现在会顺延几条（已顺延过的、目标里已有同名的不算）"""
+    return len(_rollover_plan(_next_moves(from_no, to_no)))
+
+
+def elapsed_cycles(today=None) -> List[int]:
+    """已经结束的周期号（结束日早于 today），按日期索引二分得到"""
+    idx = _cycle_index()
+    k = bisect_left(idx["ends"], _iso_day(today or date.today()))
+    return list(idx["nos"][:k])
+
+
+def catch_up_target(today=None) -> Optional[int]:
+    """补齐顺延的目标：今天所在的一期；今天不在任何周期里时取之后最先开始的一期"""
+    today = today or date.today()
+    return cycle_for_date(today) or next_cycle_after(today)
+
+
+def _catch_up_moves(today=None) -> Tuple[Dict[int, int], Optional[int]]:
+    target = catch_up_target(today)
+    if target is None:
+        return {}, None
+    return {no: target for no in elapsed_cycles(today) if no != target}, target
+
+
+def catch_up_rollover(today=None, copy: bool = False) -> Tuple[int, Optional[int]]:
+    """
+    一次补齐：所有已结束周期里没完成的任务都顺延到 catch_up_target(today)。
+    返回 (顺延条数, 目标周期号)；计划已结束（没有目标）时返回 (0, None)。
+    """
+    moves, target = _catch_up_moves(today)
+    return _rollover(moves, copy=copy), target
+
+
+def catch_up_pending(today=None) -> int:
+    """catch_up_rollover 现在会顺延几条：和它用同一份顺延清单（去重、跳过已复制过的），不含重复习惯"""
+    moves, _ = _catch_up_moves(today)
+    return len(_rollover_plan(moves))
+
+
 # -----------------------
 # CARE（Session 内记录）
 # -----------------------
@@ -250,6 +907,7 @@ def add_care_record(
             "created_at": date.today().isoformat(),
         },
     )
+    _bump_version()
 
 
 def update_care_record(care_id: str, **kwargs):
@@ -259,6 +917,7 @@ def update_care_record(care_id: str, **kwargs):
         if str(r.get("id")) == care_id:
             for k, v in kwargs.items():
                 r[k] = v
+            _bump_version()
             return
 
 
@@ -266,6 +925,7 @@ def delete_care_record(care_id: str):
     store = _ensure_store()
     care_id = str(care_id)
     store["care_records"] = [r for r in store.get("care_records", []) if str(r.get("id")) != care_id]
+    _bump_version()
 
 
 # -----------------------
@@ -282,3 +942,6 @@ def import_user_json(file_bytes: bytes):
     if "STORE" in data and isinstance(data["STORE"], dict):
         st.session_state["STORE"] = data["STORE"]
     _ensure_user_key()
+    _rebuild_progress(get_sprints())
+    _rebuild_cycle_index(get_sprints())
+    _bump_version()
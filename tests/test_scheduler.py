@@ -0,0 +1,47 @@
+# tests/test_scheduler.py
+# -*- coding: utf-8 -*-
+
+from scheduler import schedule
+
+
+def _items(goal: str, n: int, category: str = "项目"):
+    return [{"title": f"{goal}-{i}", "category": category, "linked_goal": goal} for i in range(n)]
+
+
+def test_group_stays_adjacent_with_uneven_loads():
+    # 2、5 期已经有任务：只按负载最小分配时，A 组会散到 1、3、4 期
+    loads = {1: 0, 2: 2, 3: 0, 4: 0, 5: 2, 6: 0}
+    assigned, overflow = schedule(_items("A", 3) + _items("B", 3), loads, capacity=3)
+
+    assert not overflow
+    for goal in ("A", "B"):
+        nos = sorted(no for no, it in assigned if it["linked_goal"] == goal)
+        assert nos[-1] - nos[0] <= 1, (goal, nos)
+
+    final = dict(loads)
+    for no, _ in assigned:
+        final[no] += 1
+    assert max(final.values()) <= 3
+
+
+def test_group_spills_to_least_loaded_when_neighbours_full():
+    loads = {1: 2, 2: 3, 3: 0, 4: 3, 5: 0}
+    assigned, overflow = schedule(_items("A", 3), loads, capacity=3)
+
+    assert not overflow
+    assert [no for no, _ in assigned] == [3, 3, 3]
+
+
+def test_ungrouped_items_balance_by_load_then_category():
+    loads = {1: 1, 2: 0, 3: 0}
+    items = [{"title": "p", "category": "项目"}, {"title": "h", "category": "习惯"},
+             {"title": "s", "category": "能力"}]
+    assigned, overflow = schedule(items, loads, capacity=2)
+
+    assert not overflow
+    assert [no for no, _ in assigned] == [2, 3, 1]
+
+
+def test_overflow_when_every_cycle_is_full():
+    assigned, overflow = schedule(_items("A", 2), {1: 1, 2: 1}, capacity=1)
+    assert assigned == [] and len(overflow) == 2
@@ -10,6 +10,19 @@ from typing import List, Tuple
 import re
 
 
+# 通用习惯：每个周期都重复（②页可一键加为重复习惯，不再按周期复制成任务）
+HABIT_TEMPLATES = [
+    "每10天做一次复盘（得失/调整/下一步）",
+    "每周至少1次公开表达（写作/分享/讲解）",
+    "每天1个最小行动（MIT相关）",
+    "每10天整理一次 CARE 灵感并转为行动",
+]
+
+
+# 待排期条目的类别（和 db.BacklogItem.category 一致）；自动排期按类别混搭
+BACKLOG_CATEGORIES = ["项目", "习惯", "能力"]
+
+
 def parse_keywords(raw: str) -> List[str]:
     if not raw:
         return []
@@ -50,13 +63,7 @@ def generate_backlog(goals: List[dict], keywords: List[str]) -> List[dict]:
         items.append({"title": f"{g['title']}：输出一篇总结/分享", "category": "项目", "linked_goal": g["title"]})
 
     # 习惯：通用 4 条
-    habits = [
-        "每10天做一次复盘（得失/调整/下一步）",
-        "每周至少1次公开表达（写作/分享/讲解）",
-        "每天1个最小行动（MIT相关）",
-        "每10天整理一次 CARE 灵感并转为行动",
-    ]
-    for h in habits:
+    for h in HABIT_TEMPLATES:
         items.append({"title": h, "category": "习惯", "linked_goal": ""})
 
     # 能力：根据关键词生成